@@ -32,7 +32,7 @@ def create_porters_agent(use_tools: bool = True, max_iters: int = 30, use_refine
     """
     if use_tools:
         # Get Tavily tools for research
-        tools = create_dspy_tools()
+        tools = create_dspy_tools(agent_name="porters_agent")
 
         # Create ReAct agent with tools for comprehensive research
         agent = dspy.ReAct(
@@ -49,7 +49,7 @@ class RFPGenerationPipeline(dspy.Module):
         self.reference_gather = dspy.Predict(RFPReferenceGatherSignature)
 
         if use_tools:
-            tools = create_dspy_tools()
+            tools = create_dspy_tools(agent_name="rfp_agent")
             self.question_generator = dspy.ReAct(
                 RFPQuestionGeneratorSignature,
                 tools=list(tools),
@@ -3,9 +3,11 @@
 from __future__ import annotations
 
 import logging
+import queue
+import threading
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 import asyncio
 
 import dspy
@@ -13,9 +15,17 @@ from dspy import Example, Prediction
 
 from models.swot import SWOTAnalysis, VendorSWOTAnalysis
 from models.vendor import Vendor
+from agents.vendor_agent import vendor_key
 from metrics.swot_scoring import make_swot_llm_judge_metric
-from tools.web_tools import create_dspy_tools, scoped_tavily_extract_budget
+from tools.web_tools import (
+    create_dspy_tools,
+    describe_missing_tools,
+    scoped_focus_domain,
+    scoped_tavily_extract_budget,
+)
 from config.observability import observability_span, set_span_attributes
+from utils.agent_context import agent_scope, submit_with_context
+from utils.pipeline_dag import raise_if_cancelled
 
 logger = logging.getLogger(__name__)
 
@@ -27,7 +37,9 @@ __all__ = [
     "create_swot_trainset",
     "optimize_swot_agent",
     "analyze_vendor_swot",
+    "analyze_vendor_swot_async",
     "batch_analyze_vendors",
+    "SwotWorkerPool",
     "load_swot_agent",
     "save_swot_agent",
 ]
@@ -56,7 +68,7 @@ def create_swot_agent(
         SWOT analysis agent (ReAct or ChainOfThought)
     """
     if use_tools:
-        tools = create_dspy_tools()
+        tools = create_dspy_tools(agent_name="swot_agent")
         agent = dspy.ReAct(
             VendorSWOTAnalysis,
             tools=list(tools),
@@ -142,14 +154,7 @@ def analyze_vendor_swot(
         Complete SWOT analysis for the vendor
     """
     # Extract vendor information
-    if isinstance(vendor, dict):
-        vendor_name = vendor.get("name", "Unknown")
-        vendor_website = vendor.get("website", "")
-        vendor_description = vendor.get("description", "")
-    else:
-        vendor_name = vendor.name
-        vendor_website = vendor.website
-        vendor_description = vendor.description
+    vendor_name, vendor_website, vendor_description = _vendor_fields(vendor)
 
     # Create agent if not provided
     if agent is None:
@@ -170,7 +175,7 @@ def analyze_vendor_swot(
             "swot.competitors.count": len(competitors) if competitors else 0,
         }
     ) as span:
-        with scoped_tavily_extract_budget():
+        with scoped_tavily_extract_budget(), agent_scope("swot_agent"), scoped_focus_domain(vendor_website):
             result = agent(
                 vendor_name=vendor_name,
                 vendor_website=vendor_website,
@@ -193,6 +198,59 @@ def analyze_vendor_swot(
             raise ValueError(f"Failed to generate SWOT analysis for {vendor_name}")
 
 
+async def analyze_vendor_swot_async(
+    vendor: Union[Vendor, dict],
+    category: str,
+    region: Optional[str] = None,
+    competitors: Optional[List[str]] = None,
+    agent: Optional[dspy.Module] = None,
+) -> SWOTAnalysis:
+    """
+    Async version of ``analyze_vendor_swot`` that runs the agent on the event loop.
+
+    The agent is awaited through ``acall`` so its Tavily tools use the
+    async-native implementations rather than a worker thread per vendor.
+    Parameters and return value match ``analyze_vendor_swot``.
+    """
+    vendor_name, vendor_website, vendor_description = _vendor_fields(vendor)
+
+    if agent is None:
+        agent = create_swot_agent(
+            use_tools=True,
+            use_comparative=competitors is not None
+        )
+
+    logger.info(f"Analyzing SWOT for {vendor_name} ({vendor_website})")
+
+    with observability_span(
+        "swot.analyze_vendor",
+        {
+            "swot.vendor.name": vendor_name,
+            "swot.vendor.category": category,
+            "swot.vendor.region": region or "Global",
+            "swot.competitors.count": len(competitors) if competitors else 0,
+        }
+    ) as span:
+        with scoped_tavily_extract_budget(), agent_scope("swot_agent"), scoped_focus_domain(vendor_website):
+            result = await agent.acall(
+                vendor_name=vendor_name,
+                vendor_website=vendor_website,
+                vendor_description=vendor_description,
+                market_category=category,
+                region=region,
+                competitors=competitors
+            )
+
+        if hasattr(result, 'swot_analysis'):
+            swot = result.swot_analysis
+            set_span_attributes(span, _summarize_swot(swot))
+            logger.info(f"SWOT analysis completed for {vendor_name}")
+            return swot
+        else:
+            logger.error(f"SWOT analysis failed for {vendor_name} - no swot_analysis in result")
+            raise ValueError(f"Failed to generate SWOT analysis for {vendor_name}")
+
+
 def batch_analyze_vendors(
     vendors: List[Union[Vendor, dict]],
     category: str,
@@ -238,7 +296,8 @@ def batch_analyze_vendors(
             futures = {}
             for i, vendor in enumerate(vendors):
                 agent = agents[i % len(agents)]
-                future = executor.submit(
+                future = submit_with_context(
+                    executor,
                     analyze_vendor_swot,
                     vendor,
                     category,
@@ -312,7 +371,8 @@ async def batch_analyze_vendors_async(
     """
     Async version of batch SWOT analysis for multiple vendors.
 
-    Uses asyncio for better DSPy compatibility instead of ThreadPoolExecutor.
+    Agents run natively on the event loop via ``acall``, so concurrency is bounded
+    only by ``max_concurrent`` rather than by a thread pool.
 
     Parameters are the same as batch_analyze_vendors.
 
@@ -342,11 +402,8 @@ async def batch_analyze_vendors_async(
                 vendor_name = vendor.name if hasattr(vendor, 'name') else vendor.get('name', 'Unknown')
                 logger.debug(f"Starting SWOT for vendor {index+1}/{total}: {vendor_name}")
 
-                # Run the SWOT analysis in a thread pool to avoid blocking
-                # This is necessary since the DSPy agent isn't async-native
                 agent = create_swot_agent(use_tools=True)
-                swot = await asyncio.to_thread(
-                    analyze_vendor_swot,
+                swot = await analyze_vendor_swot_async(
                     vendor,
                     category,
                     region,
@@ -389,6 +446,158 @@ def batch_analyze_vendors_sync(*args, **kwargs):
     return asyncio.run(batch_analyze_vendors_async(*args, **kwargs))
 
 
+class SwotWorkerPool:
+    """Start a vendor's SWOT analysis the moment the vendor is known.
+
+    Vendors are submitted one at a time, typically from
+    :class:`agents.vendor_agent.VendorStream` while vendor discovery is still
+    running, and each runs on the next free worker. Every worker checks out
+    its own SWOT agent, so agents are never shared between threads. Repeated
+    vendors (by :func:`agents.vendor_agent.vendor_key`) and vendors beyond
+    ``limit`` are ignored.
+
+    Streamed vendors arrive in the order the agent finalizes them, which need
+    not be the order of its final ranking. Once the final list is known,
+    :meth:`reconcile` makes the analyzed set its top ``limit`` vendors.
+
+    Parameters
+    ----------
+    category : str
+        Market category
+    region : str, optional
+        Geographic region
+    limit : int
+        Maximum number of vendors to analyze
+    max_workers : int
+        Concurrent SWOT analyses (and SWOT agents)
+    max_iters : int
+        Maximum iterations per SWOT agent
+    on_done : Callable, optional
+        Called with each vendor after its analysis succeeds or fails
+    """
+
+    def __init__(
+        self,
+        category: str,
+        region: Optional[str],
+        limit: int,
+        max_workers: int = 3,
+        max_iters: int = 30,
+        on_done: Optional[Callable[[Union[Vendor, dict]], None]] = None,
+    ):
+        self.category = category
+        self.region = region
+        self.limit = max(0, int(limit))
+        self.max_workers = max(1, min(int(max_workers), self.limit or 1))
+        self.max_iters = max_iters
+        self.on_done = on_done
+        # vendor_key -> (vendor, future), in submission order
+        self._futures: Dict[str, Tuple[Union[Vendor, dict], Future]] = {}
+        # Keys reported by results(), fixed by reconcile(); None means every submission
+        self._selected: Optional[List[str]] = None
+        self._agents: "queue.Queue[dspy.Module]" = queue.Queue()
+        self._agents_created = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="swot")
+
+    def submit(self, vendor: Union[Vendor, dict]) -> bool:
+        """Queue ``vendor`` for analysis; return False if it was a repeat or over the limit."""
+        key = vendor_key(vendor)
+        with self._lock:
+            if self._selected is not None or key in self._futures or len(self._futures) >= self.limit:
+                return False
+            self._submit_locked(key, vendor)
+        return True
+
+    def _submit_locked(self, key: str, vendor: Union[Vendor, dict]) -> None:
+        future = submit_with_context(self._executor, self._analyze, vendor)
+        self._futures[key] = (vendor, future)
+        logger.info(f"Queued SWOT analysis for {_vendor_fields(vendor)[0]}")
+
+    def reconcile(self, vendors: List[Union[Vendor, dict]]) -> int:
+        """Align the analyses with the final ranked vendor list.
+
+        The first ``limit`` distinct vendors in ``vendors`` are the ones
+        analyzed. Streamed vendors outside them are cancelled if they have not
+        started and are left out of :meth:`results` either way; listed vendors
+        that were never streamed are queued now. Later :meth:`submit` calls
+        are ignored.
+
+        Returns
+        -------
+        int
+            Number of vendors newly queued.
+        """
+        chosen: Dict[str, Union[Vendor, dict]] = {}
+        for vendor in vendors:
+            if len(chosen) >= self.limit:
+                break
+            chosen.setdefault(vendor_key(vendor), vendor)
+
+        queued = 0
+        with self._lock:
+            for key, (vendor, future) in self._futures.items():
+                if key not in chosen and future.cancel():
+                    logger.info(f"Dropped queued SWOT analysis for {_vendor_fields(vendor)[0]}: outside the final ranking")
+            for key, vendor in chosen.items():
+                if key not in self._futures:
+                    self._submit_locked(key, vendor)
+                    queued += 1
+            self._selected = list(chosen)
+        return queued
+
+    @property
+    def submitted(self) -> int:
+        """Number of analyses queued or run (after :meth:`reconcile`, only the selected ones)."""
+        with self._lock:
+            return len(self._futures) if self._selected is None else len(self._selected)
+
+    def _checkout_agent(self) -> dspy.Module:
+        with self._lock:
+            create = self._agents.empty() and self._agents_created < self.max_workers
+            if create:
+                self._agents_created += 1
+        if create:
+            return create_swot_agent(use_tools=True, max_iters=self.max_iters)
+        return self._agents.get()
+
+    def _analyze(self, vendor: Union[Vendor, dict]) -> SWOTAnalysis:
+        # Tasks run in a copy of the submitter's context (usually a vendor agent tool call), so
+        # switch identity here; analyze_vendor_swot opens a fresh extract budget and search state
+        raise_if_cancelled()
+        with agent_scope("swot_agent"):
+            agent = self._checkout_agent()
+            try:
+                return analyze_vendor_swot(vendor, self.category, self.region, None, agent)
+            finally:
+                self._agents.put(agent)
+                if self.on_done:
+                    self.on_done(vendor)
+
+    def results(self) -> List[SWOTAnalysis]:
+        """Wait for the selected analyses; return successes in ranking order.
+
+        Before :meth:`reconcile` every submission is selected, in submission order.
+        """
+        with self._lock:
+            keys = list(self._futures) if self._selected is None else self._selected
+            futures = [self._futures[key] for key in keys]
+        analyses = []
+        for vendor, future in futures:
+            if future.cancelled():
+                continue
+            try:
+                analyses.append(future.result())
+            except Exception as exc:
+                # Skip failed SWOTs but keep the others
+                logger.error(f"Failed SWOT for {_vendor_fields(vendor)[0]}: {exc}")
+        return analyses
+
+    def close(self) -> None:
+        """Stop accepting work and drop analyses that have not started."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
 def create_swot_trainset(examples: Optional[List[dict]] = None) -> List[Example]:
     """
     Create training examples for SWOT optimization.
@@ -546,6 +755,7 @@ def load_swot_agent(
     try:
         agent = create_swot_agent(use_tools=use_tools, max_iters=max_iters)
         agent.load(str(canonical_path))
+        describe_missing_tools(agent, ["tavily_search_many"])
         logger.info(f"Loaded SWOT program from {canonical_path}")
         return agent
     except Exception as e:
@@ -575,6 +785,17 @@ def save_swot_agent(agent: dspy.Module, path: str = "data/artifacts/swot_program
         raise
 
 
+def _vendor_fields(vendor: Union[Vendor, dict]) -> Tuple[str, str, str]:
+    """Return (name, website, description) from a Vendor model or dict."""
+    if isinstance(vendor, dict):
+        return (
+            vendor.get("name", "Unknown"),
+            vendor.get("website", ""),
+            vendor.get("description", ""),
+        )
+    return vendor.name, vendor.website, vendor.description
+
+
 def _summarize_swot(analysis: SWOTAnalysis) -> dict:
     """Create summary attributes for observability."""
     return {
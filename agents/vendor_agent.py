@@ -3,15 +3,18 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Callable, List, Mapping, Optional, Tuple
+import threading
+from typing import Any, Callable, List, Mapping, Optional, Tuple, Union
 from pathlib import Path
+from urllib.parse import urlparse
 
 import dspy
 from dspy import Example, Prediction
+from pydantic import ValidationError
 
-from models.vendor import VendorSearchResult
+from models.vendor import Vendor, VendorSearchResult
 from metrics.scoring import make_llm_judge_metric
-from tools.web_tools import create_dspy_tools
+from tools.web_tools import create_dspy_tools, describe_missing_tools
 
 logger = logging.getLogger(__name__)
 
@@ -25,10 +28,77 @@ __all__ = [
     "optimize_vendor_agent",
     "load_vendor_agent",
     "save_vendor_agent",
+    "vendor_key",
+    "VendorStream",
 ]
 
 
-def create_vendor_agent(max_iters: int = 50) -> dspy.Module:
+FINALIZE_VENDOR_TOOL = "finalize_vendor"
+
+
+def vendor_key(vendor: Union[Vendor, dict]) -> str:
+    """Return a dedup key for a vendor: its website host, or its lowercased name."""
+    if isinstance(vendor, dict):
+        name, website = vendor.get("name", ""), vendor.get("website", "")
+    else:
+        name, website = vendor.name, vendor.website
+    host = urlparse(website if "://" in (website or "") else f"https://{website or ''}").hostname or ""
+    host = host.lower().removeprefix("www.")
+    return host or (name or "").strip().lower()
+
+
+class VendorStream:
+    """Emit each vendor to ``on_vendor`` as soon as the agent finalizes it.
+
+    Exposed to the vendor agent as the ``finalize_vendor`` tool, so work that
+    only needs one vendor (such as its SWOT analysis) can start while
+    discovery is still researching the rest. Vendors are validated against
+    the :class:`Vendor` model and deduplicated by :func:`vendor_key`; the
+    callback runs on the agent's thread and should only enqueue work.
+    """
+
+    def __init__(self, on_vendor: Callable[[Vendor], Any]):
+        self.on_vendor = on_vendor
+        self.vendors: List[Vendor] = []
+        self._keys: set = set()
+        self._lock = threading.Lock()
+
+    def __deepcopy__(self, memo: dict) -> "VendorStream":
+        # Copied agents (dspy deep-copies modules) must still feed the same consumer
+        return self
+
+    def finalize_vendor(self, vendor: Vendor) -> str:
+        try:
+            vendor = vendor if isinstance(vendor, Vendor) else Vendor.model_validate(vendor)
+        except ValidationError as exc:
+            return f"Vendor rejected, fix these fields and call {FINALIZE_VENDOR_TOOL} again: {exc}"
+
+        key = vendor_key(vendor)
+        with self._lock:
+            if key in self._keys:
+                return f"{vendor.name} was already finalized; continue with the next vendor."
+            self._keys.add(key)
+            self.vendors.append(vendor)
+            count = len(self.vendors)
+        try:
+            self.on_vendor(vendor)
+        except Exception as exc:  # pragma: no cover - a consumer error must not derail discovery
+            logger.warning("Vendor stream consumer failed for %s: %s", vendor.name, exc)
+        return f"Finalized {vendor.name} ({count} so far). Keep it in the final vendor_list."
+
+    def as_tool(self) -> dspy.Tool:
+        return dspy.Tool(
+            self.finalize_vendor,
+            name=FINALIZE_VENDOR_TOOL,
+            desc=(
+                "Record one vendor as soon as its website, description, justification, contact emails and "
+                "phone numbers are verified, so follow-up analysis can start right away. Call it once per "
+                "vendor, then still return every vendor in vendor_list. Args: vendor:Vendor -> confirmation"
+            ),
+        )
+
+
+def create_vendor_agent(max_iters: int = 50, stream: Optional[VendorStream] = None) -> dspy.Module:
     """Create the vendor discovery agent.
 
     Parameters
@@ -37,6 +107,9 @@ def create_vendor_agent(max_iters: int = 50) -> dspy.Module:
         Whether to enable Tavily research tools via ReAct.
     max_iters : int
         Maximum number of reasoning/tool iterations.
+    stream : VendorStream, optional
+        When given, the agent also gets the ``finalize_vendor`` tool and
+        emits each vendor through it before returning the full list.
 
     Returns
     -------
@@ -44,7 +117,9 @@ def create_vendor_agent(max_iters: int = 50) -> dspy.Module:
         Configured DSPy module for vendor discovery.
     """
 
-    tools = create_dspy_tools()
+    tools = list(create_dspy_tools(agent_name="vendor_agent"))
+    if stream is not None:
+        tools.append(stream.as_tool())
     agent = dspy.ReAct(
         VendorSearchResult,
         tools=list(tools),
@@ -133,7 +208,11 @@ def _program_load_candidates(path: Path) -> list[Path]:
     return variants
 
 
-def load_vendor_agent(path: str, max_iters: int = 50) -> Optional[dspy.Module]:
+def load_vendor_agent(
+    path: str,
+    max_iters: int = 50,
+    stream: Optional[VendorStream] = None,
+) -> Optional[dspy.Module]:
     """Load a previously optimized vendor agent from disk if available."""
     candidate = Path(path)
     resolved_path: Optional[Path] = None
@@ -146,8 +225,9 @@ def load_vendor_agent(path: str, max_iters: int = 50) -> Optional[dspy.Module]:
         logger.debug("Vendor program not found at %s", candidate)
         return None
 
-    agent = create_vendor_agent(max_iters=max_iters)
+    agent = create_vendor_agent(max_iters=max_iters, stream=stream)
     agent.load(str(resolved_path))
+    describe_missing_tools(agent, ["tavily_search_many", FINALIZE_VENDOR_TOOL])
 
     if resolved_path != candidate:
         logger.info("Loaded vendor agent from %s (normalized from %s)", resolved_path, candidate)
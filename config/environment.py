@@ -20,6 +20,92 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 TAVILY_API_KEY = os.getenv("TAVILY_API_KEY")
 TAVILY_MAX_EXTRACT_CALLS = max(0, int(os.getenv("TAVILY_MAX_EXTRACT_CALLS", "24")))
 
+# Tavily response cache (persistent across runs)
+TAVILY_CACHE_ENABLED = _get_bool_env("TAVILY_CACHE_ENABLED", True)
+TAVILY_CACHE_PATH = os.getenv("TAVILY_CACHE_PATH", "data/cache/tavily_cache.sqlite")
+TAVILY_CACHE_MAX_MB = max(0, int(os.getenv("TAVILY_CACHE_MAX_MB", "512")))
+TAVILY_CACHE_TTL_SEARCH = float(os.getenv("TAVILY_CACHE_TTL_SEARCH", str(24 * 3600)))
+TAVILY_CACHE_TTL_EXTRACT = float(os.getenv("TAVILY_CACHE_TTL_EXTRACT", str(7 * 24 * 3600)))
+TAVILY_CACHE_TTL_CRAWL = float(os.getenv("TAVILY_CACHE_TTL_CRAWL", str(7 * 24 * 3600)))
+TAVILY_CACHE_TTL_MAP = float(os.getenv("TAVILY_CACHE_TTL_MAP", str(7 * 24 * 3600)))
+
+# Shared Tavily HTTP connection pool
+TAVILY_HTTP_MAX_CONNECTIONS = int(os.getenv("TAVILY_HTTP_MAX_CONNECTIONS", "20"))
+TAVILY_HTTP_MAX_KEEPALIVE = int(os.getenv("TAVILY_HTTP_MAX_KEEPALIVE", "10"))
+TAVILY_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("TAVILY_HTTP_KEEPALIVE_EXPIRY", "30"))
+TAVILY_HTTP_TIMEOUT = float(os.getenv("TAVILY_HTTP_TIMEOUT", "60"))
+TAVILY_HTTP_CRAWL_TIMEOUT = float(os.getenv("TAVILY_HTTP_CRAWL_TIMEOUT", "150"))
+TAVILY_HTTP2 = _get_bool_env("TAVILY_HTTP2", False)
+
+# Process-wide Tavily rate limiting (token bucket + AIMD concurrency) and retries.
+# The bucket is off (0 = unlimited) and the window starts fully open unless configured.
+TAVILY_RATE_LIMIT_RPS = float(os.getenv("TAVILY_RATE_LIMIT_RPS", "0"))
+TAVILY_RATE_LIMIT_BURST = int(os.getenv("TAVILY_RATE_LIMIT_BURST", "10"))
+TAVILY_MAX_CONCURRENCY = int(os.getenv("TAVILY_MAX_CONCURRENCY", "16"))
+TAVILY_MIN_CONCURRENCY = int(os.getenv("TAVILY_MIN_CONCURRENCY", "1"))
+TAVILY_INITIAL_CONCURRENCY = int(os.getenv("TAVILY_INITIAL_CONCURRENCY", str(TAVILY_MAX_CONCURRENCY)))
+TAVILY_MAX_RETRIES = int(os.getenv("TAVILY_MAX_RETRIES", "4"))
+TAVILY_RETRY_BASE_DELAY = float(os.getenv("TAVILY_RETRY_BASE_DELAY", "0.5"))
+TAVILY_RETRY_MAX_DELAY = float(os.getenv("TAVILY_RETRY_MAX_DELAY", "20"))
+
+# Relevance-ranked passages returned by the tavily_extract tool
+TAVILY_EXTRACT_PASSAGES_ENABLED = _get_bool_env("TAVILY_EXTRACT_PASSAGES_ENABLED", True)
+TAVILY_EXTRACT_TOP_K = int(os.getenv("TAVILY_EXTRACT_TOP_K", "8"))
+TAVILY_EXTRACT_TOKEN_BUDGET = int(os.getenv("TAVILY_EXTRACT_TOKEN_BUDGET", "2000"))
+TAVILY_EXTRACT_PASSAGE_TOKENS = int(os.getenv("TAVILY_EXTRACT_PASSAGE_TOKENS", "160"))
+
+# Local fetch-and-parse fallback for tavily_extract
+PAGE_FETCH_FALLBACK_ENABLED = _get_bool_env("PAGE_FETCH_FALLBACK_ENABLED", True)
+PAGE_FETCH_MAX_WORKERS = int(os.getenv("PAGE_FETCH_MAX_WORKERS", "4"))
+PAGE_FETCH_PER_DOMAIN = int(os.getenv("PAGE_FETCH_PER_DOMAIN", "2"))
+PAGE_FETCH_MIN_INTERVAL = float(os.getenv("PAGE_FETCH_MIN_INTERVAL", "0.5"))
+PAGE_FETCH_TIMEOUT = float(os.getenv("PAGE_FETCH_TIMEOUT", "15"))
+PAGE_FETCH_MAX_BYTES = int(os.getenv("PAGE_FETCH_MAX_BYTES", str(2 * 1024 * 1024)))
+# Give up on a slow Tavily extract after this many seconds and fetch locally instead
+TAVILY_EXTRACT_TIMEOUT = float(os.getenv("TAVILY_EXTRACT_TIMEOUT", "30"))
+
+# Speculative extract prefetch of top search hits (0 disables)
+TAVILY_PREFETCH_TOP_K = max(0, int(os.getenv("TAVILY_PREFETCH_TOP_K", "0")))
+TAVILY_PREFETCH_WORKERS = max(1, int(os.getenv("TAVILY_PREFETCH_WORKERS", "2")))
+
+# Background writer for the per-session source log
+SOURCE_LOG_BATCH_SIZE = max(1, int(os.getenv("SOURCE_LOG_BATCH_SIZE", "200")))
+SOURCE_LOG_FLUSH_INTERVAL = max(0.05, float(os.getenv("SOURCE_LOG_FLUSH_INTERVAL", "1.0")))
+# Source content longer than this (characters) goes to the content-addressed blob store
+SOURCE_BLOB_MIN_CHARS = max(0, int(os.getenv("SOURCE_BLOB_MIN_CHARS", "1024")))
+# Compression for source logs and blobs: none, gzip or zstd (zstd falls back to gzip if unavailable)
+SOURCE_LOG_COMPRESSION = os.getenv("SOURCE_LOG_COMPRESSION", "none").strip().lower()
+# Retention for data/sources/<session> directories, applied at pipeline start (0 disables each rule)
+SOURCE_SESSION_RETENTION_DAYS = max(0.0, float(os.getenv("SOURCE_SESSION_RETENTION_DAYS", "0")))
+SOURCE_SESSION_KEEP_LAST = max(0, int(os.getenv("SOURCE_SESSION_KEEP_LAST", "0")))
+# Embed sources into the citation index while agents run, instead of in one batch before reporting
+CITATION_BACKGROUND_INDEXING = _get_bool_env("CITATION_BACKGROUND_INDEXING", True)
+# Citation vector store: auto (Chroma Cloud when configured, else local), chroma, or local
+CITATION_VECTOR_BACKEND = os.getenv("CITATION_VECTOR_BACKEND", "auto").strip().lower()
+CITATION_INDEX_DIR = os.getenv("CITATION_INDEX_DIR", "data/vector_index")
+# Embedding model for the local index when chromadb's bundled embedder is not installed
+CITATION_EMBEDDING_MODEL = os.getenv("CITATION_EMBEDDING_MODEL", "openai/text-embedding-3-small")
+# Weight of BM25 lexical scores blended into local-index cosine scores (0 = pure vector search)
+CITATION_HYBRID_WEIGHT = min(1.0, max(0.0, float(os.getenv("CITATION_HYBRID_WEIGHT", "0"))))
+# Sources are embedded as overlapping passages of this size (approximate tokens)
+CITATION_CHUNK_TOKENS = max(32, int(os.getenv("CITATION_CHUNK_TOKENS", "200")))
+CITATION_CHUNK_OVERLAP_TOKENS = max(0, int(os.getenv("CITATION_CHUNK_OVERLAP_TOKENS", "40")))
+CITATION_MAX_CHUNKS_PER_SOURCE = max(1, int(os.getenv("CITATION_MAX_CHUNKS_PER_SOURCE", "64")))
+# Embedding batches: at most this many passages and roughly this many characters per call
+CITATION_EMBED_BATCH_SIZE = max(1, int(os.getenv("CITATION_EMBED_BATCH_SIZE", "64")))
+CITATION_EMBED_BATCH_CHARS = max(1000, int(os.getenv("CITATION_EMBED_BATCH_CHARS", "60000")))
+# Collapse near-identical sources (MinHash estimate of word-shingle Jaccard) before embedding
+CITATION_DEDUP_ENABLED = _get_bool_env("CITATION_DEDUP_ENABLED", True)
+CITATION_DEDUP_THRESHOLD = min(1.0, max(0.5, float(os.getenv("CITATION_DEDUP_THRESHOLD", "0.85"))))
+# Cross-session cache of passage embeddings, keyed by a hash of the embedded text
+CITATION_EMBED_CACHE_ENABLED = _get_bool_env("CITATION_EMBED_CACHE_ENABLED", True)
+CITATION_EMBED_CACHE_PATH = os.getenv("CITATION_EMBED_CACHE_PATH", "data/cache/embeddings.sqlite")
+CITATION_EMBED_CACHE_MAX_MB = max(0, int(os.getenv("CITATION_EMBED_CACHE_MAX_MB", "256")))
+
+# Batched multi-query search tool
+TAVILY_SEARCH_MANY_MAX_QUERIES = max(1, int(os.getenv("TAVILY_SEARCH_MANY_MAX_QUERIES", "8")))
+TAVILY_SEARCH_MANY_CONCURRENCY = max(1, int(os.getenv("TAVILY_SEARCH_MANY_CONCURRENCY", "4")))
+
 LANGFUSE_PUBLIC_KEY = os.getenv("LANGFUSE_PUBLIC_KEY")
 LANGFUSE_SECRET_KEY = os.getenv("LANGFUSE_SECRET_KEY")
 _LANGFUSE_DEFAULT_HOST = "https://cloud.langfuse.com"
@@ -27,6 +113,8 @@ LANGFUSE_HOST = os.getenv("LANGFUSE_HOST", _LANGFUSE_DEFAULT_HOST)
 
 VENDOR_PROGRAM_PATH = os.getenv("VENDOR_PROGRAM_PATH", "data/artifacts/vendor_program.json")
 VENDOR_OPTIMIZE_ON_MISS = _get_bool_env("VENDOR_OPTIMIZE_ON_MISS", True)
+# Vendor agent hands each vendor to the SWOT pool as soon as it is verified (finalize_vendor tool)
+VENDOR_STREAMING = _get_bool_env("VENDOR_STREAMING", True)
 
 # SWOT Analysis Settings
 SWOT_PROGRAM_PATH = os.getenv("SWOT_PROGRAM_PATH", "data/artifacts/swot_program.json")
@@ -142,6 +230,79 @@ def get_sourcing_concurrency() -> int:
         return max(1, SWOT_MAX_CONCURRENT)
 
 
+def get_tavily_cache_settings() -> dict[str, Any]:
+    """Return Tavily response cache configuration settings."""
+    return {
+        "enabled": TAVILY_CACHE_ENABLED,
+        "path": TAVILY_CACHE_PATH,
+        "max_bytes": TAVILY_CACHE_MAX_MB * 1024 * 1024,
+        "ttls": {
+            "tavily_search": TAVILY_CACHE_TTL_SEARCH,
+            "tavily_extract": TAVILY_CACHE_TTL_EXTRACT,
+            "tavily_crawl": TAVILY_CACHE_TTL_CRAWL,
+            "tavily_map": TAVILY_CACHE_TTL_MAP,
+        },
+    }
+
+
+def get_embedding_cache_settings() -> dict[str, Any]:
+    """Return citation embedding cache configuration settings."""
+    return {
+        "enabled": CITATION_EMBED_CACHE_ENABLED,
+        "path": CITATION_EMBED_CACHE_PATH,
+        "max_bytes": CITATION_EMBED_CACHE_MAX_MB * 1024 * 1024,
+    }
+
+
+def get_tavily_http_settings() -> dict[str, Any]:
+    """Return connection-pool and timeout settings for the shared Tavily client."""
+    return {
+        "max_connections": max(1, TAVILY_HTTP_MAX_CONNECTIONS),
+        "max_keepalive_connections": max(0, TAVILY_HTTP_MAX_KEEPALIVE),
+        "keepalive_expiry": TAVILY_HTTP_KEEPALIVE_EXPIRY,
+        "timeout": TAVILY_HTTP_TIMEOUT,
+        "crawl_timeout": TAVILY_HTTP_CRAWL_TIMEOUT,
+        "http2": TAVILY_HTTP2,
+    }
+
+
+def get_extract_passage_settings() -> dict[str, Any]:
+    """Return passage-ranking settings applied to tavily_extract tool observations."""
+    return {
+        "enabled": TAVILY_EXTRACT_PASSAGES_ENABLED,
+        "top_k": max(1, TAVILY_EXTRACT_TOP_K),
+        "token_budget": max(1, TAVILY_EXTRACT_TOKEN_BUDGET),
+        "passage_tokens": max(16, TAVILY_EXTRACT_PASSAGE_TOKENS),
+    }
+
+
+def get_page_fetch_settings() -> dict[str, Any]:
+    """Return connection, politeness and size limits for the local page fetcher."""
+    return {
+        "max_workers": max(1, PAGE_FETCH_MAX_WORKERS),
+        "per_domain": max(1, PAGE_FETCH_PER_DOMAIN),
+        "min_interval": max(0.0, PAGE_FETCH_MIN_INTERVAL),
+        "timeout": max(1.0, PAGE_FETCH_TIMEOUT),
+        "max_bytes": max(1024, PAGE_FETCH_MAX_BYTES),
+    }
+
+
+def get_tavily_rate_limit_settings() -> dict[str, Any]:
+    """Return token-bucket, adaptive-concurrency and retry settings for Tavily calls."""
+    max_concurrency = max(1, TAVILY_MAX_CONCURRENCY)
+    min_concurrency = min(max(1, TAVILY_MIN_CONCURRENCY), max_concurrency)
+    return {
+        "rate": max(0.0, TAVILY_RATE_LIMIT_RPS),
+        "burst": max(1, TAVILY_RATE_LIMIT_BURST),
+        "min_concurrency": min_concurrency,
+        "max_concurrency": max_concurrency,
+        "initial_concurrency": min(max(min_concurrency, TAVILY_INITIAL_CONCURRENCY), max_concurrency),
+        "max_retries": max(0, TAVILY_MAX_RETRIES),
+        "base_delay": max(0.0, TAVILY_RETRY_BASE_DELAY),
+        "max_delay": max(0.0, TAVILY_RETRY_MAX_DELAY),
+    }
+
+
 def get_gepa_settings() -> dict[str, Any]:
     """Return GEPA optimization configuration derived from environment variables."""
     max_calls = max(0, GEPA_MAX_METRIC_CALLS)
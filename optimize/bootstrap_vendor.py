@@ -191,7 +191,7 @@ if __name__ == "__main__":
         lm = dspy.LM(**lm_config)
         dspy.configure(lm=lm)
 
-        tools = create_dspy_tools()
+        tools = create_dspy_tools(agent_name="vendor_agent")
         dspy.configure(tools=tools)
 
         bootstrap_vendor_agent(
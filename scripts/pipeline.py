@@ -3,7 +3,6 @@ from __future__ import annotations
 import argparse
 from datetime import datetime
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import dspy
 from dotenv import load_dotenv
@@ -12,21 +11,35 @@ from config.environment import (
     validate_environment,
     get_vendor_program_path,
     get_sourcing_concurrency,
+    CITATION_BACKGROUND_INDEXING,
+    VENDOR_STREAMING,
 )
 from config.lm import configure_primary_lm
 from config.observability import setup_langfuse, generate_session_id
-from agents.vendor_agent import create_vendor_agent, load_vendor_agent
+from agents.vendor_agent import VendorStream, create_vendor_agent, load_vendor_agent
 from agents.pestle_agent import create_pestle_agent
 from agents.porters_agent import create_porters_agent
-from agents.swot_agent import create_swot_agent, analyze_vendor_swot
+from agents.swot_agent import SwotWorkerPool
 from agents.rfp_agent import create_rfp_agent
 from tools.markdown_tools import (
     output_report,
     ReportGenerator,
     save_report
 )
-from tools.web_tools import scoped_tavily_extract_budget
-from utils.source_logger import reset_source_logger, get_source_logger
+from tools.web_tools import scoped_tavily_extract_budget, get_tavily_cache_stats, get_extract_prefetch_stats
+from tools.tavily_client import get_tavily_client_stats
+from utils.agent_context import agent_scope
+from utils.citation_matcher import get_embedding_cache_stats
+from utils.pipeline_dag import StageGraph
+from utils.source_logger import get_source_logger, prune_source_sessions, source_session
+
+REPORT_FILES = {
+    "vendor": "01_vendor_discovery.md",
+    "pestle": "02_pestle_analysis.md",
+    "porters": "03_porters_analysis.md",
+    "swot": "04_swot_analyses.md",
+    "rfp": "05_rfp_questions.md",
+}
 
 def run_complete_pipeline(
     category: str,
@@ -47,11 +60,49 @@ def run_complete_pipeline(
     validate_environment()
     setup_langfuse()
 
+    # Apply the retention policy for old source sessions before starting a new one
+    prune_source_sessions()
+
     session_id = generate_session_id()
 
-    # Initialize source logger for this session
-    reset_source_logger(session_id)
+    # Route this run's source logs to its own session logger, so concurrent runs stay isolated
+    with source_session(session_id):
+        _run_pipeline_session(
+            session_id,
+            category=category,
+            region=region,
+            vendors=vendors,
+            max_vendor_iters=max_vendor_iters,
+            swot_count=swot_count,
+            expected_rfp_questions=expected_rfp_questions,
+            output_dir=output_dir,
+            max_porters_iters=max_porters_iters,
+            max_pestle_iters=max_pestle_iters,
+            max_swot_iters=max_swot_iters,
+            max_rfp_iters=max_rfp_iters,
+            disable_cache=disable_cache,
+            progress_callback=progress_callback,
+            log=log,
+        )
+
 
+def _run_pipeline_session(
+    session_id: str,
+    category: str,
+    region: str,
+    vendors: int,
+    max_vendor_iters: int,
+    swot_count: int,
+    expected_rfp_questions: int,
+    output_dir: str,
+    max_porters_iters: int,
+    max_pestle_iters: int,
+    max_swot_iters: int,
+    max_rfp_iters: int,
+    disable_cache: bool,
+    progress_callback: callable = None,
+    log: callable | None = None,
+) -> None:
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     output_dir = Path(output_dir) / timestamp
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -70,19 +121,50 @@ def run_complete_pipeline(
     configure_primary_lm()
     report_generator = ReportGenerator(session_id=session_id)
 
-    # STEP 1–3 — Run Vendor, PESTLE, and Porter's analyses in parallel.
+    # Stages run as soon as their inputs exist: SWOT starts once vendors are known, and
+    # each report renders the moment its analysis finishes (no phase barriers).
     if progress_callback:
         # Set description without advancing progress yet
         progress_callback(1, "Parallel Market Analyses", advance=0)
 
+    # SWOT workers take vendors one at a time, so analyses can start while discovery still runs
+    try:
+        swot_workers = int(get_sourcing_concurrency())
+    except Exception:
+        swot_workers = 3
+
+    def _swot_done(vendor) -> None:
+        if progress_callback:
+            vendor_name = (
+                vendor.get("name", "vendor") if isinstance(vendor, dict) else getattr(vendor, "name", "vendor")
+            )
+            progress_callback(2, f"SWOT: {vendor_name}", advance=1)
+
+    swot_pool = SwotWorkerPool(
+        category,
+        region,
+        limit=swot_count,
+        max_workers=swot_workers,
+        max_iters=max_swot_iters,
+        on_done=_swot_done,
+    )
+
+    def _stream_vendor(vendor) -> None:
+        if swot_pool.submit(vendor) and progress_callback and swot_pool.submitted == 1:
+            progress_callback(2, "SWOT Analysis", advance=0)
+
+    vendor_stream = VendorStream(_stream_vendor) if VENDOR_STREAMING and swot_count > 0 else None
+
     vendor_program_path = get_vendor_program_path()
     vendor_agent = load_vendor_agent(
         path=vendor_program_path,
         max_iters=max_vendor_iters,
+        stream=vendor_stream,
     )
     if vendor_agent is None:
         vendor_agent = create_vendor_agent(
             max_iters=max_vendor_iters,
+            stream=vendor_stream,
         )
 
     # Ensure the loaded agent respects the configured iteration cap.
@@ -92,213 +174,225 @@ def run_complete_pipeline(
     pestle_agent = create_pestle_agent(use_tools=True, max_iters=max_pestle_iters)
     porters_agent = create_porters_agent(use_tools=True, max_iters=max_porters_iters)
 
-    # Helper to scope Tavily extract budget per analysis task (runs inside worker thread)
-    def _run_with_extract_budget(func, **kwargs):
-        with scoped_tavily_extract_budget():
+    # Helper to scope Tavily extract budget and agent identity per analysis task (runs inside worker thread)
+    def _run_with_extract_budget(func, agent_name, **kwargs):
+        with scoped_tavily_extract_budget(), agent_scope(agent_name):
             return func(**kwargs)
 
-    # Submit three independent tasks
-    futures = {}
-    with ThreadPoolExecutor(max_workers=3) as executor:
-        futures[executor.submit(
-            _run_with_extract_budget,
-            vendor_agent,
-            category=category,
-            n=vendors,
-            country_or_region=region,
-        )] = "Vendor Discovery"
-
-        futures[executor.submit(
-            _run_with_extract_budget,
-            pestle_agent,
-            category=category,
-            region=region,
-            focus_areas=None,
-        )] = "PESTLE Analysis"
-
-        futures[executor.submit(
-            _run_with_extract_budget,
-            porters_agent,
-            category=category,
-            region=region,
-            focus_areas=None,
-        )] = "Porter's Analysis"
-
-        vendor_prediction = None
-        pestle_prediction = None
-        porters_prediction = None
-
-        for future in as_completed(futures):
-            label = futures[future]
-            try:
-                result = future.result()
-                if label == "Vendor Discovery":
-                    vendor_prediction = result
-                elif label == "PESTLE Analysis":
-                    pestle_prediction = result
-                elif label == "Porter's Analysis":
-                    porters_prediction = result
-            finally:
-                if progress_callback:
-                    progress_callback(1, label, advance=1)
-
-    # Extract and validate results
-    vendor_list = list(getattr(vendor_prediction, "vendor_list", []) or []) if vendor_prediction else []
-    if not vendor_list:
-        raise RuntimeError("Vendor agent did not return any vendors")
-
-    pestle_analysis = getattr(pestle_prediction, "pestle_analysis", None) if pestle_prediction else None
-    if pestle_analysis is None:
-        raise RuntimeError("PESTLE agent did not return an analysis")
-
-    porters_analysis = getattr(porters_prediction, "porters_analysis", None) if porters_prediction else None
-    if porters_analysis is None:
-        raise RuntimeError("Porter's agent did not return an analysis")
-
-    # Generate and save reports immediately
-    vendor_markdown = report_generator.generate_vendor_report(vendor_list, category, region)
-    vendor_file = save_report(vendor_markdown, str(output_dir / "01_vendor_discovery.md"))
-    _log(f"[STEP 1] Vendor discovery complete - {len(vendor_list)} vendors found")
-    _log(f"         Report saved to: {vendor_file}")
-
-    pestle_markdown = report_generator.generate_pestle_report(pestle_analysis, category, region)
-    pestle_file = save_report(pestle_markdown, str(output_dir / "02_pestle_analysis.md"))
-    _log(f"[STEP 2] PESTLE analysis complete")
-    _log(f"         Report saved to: {pestle_file}")
-
-    porters_markdown = report_generator.generate_porters_report(porters_analysis, category, region)
-    porters_file = save_report(porters_markdown, str(output_dir / "03_porters_analysis.md"))
-    _log(f"[STEP 3] Porter's Five Forces complete")
-    _log(f"         Report saved to: {porters_file}")
-# STEP 4 — SWOT across selected vendors (parallelized).
-    if progress_callback:
-        progress_callback(2, "SWOT Analysis")
-    configure_primary_lm()
-    swot_vendors = vendor_list[: max(swot_count, 0)]
-    if not swot_vendors:
-        raise RuntimeError("No vendors available for SWOT analysis")
-
-    # Determine max concurrency from environment
-    try:
-        max_workers = int(get_sourcing_concurrency())
-    except Exception:
-        max_workers = 3
-    max_workers = max(1, min(max_workers, len(swot_vendors)))
-
-    # Create agent pool (one agent per worker) to avoid sharing agents across threads
-    agents = [create_swot_agent(use_tools=True, max_iters=max_swot_iters) for _ in range(max_workers)]
-
-    swot_results_indexed = []
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {}
-        for i, vendor in enumerate(swot_vendors):
-            agent = agents[i % len(agents)]
-            future = executor.submit(
-                analyze_vendor_swot,
-                vendor,
-                category,
-                region,
-                None,  # competitors
-                agent,
+    def _advance(step: int, label: str) -> None:
+        if progress_callback:
+            progress_callback(step, label, advance=1)
+
+    # STEP 1–3 — Vendor, PESTLE, and Porter's analyses (independent roots of the graph).
+    def discover_vendors():
+        try:
+            vendor_prediction = _run_with_extract_budget(
+                vendor_agent,
+                "vendor_agent",
+                category=category,
+                n=vendors,
+                country_or_region=region,
+            )
+        finally:
+            _advance(1, "Vendor Discovery")
+        vendor_list = list(getattr(vendor_prediction, "vendor_list", []) or []) if vendor_prediction else []
+        if not vendor_list:
+            raise RuntimeError("Vendor agent did not return any vendors")
+        return vendor_list
+
+    def analyze_pestle():
+        try:
+            pestle_prediction = _run_with_extract_budget(
+                pestle_agent,
+                "pestle_agent",
+                category=category,
+                region=region,
+                focus_areas=None,
             )
-            futures[future] = (i, vendor)
+        finally:
+            _advance(1, "PESTLE Analysis")
+        pestle_analysis = getattr(pestle_prediction, "pestle_analysis", None) if pestle_prediction else None
+        if pestle_analysis is None:
+            raise RuntimeError("PESTLE agent did not return an analysis")
+        return pestle_analysis
+
+    def analyze_porters():
+        try:
+            porters_prediction = _run_with_extract_budget(
+                porters_agent,
+                "porters_agent",
+                category=category,
+                region=region,
+                focus_areas=None,
+            )
+        finally:
+            _advance(1, "Porter's Analysis")
+        porters_analysis = getattr(porters_prediction, "porters_analysis", None) if porters_prediction else None
+        if porters_analysis is None:
+            raise RuntimeError("Porter's agent did not return an analysis")
+        return porters_analysis
+
+    # Draft each report as soon as its analysis is done; citations are added once all drafts exist
+    def draft_vendor_report(vendor_list):
+        _log(f"[STEP 1] Vendor discovery complete - {len(vendor_list)} vendors found")
+        return report_generator.generate_vendor_report(vendor_list, category, region, cite=False)
+
+    def draft_pestle_report(pestle_analysis):
+        _log(f"[STEP 2] PESTLE analysis complete")
+        return report_generator.generate_pestle_report(pestle_analysis, category, region, cite=False)
+
+    def draft_porters_report(porters_analysis):
+        _log(f"[STEP 3] Porter's Five Forces complete")
+        return report_generator.generate_porters_report(porters_analysis, category, region, cite=False)
+
+    # STEP 4 — SWOT across selected vendors (parallelized); needs only the vendor list.
+    def analyze_swots(vendor_list):
+        # Streamed vendors are already running; align them with the final ranking's top swot_count
+        streamed = swot_pool.submitted
+        swot_pool.reconcile(vendor_list)
+        if not streamed and swot_pool.submitted and progress_callback:
+            progress_callback(2, "SWOT Analysis", advance=0)
+        if not swot_pool.submitted:
+            raise RuntimeError("No vendors available for SWOT analysis")
+        return swot_pool.results()
+
+    def draft_swot_report(swot_analyses):
+        _log(f"[STEP 4] SWOT analyses complete - {len(swot_analyses)} vendors analyzed")
+        return report_generator.generate_swot_report(swot_analyses, category, region, cite=False)
+
+    # STEP 5 — RFP generation using preceding outputs.
+    def generate_rfp(vendor_list, pestle_analysis, porters_analysis, swot_analyses):
+        if progress_callback:
+            # Set description without advancing; we'll advance on completion
+            progress_callback(3, "RFP Generation", advance=0)
+        rfp_agent = create_rfp_agent(use_tools=True, max_iters=max_rfp_iters)
+        pestle_payload = pestle_analysis.dict() if hasattr(pestle_analysis, "dict") else pestle_analysis
+        porters_payload = (
+            porters_analysis.dict() if hasattr(porters_analysis, "dict") else porters_analysis
+        )
+        swot_payloads = [
+            swot.dict() if hasattr(swot, "dict") else swot
+            for swot in swot_analyses
+            if swot is not None
+        ]
+        vendor_payloads = [
+            vendor.dict() if hasattr(vendor, "dict") else vendor
+            for vendor in vendor_list
+        ]
+        with scoped_tavily_extract_budget(), agent_scope("rfp_agent"):
+            rfp_prediction = rfp_agent(
+                category=category,
+                region=region,
+                pestle_analysis=pestle_payload,
+                porters_analysis=porters_payload,
+                swot_analyses=swot_payloads,
+                vendor_list=vendor_payloads,
+                expected_question_count=expected_rfp_questions,
+            )
+        rfp_question_set = getattr(rfp_prediction, "question_set", None)
+        if rfp_question_set is None:
+            raise RuntimeError("RFP agent did not return a question set")
+        return rfp_question_set
+
+    def draft_rfp_report(rfp_question_set):
+        _log(f"[STEP 5] RFP generation complete - {rfp_question_set.total_questions} questions generated")
+        _advance(3, "RFP Generation")
+        return report_generator.generate_rfp_report(rfp_question_set, category, region, cite=False)
+
+    # Cite every draft with one batched embedding call and vector query, then save them.
+    # Running after the last draft also means every agent's sources are in the index.
+    def cite_reports(vendor_draft, pestle_draft, porters_draft, swot_draft, rfp_draft):
+        _log(f"\nMatching citations for all reports...")
+        cited = report_generator.append_citations({
+            "vendor": vendor_draft,
+            "pestle": pestle_draft,
+            "porters": porters_draft,
+            "swot": swot_draft,
+            "rfp": rfp_draft,
+        })
+        report_files = {}
+        for name, filename in REPORT_FILES.items():
+            report_files[name] = save_report(cited[name], str(output_dir / filename))
+            _log(f"         Report saved to: {report_files[name]}")
+        return report_files
 
-        completed = 0
-        total = len(swot_vendors)
-        for future in as_completed(futures):
-            idx, vendor = futures[future]
-            try:
-                swot = future.result()
-                swot_results_indexed.append((idx, swot))
-            except Exception:
-                # Skip failed SWOTs but continue processing others
-                pass
-            finally:
-                completed += 1
-                if progress_callback:
-                    vendor_name = (
-                        vendor.get("name", "vendor") if isinstance(vendor, dict) else getattr(vendor, "name", "vendor")
-                    )
-                    progress_callback(2, f"SWOT: {vendor_name}", advance=1)
-
-    # Restore original order and drop failures
-    swot_results_indexed.sort(key=lambda x: x[0])
-    swot_analyses = [sw for _, sw in swot_results_indexed if sw is not None]
-
-    # Generate and save SWOT report immediately
-    swot_markdown = report_generator.generate_swot_report(swot_analyses, category, region)
-    swot_file = save_report(swot_markdown, str(output_dir / "04_swot_analyses.md"))
-    _log(f"[STEP 4] SWOT analyses complete - {len(swot_analyses)} vendors analyzed")
-    _log(f"         Report saved to: {swot_file}")
-
-# STEP 5 — RFP generation using preceding outputs.
-    if progress_callback:
-        # Set description without advancing; we'll advance on completion
-        progress_callback(3, "RFP Generation", advance=0)
-    configure_primary_lm()
-    rfp_agent = create_rfp_agent(use_tools=True, max_iters=max_rfp_iters)
-    pestle_payload = pestle_analysis.dict() if hasattr(pestle_analysis, "dict") else pestle_analysis
-    porters_payload = (
-        porters_analysis.dict() if hasattr(porters_analysis, "dict") else porters_analysis
-    )
-    swot_payloads = [
-        swot.dict() if hasattr(swot, "dict") else swot
-        for swot in swot_analyses
-        if swot is not None
-    ]
-    vendor_payloads = [
-        vendor.dict() if hasattr(vendor, "dict") else vendor
-        for vendor in vendor_list
-    ]
-    with scoped_tavily_extract_budget():
-        rfp_prediction = rfp_agent(
+    # Now generate the combined report from all the individual reports
+    def render_combined_report(report_files):
+        _log(f"\nGenerating combined analysis report...")
+        vendor_file = report_files["vendor"]
+        pestle_file = report_files["pestle"]
+        porters_file = report_files["porters"]
+        swot_file = report_files["swot"]
+        rfp_file = report_files["rfp"]
+
+        # Read back the individual reports we just saved
+        with open(vendor_file, 'r', encoding='utf-8') as f:
+            vendor_content = f.read()
+        with open(pestle_file, 'r', encoding='utf-8') as f:
+            pestle_content = f.read()
+        with open(porters_file, 'r', encoding='utf-8') as f:
+            porters_content = f.read()
+        with open(swot_file, 'r', encoding='utf-8') as f:
+            swot_content = f.read()
+        with open(rfp_file, 'r', encoding='utf-8') as f:
+            rfp_content = f.read()
+
+        # Generate the combined report
+        combined_markdown = report_generator.generate_combined_report(
             category=category,
             region=region,
-            pestle_analysis=pestle_payload,
-            porters_analysis=porters_payload,
-            swot_analyses=swot_payloads,
-            vendor_list=vendor_payloads,
-            expected_question_count=expected_rfp_questions,
+            vendor_report=vendor_content,
+            pestle_report=pestle_content,
+            porters_report=porters_content,
+            swot_report=swot_content,
+            rfp_report=rfp_content
         )
-    rfp_question_set = getattr(rfp_prediction, "question_set", None)
-    if rfp_question_set is None:
-        raise RuntimeError("RFP agent did not return a question set")
-
-    # Generate and save RFP report immediately
-    rfp_markdown = report_generator.generate_rfp_report(rfp_question_set, category, region)
-    rfp_file = save_report(rfp_markdown, str(output_dir / "05_rfp_questions.md"))
-    _log(f"[STEP 5] RFP generation complete - {rfp_question_set.total_questions} questions generated")
-    _log(f"         Report saved to: {rfp_file}")
-    if progress_callback:
-        progress_callback(3, "RFP Generation", advance=1)
-
-    # Now generate the combined report from all the individual reports
-    _log(f"\nGenerating combined analysis report...")
-
-    # Read back the individual reports we just saved
-    with open(vendor_file, 'r', encoding='utf-8') as f:
-        vendor_content = f.read()
-    with open(pestle_file, 'r', encoding='utf-8') as f:
-        pestle_content = f.read()
-    with open(porters_file, 'r', encoding='utf-8') as f:
-        porters_content = f.read()
-    with open(swot_file, 'r', encoding='utf-8') as f:
-        swot_content = f.read()
-    with open(rfp_file, 'r', encoding='utf-8') as f:
-        rfp_content = f.read()
-
-    # Generate the combined report
-    combined_markdown = report_generator.generate_combined_report(
-        category=category,
-        region=region,
-        vendor_report=vendor_content,
-        pestle_report=pestle_content,
-        porters_report=porters_content,
-        swot_report=swot_content,
-        rfp_report=rfp_content
+        return save_report(combined_markdown, str(output_dir / "COMPLETE_ANALYSIS_REPORT.md"))
+
+    graph = StageGraph(max_workers=8)
+    graph.add("vendor_list", discover_vendors)
+    graph.add("pestle_analysis", analyze_pestle)
+    graph.add("porters_analysis", analyze_porters)
+    graph.add("vendor_draft", draft_vendor_report, deps=["vendor_list"])
+    graph.add("pestle_draft", draft_pestle_report, deps=["pestle_analysis"])
+    graph.add("porters_draft", draft_porters_report, deps=["porters_analysis"])
+    graph.add("swot_analyses", analyze_swots, deps=["vendor_list"])
+    graph.add("swot_draft", draft_swot_report, deps=["swot_analyses"])
+    graph.add(
+        "rfp_question_set",
+        generate_rfp,
+        deps=["vendor_list", "pestle_analysis", "porters_analysis", "swot_analyses"],
     )
+    graph.add("rfp_draft", draft_rfp_report, deps=["rfp_question_set"])
+    graph.add(
+        "report_files",
+        cite_reports,
+        deps=["vendor_draft", "pestle_draft", "porters_draft", "swot_draft", "rfp_draft"],
+    )
+    graph.add("complete_file", render_combined_report, deps=["report_files"])
+
+    def _stop_swots(stage: str, error: BaseException) -> None:
+        # Fail fast: drop queued SWOT analyses rather than finishing them for a run that failed
+        _log(f"[ERROR] Stage {stage} failed; cancelling queued SWOT analyses")
+        swot_pool.close()
 
-    complete_file = save_report(combined_markdown, str(output_dir / "COMPLETE_ANALYSIS_REPORT.md"))
+    if CITATION_BACKGROUND_INDEXING:
+        # Embed sources for citation matching while the agents are still researching
+        report_generator.citation_matcher.start_background_indexing(get_source_logger())
+    try:
+        stage_results = graph.run(on_failure=_stop_swots)
+    finally:
+        swot_pool.close()
+        # Unsubscribe the indexer whether or not the run succeeded
+        report_generator.citation_matcher.stop_background_indexing()
+
+    report_files = stage_results["report_files"]
+    vendor_file = report_files["vendor"]
+    pestle_file = report_files["pestle"]
+    porters_file = report_files["porters"]
+    swot_file = report_files["swot"]
+    rfp_file = report_files["rfp"]
+    complete_file = stage_results["complete_file"]
 
     _log(f"\n✅ All reports generated successfully!")
     _log(f"\n📁 Output directory: {output_dir}")
@@ -310,15 +404,66 @@ def run_complete_pipeline(
     _log(f"  - RFP Questions: {Path(rfp_file).name}")
     _log(f"\n📑 Combined report: {Path(complete_file).name}")
 
+    critical_path, critical_seconds = graph.critical_path()
+    _log(f"⏱️ Critical path: {' → '.join(critical_path)} ({critical_seconds:.0f}s)")
+
     # Report on sources collected for citations
     source_logger = get_source_logger()
     manifest = source_logger.get_session_manifest()
     _log(f"\n📚 Citation Sources:")
     _log(f"  - Session ID: {manifest['session_id']}")
-    _log(f"  - Total sources logged: {manifest['total_sources']}")
+    _log(f"  - Total sources logged: {manifest['total_sources']} ({manifest['unique_urls']} unique URLs)")
     _log(f"  - Source files: {len(manifest['files'])}")
     for file_name, count in manifest['files'].items():
         _log(f"    • {file_name}: {count} sources")
+    store_stats = manifest['extract_store']
+    if store_stats['hits'] or store_stats['misses']:
+        _log(
+            f"  - Shared extracts: {store_stats['pages']} pages, {store_stats['hits']} reused "
+            f"({store_stats['hit_rate']:.0%} hit rate, {store_stats['calls_saved']} extract calls saved)"
+        )
+
+    cache_stats = get_tavily_cache_stats()
+    if cache_stats.get("enabled"):
+        hits = sum(cache_stats["hits"].values())
+        misses = sum(cache_stats["misses"].values())
+        _log(f"\n🗄️ Tavily cache: {hits} hits / {misses} misses ({cache_stats['hit_rate']:.0%} hit rate)")
+
+    embed_stats = get_embedding_cache_stats()
+    if embed_stats.get("enabled"):
+        embed_hits = sum(embed_stats["hits"].values())
+        embed_misses = sum(embed_stats["misses"].values())
+        if embed_hits or embed_misses:
+            _log(
+                f"🧮 Embedding cache: {embed_hits} hits / {embed_misses} misses "
+                f"({embed_stats['hit_rate']:.0%} hit rate, {embed_stats['entries']} vectors cached)"
+            )
+
+    prefetch_stats = get_extract_prefetch_stats()
+    if prefetch_stats["scheduled"]:
+        _log(
+            f"⚡ Extract prefetch: {prefetch_stats['consumed']}/{prefetch_stats['scheduled']} used, "
+            f"{prefetch_stats['cancelled']} cancelled, {prefetch_stats['unused']} unused"
+        )
+
+    client_stats = get_tavily_client_stats()
+    if client_stats["requests"]:
+        _log(
+            f"🔌 Tavily HTTP: {client_stats['requests']} requests, "
+            f"{client_stats['new_connections']} new connections "
+            f"({client_stats['reuse_rate']:.0%} reused)"
+        )
+        rate_stats = client_stats["rate_limit"]
+        long_stats = client_stats["rate_limit_long_running"]
+        throttled = rate_stats["throttled"] + long_stats["throttled"]
+        retries = rate_stats["retries"] + long_stats["retries"]
+        if retries or throttled:
+            _log(
+                f"🚦 Tavily rate limiting: {throttled} throttled responses, {retries} retries, "
+                f"{rate_stats['failures'] + long_stats['failures']} failures "
+                f"(concurrency windows {rate_stats['concurrency']['limit']} search, "
+                f"{long_stats['concurrency']['limit']} extract/crawl)"
+            )
 
 def main() -> None:
     load_dotenv(override=True)
@@ -0,0 +1,83 @@
+"""Tests for the ContextVar agent identity in :mod:`utils.agent_context`."""
+
+import asyncio
+import inspect
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import dspy
+
+from utils.agent_context import UNKNOWN_AGENT, agent_scope, bind_agent, get_current_agent, submit_with_context
+
+
+class AgentScopeTest(unittest.TestCase):
+    def test_scopes_nest_and_restore(self):
+        self.assertEqual(get_current_agent(), UNKNOWN_AGENT)
+        with agent_scope("vendor_agent"):
+            with agent_scope(None):
+                self.assertEqual(get_current_agent(), "vendor_agent")
+            with agent_scope("swot_agent"):
+                self.assertEqual(get_current_agent(), "swot_agent")
+            self.assertEqual(get_current_agent(), "vendor_agent")
+        self.assertEqual(get_current_agent(), UNKNOWN_AGENT)
+
+    def test_submit_with_context_carries_the_agent_into_pool_threads(self):
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            with agent_scope("pestle_agent"):
+                bound = submit_with_context(pool, get_current_agent)
+                plain = pool.submit(get_current_agent)
+            # The copy is taken at submit time, not when the task runs
+            self.assertEqual(bound.result(), "pestle_agent")
+            self.assertEqual(plain.result(), UNKNOWN_AGENT)
+
+    def test_concurrent_scopes_do_not_leak_between_threads(self):
+        barrier = threading.Barrier(2)
+        seen = {}
+
+        def work(name):
+            with agent_scope(name):
+                barrier.wait(5)
+                seen[name] = get_current_agent()
+
+        threads = [threading.Thread(target=work, args=(name,)) for name in ("vendor_agent", "porters_agent")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(seen, {"vendor_agent": "vendor_agent", "porters_agent": "porters_agent"})
+
+
+def lookup(query: str, limit: int = 3) -> str:
+    """Look something up."""
+    return f"{get_current_agent()}:{query}:{limit}"
+
+
+async def alookup(query: str) -> str:
+    """Look something up asynchronously."""
+    await asyncio.sleep(0)
+    return f"{get_current_agent()}:{query}"
+
+
+class BindAgentTest(unittest.TestCase):
+    def test_bound_tools_run_as_their_agent(self):
+        bound = bind_agent(lookup, "rfp_agent")
+        with agent_scope("vendor_agent"):
+            self.assertEqual(bound("acme", limit=1), "rfp_agent:acme:1")
+            self.assertEqual(get_current_agent(), "vendor_agent")
+        self.assertIs(bind_agent(lookup, None), lookup)
+
+    def test_async_tools_stay_coroutines(self):
+        bound = bind_agent(alookup, "swot_agent")
+        self.assertTrue(inspect.iscoroutinefunction(bound))
+        self.assertEqual(asyncio.run(bound("acme")), "swot_agent:acme")
+
+    def test_bound_tools_keep_their_dspy_schema(self):
+        plain = dspy.Tool(lookup)
+        bound = dspy.Tool(bind_agent(lookup, "rfp_agent"))
+        self.assertEqual((bound.name, bound.desc, bound.args), (plain.name, plain.desc, plain.args))
+        self.assertEqual(bound(query="acme"), "rfp_agent:acme:3")
+
+
+if __name__ == "__main__":
+    unittest.main()
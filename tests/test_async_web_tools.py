@@ -0,0 +1,146 @@
+"""Tests for the asyncio Tavily tools in :mod:`tools.async_web_tools`."""
+
+import asyncio
+import contextvars
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from tools import _tavily_common, async_web_tools, web_tools
+from tools.async_web_tools import AsyncCapableTool
+from utils.response_cache import ResponseCache
+from utils.source_logger import source_session
+
+URLS = [f"https://acme.example/page{i}" for i in range(2)]
+
+
+def _search_response(label):
+    return {"results": [{"title": label, "url": url, "content": f"{label} snippet"} for url in URLS]}
+
+
+class _BlockingTavilyClient:
+    """Sync client whose search blocks until released, so a request stays in flight."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.searches = []
+
+    def search(self, query, max_results=20, include_answer=False):
+        self.searches.append(query)
+        self.release.wait(5)
+        return _search_response("sync")
+
+
+class _AsyncTavilyClient:
+    def __init__(self):
+        self.searches = []
+        self.extracts = []
+
+    async def search(self, query, max_results=20, include_answer=False):
+        self.searches.append(query)
+        return _search_response("async")
+
+    async def extract(self, urls, timeout=None):
+        self.extracts.append(list(urls))
+        return {"results": [{"url": url, "raw_content": f"Text of {url}"} for url in urls], "failed_results": []}
+
+
+class AsyncCapableToolTest(unittest.TestCase):
+    def test_acall_awaits_the_async_implementation(self):
+        calls = []
+
+        def blocking(query: str) -> str:
+            calls.append("sync")
+            return f"sync:{query}"
+
+        async def native(query: str) -> str:
+            await asyncio.sleep(0)
+            calls.append("async")
+            return f"async:{query}"
+
+        tool = AsyncCapableTool(blocking, native, name="lookup", desc="Look something up")
+        self.assertEqual(asyncio.run(tool.acall(query="acme")), "async:acme")
+        self.assertEqual(calls, ["async"])
+        self.assertEqual(tool(query="acme"), "sync:acme")
+        self.assertEqual(calls, ["async", "sync"])
+
+
+class AsyncWebToolsTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        cwd = os.getcwd()
+        os.chdir(tmp.name)
+        self.addCleanup(os.chdir, cwd)
+
+        self.sync_client = _BlockingTavilyClient()
+        self.addCleanup(self.sync_client.release.set)
+        self.async_client = _AsyncTavilyClient()
+        cache = ResponseCache(os.path.join(tmp.name, "cache.sqlite"))
+        self.addCleanup(cache.close)
+        for patcher in (
+            mock.patch.object(web_tools, "get_tavily_client", return_value=self.sync_client),
+            mock.patch.object(async_web_tools, "get_async_tavily_client", return_value=self.async_client),
+            mock.patch.object(_tavily_common, "get_tavily_cache", return_value=cache),
+            mock.patch.object(_tavily_common, "TAVILY_PREFETCH_TOP_K", 0),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        session = source_session("async-tools-test")
+        session.__enter__()
+        self.addCleanup(session.__exit__, None, None, None)
+        self.search_tool = web_tools.create_dspy_tools("async_test")[0]
+
+    def test_search_tool_acall_uses_async_client_and_cache(self):
+        results = asyncio.run(self.search_tool.acall(query="acme pricing", max_results=5))
+        self.assertEqual([r["title"] for r in results], ["async", "async"])
+        self.assertEqual(self.async_client.searches, ["acme pricing"])
+        self.assertEqual(self.sync_client.searches, [])
+
+        # The blocking path is served from the entry the async path cached
+        self.sync_client.release.set()
+        self.assertEqual([r["title"] for r in self.search_tool(query="acme pricing", max_results=5)], ["async", "async"])
+        self.assertEqual(self.sync_client.searches, [])
+
+    def test_async_search_joins_a_blocking_search_in_flight(self):
+        sync_results = []
+        coalesced = _tavily_common.tavily_flights.stats()["coalesced"]
+        context = contextvars.copy_context()
+        thread = threading.Thread(
+            target=lambda: sync_results.append(context.run(web_tools.tavily_search, "acme pricing", max_results=5))
+        )
+        thread.start()
+        deadline = time.monotonic() + 5
+        while not self.sync_client.searches:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.005)
+
+        async def _search_then_release():
+            task = asyncio.create_task(self.search_tool.acall(query="acme pricing", max_results=5))
+            while _tavily_common.tavily_flights.stats()["coalesced"] == coalesced:
+                await asyncio.sleep(0.005)
+            self.sync_client.release.set()
+            return await task
+
+        results = asyncio.run(_search_then_release())
+        thread.join(5)
+        self.assertEqual([r["title"] for r in results], ["sync", "sync"])
+        self.assertEqual(self.async_client.searches, [])
+        self.assertEqual(sync_results[0], results)
+
+    def test_extract_async_caches_and_logs_pages(self):
+        self.sync_client.release.set()
+        response = asyncio.run(async_web_tools.tavily_extract_async(URLS[0]))
+        self.assertEqual(response["results"][0]["raw_content"], f"Text of {URLS[0]}")
+        self.assertEqual(self.async_client.extracts, [[URLS[0]]])
+        # Served from the response cache the second time
+        asyncio.run(async_web_tools.tavily_extract_async(URLS[0]))
+        self.assertEqual(self.async_client.extracts, [[URLS[0]]])
+
+
+if __name__ == "__main__":
+    unittest.main()
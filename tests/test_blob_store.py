@@ -0,0 +1,105 @@
+"""Tests for content-addressed page bodies in :class:`utils.blob_store.BlobStore`."""
+
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from utils.blob_store import BlobStore
+from utils.source_codec import get_codec
+from utils.source_logger import SourceLogger
+
+PAGE = "Acme widgets are priced per seat. " * 50
+
+
+class BlobStoreTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name) / "blobs"
+
+    def _files(self):
+        return sorted(path.name for path in self.root.rglob("*") if path.is_file())
+
+    def test_identical_text_is_stored_once(self):
+        store = BlobStore(self.root)
+        key = store.put(PAGE)
+        self.assertEqual(store.put(PAGE), key)
+        self.assertEqual(BlobStore(self.root).put(PAGE), key)
+
+        self.assertEqual(key, BlobStore.key_for(PAGE))
+        self.assertEqual(self._files(), [f"{key}.txt"])
+        self.assertEqual(store.path_for(key).parent.name, key[:2])
+        self.assertEqual(store.get(key), PAGE)
+        self.assertEqual(store.stats(), {"blobs_written": 1, "bytes_written": len(PAGE.encode("utf-8"))})
+
+    def test_concurrent_writers_leave_one_complete_blob(self):
+        store = BlobStore(self.root)
+        barrier = threading.Barrier(8)
+
+        def write():
+            barrier.wait(5)
+            store.put(PAGE)
+
+        threads = [threading.Thread(target=write) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        key = BlobStore.key_for(PAGE)
+        self.assertEqual(self._files(), [f"{key}.txt"])
+        self.assertEqual(store.get(key), PAGE)
+
+    def test_blobs_stay_readable_when_the_codec_changes(self):
+        plain_key = BlobStore(self.root).put("written uncompressed")
+        gzip_store = BlobStore(self.root, codec=get_codec("gzip"))
+        gzip_key = gzip_store.put(PAGE)
+
+        self.assertTrue(gzip_store.path_for(gzip_key).name.endswith(".txt.gz"))
+        self.assertLess(gzip_store.stats()["bytes_written"], len(PAGE))
+        self.assertEqual(gzip_store.get(plain_key), "written uncompressed")
+        self.assertEqual(BlobStore(self.root).get(gzip_key), PAGE)
+        # Already stored uncompressed, so not written again as .gz
+        self.assertEqual(gzip_store.put("written uncompressed"), plain_key)
+        self.assertEqual(gzip_store.stats()["blobs_written"], 1)
+
+    def test_missing_blob_returns_none(self):
+        self.assertIsNone(BlobStore(self.root).get("0" * 64))
+
+
+class SourceLoggerBlobTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        cwd = os.getcwd()
+        os.chdir(tmp.name)
+        self.addCleanup(os.chdir, cwd)
+
+    def test_page_logged_by_several_agents_is_stored_once(self):
+        source_logger = SourceLogger("blob-test", blob_min_chars=100)
+        self.addCleanup(source_logger.index.close)
+        self.addCleanup(source_logger.close)
+        for agent in ("vendor_agent", "swot_agent"):
+            source_logger.log_tavily_results(
+                [{"url": "https://acme.example", "raw_content": PAGE, "content": PAGE}], "acme", "tavily_extract", agent
+            )
+        source_logger.log_tavily_results([{"url": "https://b.example", "content": "short"}], "b", "tavily_search",
+                                         "vendor_agent")
+
+        records = source_logger.find_sources()
+        self.assertEqual([record["content"] for record in records], [PAGE, PAGE, "short"])
+        stats = source_logger.blob_stats()
+        self.assertEqual(
+            (stats["unique_blobs"], stats["references"], stats["deduplicated"], stats["blobs_written"]),
+            (1, 2, 1, 1),
+        )
+
+        # Long bodies are referenced by hash instead of being repeated in every JSONL line
+        log_text = (source_logger.base_dir / "swot_agent_tavily_extract.jsonl").read_text(encoding="utf-8")
+        self.assertIn(BlobStore.key_for(PAGE), log_text)
+        self.assertNotIn(PAGE, log_text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,254 @@
+"""Tests for :mod:`utils.citation_matcher` on the local vector index with a toy embedder."""
+
+import os
+import re
+import tempfile
+import unittest
+import zlib
+from unittest import mock
+
+import numpy as np
+
+from tools.markdown_tools import ReportGenerator
+from utils import citation_matcher
+from utils.citation_matcher import CitationMatcher, EmbeddingBatcher
+from utils.source_logger import source_session
+
+
+class HashEmbedding:
+    """Deterministic bag-of-words embedder: each word bumps one of 64 dimensions."""
+
+    model = "test-hash"
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, input):
+        texts = list(input)
+        self.calls.append(texts)
+        vectors = np.zeros((len(texts), 64), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in re.findall(r"\w+", text.lower()):
+                vectors[row, zlib.crc32(word.encode()) % 64] += 1.0
+        return vectors
+
+
+def _source(url, content):
+    return {"url": url, "title": url.rsplit("/", 1)[-1], "content": content}
+
+
+class CitationMatcherTestCase(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        cwd = os.getcwd()
+        os.chdir(tmp.name)
+        self.addCleanup(os.chdir, cwd)
+
+        self.embedder = HashEmbedding()
+        for patcher in (
+            mock.patch.object(citation_matcher, "get_embedding_cache", return_value=None),
+            mock.patch.object(citation_matcher, "CITATION_VECTOR_BACKEND", "local"),
+            mock.patch.object(CitationMatcher, "_local_embedding_function", staticmethod(lambda: self.embedder)),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        session = source_session("citation-test")
+        self.source_logger = session.__enter__()
+        self.addCleanup(session.__exit__, None, None, None)
+
+        self.matcher = CitationMatcher("citation-test")
+        self.addCleanup(lambda: self.matcher.collection and self.matcher.collection.close())
+
+    def _log(self, *sources):
+        self.source_logger.log_tavily_results(list(sources), "query", "tavily_search", "pestle_agent")
+
+
+class BackgroundIndexingTest(CitationMatcherTestCase):
+    def setUp(self):
+        super().setUp()
+        self.assertTrue(self.matcher.start_background_indexing(self.source_logger))
+        self.addCleanup(self.matcher.stop_background_indexing)
+
+    def test_every_lookup_sees_sources_logged_before_it(self):
+        self._log(_source("https://a.example/solar", "Solar panel tariffs rose 20% in 2024 across the region."))
+        first = self.matcher.find_citations("solar panel tariffs 20%", n_results=1)
+        self.assertEqual([c["url"] for c in first], ["https://a.example/solar"])
+        self.assertEqual(first[0]["found_by"], ["pestle_agent"])
+
+        # Logged after the index loaded: the next lookup still waits for it to be embedded
+        self._log(_source("https://b.example/wind", "Wind turbine orders doubled as offshore leasing expanded."))
+        second = self.matcher.find_citations("wind turbine orders offshore leasing", n_results=1)
+        self.assertEqual([c["url"] for c in second], ["https://b.example/wind"])
+
+    def test_batch_returns_one_list_per_text_and_skips_blanks(self):
+        self._log(
+            _source("https://a.example/solar", "Solar panel tariffs rose 20% in 2024 across the region."),
+            _source("https://b.example/wind", "Wind turbine orders doubled as offshore leasing expanded."),
+        )
+        batches = self.matcher.find_citations_batch(["wind turbine orders", "  ", "solar tariffs"], n_results=1)
+        self.assertEqual(len(batches), 3)
+        self.assertEqual(batches[0][0]["url"], "https://b.example/wind")
+        self.assertEqual(batches[1], [])
+        self.assertEqual(batches[2][0]["url"], "https://a.example/solar")
+
+
+
+SOLAR = _source("https://a.example/solar", "Solar panel tariffs rose 20% in 2024 across the region.")
+WIND = _source("https://b.example/wind", "Wind turbine orders doubled in 2023 as offshore leasing expanded.")
+
+
+class BatchedCitationsTest(CitationMatcherTestCase):
+    def setUp(self):
+        super().setUp()
+        self._log(SOLAR, WIND)
+        self.matcher.load_from_flat_files()
+        self.embedded = len(self.embedder.calls)
+
+    def test_every_section_is_cited_with_one_embedding_call(self):
+        citations = self.matcher.find_citations_for_sections(
+            {
+                "pestle": "Solar panel tariffs rose 20% in 2024. This sentence is not a claim",
+                "vendor": "Wind turbine orders doubled in 2023. Solar panel tariffs rose 20% in 2024.",
+                "empty": "Nothing worth citing here",
+            },
+            n_results_per_claim=1,
+            max_total_citations={"vendor": 1},
+        )
+        self.assertEqual(len(self.embedder.calls) - self.embedded, 1)
+        self.assertEqual(len(self.embedder.calls[-1]), 3)
+        self.assertEqual([c["url"] for c in citations["pestle"]], [SOLAR["url"]])
+        # Capped at one citation, taken in claim order
+        self.assertEqual([c["url"] for c in citations["vendor"]], [WIND["url"]])
+        self.assertEqual(citations["empty"], [])
+
+    def test_single_section_goes_through_the_batched_path(self):
+        citations = self.matcher.find_citations_for_section(
+            "Wind turbine orders doubled in 2023.", "vendor", n_results_per_claim=2, max_total_citations=5
+        )
+        self.assertEqual(citations[0]["url"], WIND["url"])
+        self.assertEqual(len(self.embedder.calls) - self.embedded, 1)
+
+
+class AppendCitationsTest(CitationMatcherTestCase):
+    def setUp(self):
+        super().setUp()
+        self._log(SOLAR, WIND)
+        self.generator = ReportGenerator(model=mock.Mock(), session_id="citation-test")
+        self.addCleanup(lambda: self.generator.citation_matcher.collection and
+                        self.generator.citation_matcher.collection.close())
+        self.generator.citation_matcher = self.matcher
+        self.formatters = []
+
+        def format_citations(generator, citations, formatter=None):
+            self.formatters.append(formatter)
+            return "## References\n" + "\n".join(c["url"] for c in citations)
+
+        patcher = mock.patch.object(ReportGenerator, "_format_citations", format_citations)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_reports_are_cited_together(self):
+        reports = {
+            "pestle": "# PESTLE\nSolar panel tariffs rose 20% in 2024.",
+            "vendor": "# Vendors\nWind turbine orders doubled in 2023.",
+            "rfp": "# RFP\nQuestions only",
+        }
+        self.matcher.load_from_flat_files()
+        embedded = len(self.embedder.calls)
+        cited = self.generator.append_citations(reports)
+
+        self.assertEqual(len(self.embedder.calls) - embedded, 1)
+        self.assertTrue(cited["pestle"].endswith(f"## References\n{SOLAR['url']}\n{WIND['url']}"))
+        self.assertTrue(cited["vendor"].startswith(reports["vendor"] + "\n\n## References\n" + WIND["url"]))
+        self.assertEqual(cited["rfp"], reports["rfp"])
+        # Concurrent formatting never shares the generator's own predictor
+        self.assertEqual(len(self.formatters), 2)
+        self.assertNotIn(self.generator.citation_formatter, self.formatters)
+        self.assertIsNot(self.formatters[0], self.formatters[1])
+
+    def test_reports_with_references_are_left_alone(self):
+        report = "# PESTLE\nSolar panel tariffs rose 20% in 2024.\n\n## References\n1. Existing"
+        self.assertEqual(self.generator.append_citations({"pestle": report}), {"pestle": report})
+
+
+class EmbeddingBatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.writes = []
+        self.batcher = EmbeddingBatcher(lambda documents, metadatas, ids: self.writes.append(ids),
+                                        batch_size=3, char_budget=1500)
+
+    def _add(self, item_id, length):
+        self.batcher.add("x" * length, {"id": item_id}, item_id)
+
+    def test_full_buckets_are_written_as_they_fill(self):
+        for i in range(7):
+            self._add(f"s{i}", 50)
+        self.assertEqual(self.writes, [["s0", "s1", "s2"], ["s3", "s4", "s5"]])
+        self.batcher.flush()
+        self.assertEqual(self.writes[-1], ["s6"])
+        self.assertEqual((self.batcher.written, self.batcher.batches), (7, 3))
+        self.batcher.flush()
+        self.assertEqual(self.batcher.batches, 3)
+
+    def test_short_and_long_passages_never_share_a_batch(self):
+        self._add("short", 100)
+        self._add("long", 900)
+        self._add("short2", 200)
+        self.assertEqual(self.writes, [])
+        # Two 900-character passages reach the character budget before the batch size
+        self._add("long2", 900)
+        self.assertEqual(self.writes, [["long", "long2"]])
+        self.batcher.flush()
+        self.assertEqual(self.writes[1:], [["short", "short2"]])
+
+
+class SourceDocumentsTest(unittest.TestCase):
+    def setUp(self):
+        for name, value in (("CITATION_CHUNK_TOKENS", 20), ("CITATION_CHUNK_OVERLAP_TOKENS", 5),
+                            ("CITATION_MAX_CHUNKS_PER_SOURCE", 4)):
+            patcher = mock.patch.object(citation_matcher, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_long_content_becomes_passages_tied_to_their_source(self):
+        source = {"source_id": 7, "url": "https://a.example/report", "title": "Report", "agent": "pestle_agent",
+                  "content": " ".join(f"Fact number {i} about the market." for i in range(6))}
+        entries = CitationMatcher._source_documents(source)
+
+        self.assertEqual([item_id for _, _, item_id in entries], [f"source_00007_{i:03d}" for i in range(4)])
+        for index, (document, metadata, _) in enumerate(entries):
+            self.assertTrue(document.startswith("Report\n"))
+            self.assertLessEqual(len(document), len("Report\n") + 20 * 4 + 1)
+            self.assertEqual((metadata["url"], metadata["parent_id"]), (source["url"], "source_00007"))
+            self.assertEqual((metadata["chunk"], metadata["chunks"]), (index, 4))
+        # Passages past the per-source cap are dropped
+        self.assertIn("Fact number 0", entries[0][0])
+        self.assertNotIn("Fact number 5", entries[-1][0])
+
+    def test_sources_without_content_yield_nothing(self):
+        self.assertEqual(CitationMatcher._source_documents({"source_id": 1, "content": "   "}), [])
+
+
+class ChunkedIndexTest(CitationMatcherTestCase):
+    def test_a_claim_deep_in_a_long_extract_is_matched_to_its_page(self):
+        filler = "\n".join(f"Paragraph {i} describes unrelated company history and staffing." for i in range(40))
+        report = _source("https://a.example/report", f"{filler}\nHydrogen electrolyser capacity tripled in 2025.")
+        with mock.patch.object(citation_matcher, "CITATION_CHUNK_TOKENS", 40), \
+                mock.patch.object(citation_matcher, "CITATION_CHUNK_OVERLAP_TOKENS", 0):
+            self._log(report, SOLAR)
+            self.matcher.load_from_flat_files()
+
+        self.assertGreater(self.matcher.collection.count(), 10)
+        best = self.matcher.collection.query(query_texts=["Hydrogen electrolyser capacity tripled"], n_results=1)
+        self.assertIn("Hydrogen electrolyser", best["documents"][0][0])
+        # Several passages of the report match, but each page is cited once
+        citations = self.matcher.find_citations("Hydrogen electrolyser capacity tripled", n_results=2)
+        urls = [c["url"] for c in citations]
+        self.assertEqual(urls[0], report["url"])
+        self.assertEqual(len(urls), len(set(urls)))
+
+
+if __name__ == "__main__":
+    unittest.main()
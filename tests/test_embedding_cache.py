@@ -0,0 +1,119 @@
+"""Tests for cached embeddings in :mod:`utils.embedding_cache` and their reuse across sessions."""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from tests.test_citation_matcher import HashEmbedding
+from utils import citation_matcher
+from utils.citation_matcher import CitationMatcher, get_embedding_cache_stats
+from utils.embedding_cache import CachedEmbeddingFunction
+from utils.response_cache import ResponseCache
+from utils.source_logger import source_session
+
+SOURCES = [
+    {"url": "https://a.example/solar", "title": "solar", "content": "Solar panel tariffs rose 20% in 2024."},
+    {"url": "https://a.example/wind", "title": "wind", "content": "Wind turbine orders doubled in 2023."},
+]
+
+
+class CachedEmbeddingFunctionTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache = ResponseCache(os.path.join(tmp.name, "embeddings.sqlite"))
+        self.addCleanup(self.cache.close)
+        self.embedder = HashEmbedding()
+
+    def test_repeated_texts_are_served_from_the_cache(self):
+        embed = CachedEmbeddingFunction(self.embedder, self.cache)
+        first = embed(["solar tariffs", "wind orders", "solar tariffs"])
+        # Duplicates within a call are embedded once
+        self.assertEqual(self.embedder.calls, [["solar tariffs", "wind orders"]])
+        np.testing.assert_array_equal(first[0], first[2])
+
+        second = embed(["wind orders", "grid delays", "solar tariffs"])
+        self.assertEqual(self.embedder.calls[-1], ["grid delays"])
+        np.testing.assert_array_equal(second[0], first[1])
+        np.testing.assert_array_equal(second[2], first[0])
+        self.assertEqual(second[1].dtype, np.float32)
+
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"]["embeddings:test-hash"], stats["misses"]["embeddings:test-hash"]), (2, 4))
+        self.assertEqual(stats["entries"], 3)
+
+    def test_cache_keys_are_scoped_by_model(self):
+        CachedEmbeddingFunction(self.embedder, self.cache)(["solar tariffs"])
+        other = CachedEmbeddingFunction(self.embedder, self.cache, model="other-model")
+        other(["solar tariffs"])
+        self.assertEqual(len(self.embedder.calls), 2)
+        self.assertEqual(other.namespace, "embeddings:other-model")
+        # Unknown attributes are forwarded to the wrapped function
+        self.assertIs(other.calls, self.embedder.calls)
+
+    def test_short_embedding_results_are_rejected(self):
+        def embed_one(texts):
+            return [np.ones(4, dtype=np.float32)]
+
+        with self.assertRaises(ValueError):
+            CachedEmbeddingFunction(embed_one, self.cache)(["a", "b"])
+        self.assertEqual(self.cache.stats()["entries"], 0)
+
+
+class CrossSessionCacheTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        cwd = os.getcwd()
+        os.chdir(tmp.name)
+        self.addCleanup(os.chdir, cwd)
+
+        self.cache = ResponseCache(os.path.join(tmp.name, "embeddings.sqlite"))
+        self.addCleanup(self.cache.close)
+        self.embedder = HashEmbedding()
+        for patcher in (
+            mock.patch.object(citation_matcher, "get_embedding_cache", return_value=self.cache),
+            mock.patch.object(citation_matcher, "CITATION_VECTOR_BACKEND", "local"),
+            mock.patch.object(CitationMatcher, "_local_embedding_function", staticmethod(lambda: self.embedder)),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _index_session(self, session_id):
+        with source_session(session_id) as source_logger:
+            self.addCleanup(source_logger.index.close)
+            source_logger.log_tavily_results([dict(source) for source in SOURCES], "query", "tavily_search",
+                                             "pestle_agent")
+            matcher = CitationMatcher(session_id)
+            matcher.load_from_flat_files()
+            self.addCleanup(matcher.collection.close)
+        return matcher
+
+    def test_a_new_session_embeds_only_new_passages(self):
+        self._index_session("first-run")
+        embedded = sum(len(call) for call in self.embedder.calls)
+        self.assertEqual(embedded, 2)
+
+        calls = len(self.embedder.calls)
+        matcher = self._index_session("second-run")
+        self.assertEqual(len(self.embedder.calls), calls)
+        self.assertEqual(matcher.collection.count(), 2)
+
+        citations = matcher.find_citations("Wind turbine orders doubled in 2023.", n_results=1)
+        self.assertEqual([c["url"] for c in citations], ["https://a.example/wind"])
+
+        stats = get_embedding_cache_stats()
+        self.assertTrue(stats["enabled"])
+        self.assertEqual(stats["hits"]["embeddings:test-hash"], 2)
+        self.assertGreater(stats["hit_rate"], 0.0)
+
+    def test_stats_report_a_disabled_cache(self):
+        with mock.patch.object(citation_matcher, "get_embedding_cache", return_value=None):
+            self.assertEqual(get_embedding_cache_stats(), {"enabled": False})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+"""Tests for speculative extract prefetch in :mod:`tools.web_tools`."""
+
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from tools import _tavily_common, web_tools
+from utils.response_cache import ResponseCache
+from utils.source_logger import source_session
+
+URLS = [f"https://acme.example/page{i}" for i in range(3)]
+
+
+class _FakeTavilyClient:
+    def __init__(self):
+        self.extracts = []
+
+    def search(self, query, max_results=20, include_answer=False):
+        return {"results": [{"title": url, "url": url, "content": "snippet"} for url in URLS]}
+
+    def extract(self, urls, timeout=None):
+        self.extracts.append(list(urls))
+        return {
+            "results": [{"url": url, "raw_content": f"Full text of {url}"} for url in urls],
+            "failed_results": [],
+        }
+
+
+class ExtractPrefetchTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        cwd = os.getcwd()
+        os.chdir(tmp.name)
+        self.addCleanup(os.chdir, cwd)
+
+        self.client = _FakeTavilyClient()
+        cache = ResponseCache(os.path.join(tmp.name, "cache.sqlite"))
+        self.addCleanup(cache.close)
+        prefetcher = _tavily_common.ExtractPrefetcher(max_workers=2)
+        for patcher in (
+            mock.patch.object(web_tools, "get_tavily_client", return_value=self.client),
+            mock.patch.object(_tavily_common, "get_tavily_client", return_value=self.client),
+            mock.patch.object(_tavily_common, "get_tavily_cache", return_value=cache),
+            mock.patch.object(_tavily_common, "extract_prefetcher", prefetcher),
+            mock.patch.object(_tavily_common, "TAVILY_PREFETCH_TOP_K", 2),
+            mock.patch.object(_tavily_common, "PAGE_FETCH_FALLBACK_ENABLED", False),
+            mock.patch.object(web_tools, "PAGE_FETCH_FALLBACK_ENABLED", False),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.prefetcher = prefetcher
+
+        session = source_session("prefetch-test")
+        session.__enter__()
+        self.addCleanup(session.__exit__, None, None, None)
+
+    def _search_and_wait(self, completed=2):
+        web_tools.tavily_search("acme pricing")
+        deadline = time.monotonic() + 5
+        while self.prefetcher.stats()["completed"] < completed:
+            self.assertLess(time.monotonic(), deadline, "prefetches did not finish")
+            time.sleep(0.01)
+
+    def test_prefetched_pages_are_served_under_a_tight_budget(self):
+        with web_tools.scoped_tavily_extract_budget(2):
+            self._search_and_wait()
+            self.assertEqual(web_tools.get_tavily_extract_budget_state(), (0, 2))
+
+            for url in URLS[:2]:
+                response = web_tools._tool_tavily_extract(url, query="pricing")
+                self.assertEqual([page["url"] for page in response["pages"]], [url])
+            self.assertEqual(web_tools.get_tavily_extract_budget_state(), (2, 0))
+            # Both pages came from the prefetches; no extra Tavily extract was made
+            self.assertEqual(self.client.extracts, [[URLS[0]], [URLS[1]]])
+
+            with self.assertRaisesRegex(RuntimeError, "budget exhausted"):
+                web_tools._tool_tavily_extract(URLS[2])
+
+        stats = self.prefetcher.stats()
+        self.assertEqual((stats["scheduled"], stats["consumed"], stats["unused"]), (2, 2, 0))
+
+    def test_unclaimed_prefetches_are_not_charged(self):
+        with web_tools.scoped_tavily_extract_budget(2):
+            self._search_and_wait()
+            self.assertEqual(web_tools.get_tavily_extract_budget_state(), (0, 2))
+        self.assertEqual(self.prefetcher.stats()["unused"], 2)
+
+    def test_claimed_pages_join_the_session_store(self):
+        with web_tools.scoped_tavily_extract_budget(2):
+            self._search_and_wait()
+            web_tools._tool_tavily_extract(URLS[0])
+        with web_tools.scoped_tavily_extract_budget(1):
+            web_tools._tool_tavily_extract(URLS[0])
+            self.assertEqual(web_tools.get_tavily_extract_budget_state(), (0, 1))
+        self.assertEqual(len(self.client.extracts), 2)
+
+    def test_prefetches_stay_within_remaining_budget(self):
+        with web_tools.scoped_tavily_extract_budget(1):
+            self._search_and_wait(completed=1)
+            web_tools.tavily_search("acme contact")
+            self.assertEqual(self.prefetcher.stats()["scheduled"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+"""Tests for session-wide extract reuse via :class:`utils.extract_store.SessionExtractStore`."""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from tools import _tavily_common, web_tools
+from utils.agent_context import agent_scope
+from utils.extract_store import SessionExtractStore
+from utils.source_logger import source_session
+
+URLS = [f"https://acme.example/page{i}" for i in range(3)]
+
+
+class _FakeTavilyClient:
+    def __init__(self):
+        self.extracts = []
+
+    def extract(self, urls, timeout=None):
+        self.extracts.append(list(urls))
+        return {"results": [{"url": url, "raw_content": f"Full text of {url}"} for url in urls], "failed_results": []}
+
+
+class SessionExtractStoreTest(unittest.TestCase):
+    def test_lookup_returns_copies_and_counts_saved_calls(self):
+        store = SessionExtractStore()
+        store.put("https://acme.example/", {"url": "https://acme.example/", "raw_content": "text"})
+        store.put("", {"url": "ignored"})
+
+        found, missing = store.lookup(["https://acme.example/"])
+        self.assertEqual(missing, [])
+        found["https://acme.example/"]["raw_content"] = "mutated"
+        self.assertEqual(store.lookup(["https://acme.example/"])[0]["https://acme.example/"]["raw_content"], "text")
+
+        found, missing = store.lookup(["https://acme.example/", "https://other.example/"])
+        self.assertEqual((list(found), missing), (["https://acme.example/"], ["https://other.example/"]))
+        self.assertEqual(
+            store.stats(),
+            {"pages": 1, "hits": 3, "misses": 1, "hit_rate": 0.75, "calls_saved": 2},
+        )
+
+
+class ExtractReuseTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        cwd = os.getcwd()
+        os.chdir(tmp.name)
+        self.addCleanup(os.chdir, cwd)
+
+        self.client = _FakeTavilyClient()
+        # No response cache, so any reuse comes from the session store
+        for patcher in (
+            mock.patch.object(_tavily_common, "get_tavily_client", return_value=self.client),
+            mock.patch.object(_tavily_common, "get_tavily_cache", return_value=None),
+            mock.patch.object(_tavily_common, "TAVILY_PREFETCH_TOP_K", 0),
+            mock.patch.object(web_tools, "PAGE_FETCH_FALLBACK_ENABLED", False),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _session(self, session_id):
+        session = source_session(session_id)
+        logger = session.__enter__()
+        self.addCleanup(session.__exit__, None, None, None)
+        return logger
+
+    def _extract(self, agent, urls, budget=2):
+        with agent_scope(agent), web_tools.scoped_tavily_extract_budget(budget):
+            response = web_tools._tool_tavily_extract(urls, query="pricing")
+            return response, web_tools.get_tavily_extract_budget_state()
+
+    def test_pages_extracted_by_one_agent_are_free_for_the_next(self):
+        logger = self._session("reuse-test")
+        _, state = self._extract("vendor_agent", URLS[0])
+        self.assertEqual(state, (1, 1))
+
+        response, state = self._extract("swot_agent", [URLS[0]], budget=1)
+        self.assertEqual([page["url"] for page in response["pages"]], [URLS[0]])
+        self.assertEqual(state, (0, 1))
+        self.assertEqual(self.client.extracts, [[URLS[0]]])
+
+        # Only the page nobody has extracted yet is fetched and charged
+        response, state = self._extract("rfp_agent", [URLS[0], URLS[1]])
+        self.assertEqual([page["url"] for page in response["pages"]], [URLS[0], URLS[1]])
+        self.assertEqual(state, (1, 1))
+        self.assertEqual(self.client.extracts, [[URLS[0]], [URLS[1]]])
+
+        stats = logger.extract_store.stats()
+        self.assertEqual((stats["pages"], stats["calls_saved"]), (2, 1))
+
+    def test_url_variants_share_one_entry(self):
+        self._session("variant-test")
+        self._extract("vendor_agent", "https://acme.example/page0#pricing")
+        _, state = self._extract("swot_agent", URLS[0])
+        self.assertEqual(state, (0, 2))
+        self.assertEqual(len(self.client.extracts), 1)
+
+    def test_sessions_do_not_share_pages(self):
+        self._session("first-run")
+        self._extract("vendor_agent", URLS[0])
+        self._session("second-run")
+        self._extract("vendor_agent", URLS[0])
+        self.assertEqual(self.client.extracts, [[URLS[0]], [URLS[0]]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+"""Tests for :mod:`utils.near_duplicates`."""
+
+import random
+import unittest
+
+import numpy as np
+
+from utils.near_duplicates import MinHasher, NearDuplicateIndex, _band_layout, shingle_hashes
+
+
+def _article(seed, words=400):
+    rng = random.Random(seed)
+    vocabulary = [f"word{i}" for i in range(2000)]
+    return " ".join(rng.choice(vocabulary) for _ in range(words))
+
+
+def _edit(text, fraction, seed=0):
+    """Replace ``fraction`` of the words of ``text`` with unseen ones."""
+    words = text.split()
+    rng = random.Random(seed)
+    for index in rng.sample(range(len(words)), int(len(words) * fraction)):
+        words[index] = f"edit{index}"
+    return " ".join(words)
+
+
+class ShingleTest(unittest.TestCase):
+    def test_short_and_empty_texts(self):
+        self.assertEqual(shingle_hashes("").size, 0)
+        self.assertEqual(shingle_hashes("two words", size=5).size, 1)
+        self.assertEqual(shingle_hashes("a b c d e f", size=5).size, 2)
+
+    def test_signatures_are_stable_across_instances(self):
+        text = _article(1)
+        np.testing.assert_array_equal(MinHasher().signature(text), MinHasher().signature(text))
+        self.assertIsNone(MinHasher().signature("  ... "))
+
+
+class BandLayoutTest(unittest.TestCase):
+    def test_midpoint_never_exceeds_threshold(self):
+        for threshold in (0.5, 0.7, 0.85, 0.95):
+            bands, rows = _band_layout(128, threshold)
+            self.assertEqual(bands * rows, 128)
+            self.assertLessEqual((1.0 / bands) ** (1.0 / rows), threshold)
+
+
+class NearDuplicateIndexTest(unittest.TestCase):
+    def test_exact_and_light_edits_collapse_to_first_key(self):
+        index = NearDuplicateIndex(threshold=0.85)
+        original = _article(1)
+        self.assertIsNone(index.add("first", original))
+        self.assertEqual(index.add("copy", original), "first")
+        self.assertEqual(index.add("tweaked", _edit(original, 0.005)), "first")
+        self.assertEqual(len(index), 1)
+
+    def test_heavy_edits_and_unrelated_texts_are_kept(self):
+        index = NearDuplicateIndex(threshold=0.85)
+        original = _article(1)
+        index.add("first", original)
+        self.assertIsNone(index.add("rewritten", _edit(original, 0.3)))
+        self.assertIsNone(index.add("other", _article(2)))
+        self.assertEqual(len(index), 3)
+
+    def test_threshold_controls_what_counts_as_duplicate(self):
+        original = _article(3)
+        edited = _edit(original, 0.05)
+        loose = NearDuplicateIndex(threshold=0.5)
+        strict = NearDuplicateIndex(threshold=1.0)
+        for index in (loose, strict):
+            index.add("first", original)
+        self.assertEqual(loose.add("edited", edited), "first")
+        self.assertIsNone(strict.add("edited", edited))
+        self.assertEqual(strict.add("exact", original), "first")
+
+    def test_empty_text_is_never_indexed(self):
+        index = NearDuplicateIndex()
+        self.assertIsNone(index.add("empty", ""))
+        self.assertIsNone(index.add("empty-again", ""))
+        self.assertEqual(len(index), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
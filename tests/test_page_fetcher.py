@@ -0,0 +1,134 @@
+"""Tests for :mod:`tools.page_fetcher` against an in-process ``httpx.MockTransport``."""
+
+import threading
+import time
+import unittest
+
+import httpx
+
+from tools.page_fetcher import PageFetchError, PageFetcher, html_to_text
+
+ARTICLE = """
+<html>
+  <head><title>Acme Widgets</title><script>var tracking = 1;</script></head>
+  <body>
+    <nav>Home | About</nav>
+    <h1>Widgets   for   everyone</h1>
+    <p>Acme ships <a href="/pricing">priced</a> widgets.</p>
+    <a href="#top">top</a><a href="mailto:sales@acme.test">mail</a>
+    <footer>Copyright</footer>
+  </body>
+</html>
+"""
+
+
+class HtmlToTextTest(unittest.TestCase):
+    def test_strips_chrome_and_resolves_links(self):
+        parsed = html_to_text(ARTICLE, base_url="https://acme.test/products/")
+        self.assertEqual(parsed["title"], "Acme Widgets")
+        self.assertIn("Widgets for everyone", parsed["text"])
+        self.assertIn("Acme ships", parsed["text"])
+        for chrome in ("tracking", "Home | About", "Copyright"):
+            self.assertNotIn(chrome, parsed["text"])
+        self.assertEqual(parsed["links"], ["https://acme.test/pricing"])
+
+
+class PageFetcherTest(unittest.TestCase):
+    def _fetcher(self, handler, **kwargs):
+        kwargs.setdefault("min_interval", 0.0)
+        fetcher = PageFetcher(transport=httpx.MockTransport(handler), **kwargs)
+        self.addCleanup(fetcher.close)
+        return fetcher
+
+    def test_fetch_extracts_html_text(self):
+        def handler(request):
+            return httpx.Response(200, headers={"content-type": "text/html; charset=utf-8"}, text=ARTICLE)
+
+        page = self._fetcher(handler).fetch("acme.test/products/widget")
+        self.assertEqual(page["url"], "acme.test/products/widget")
+        self.assertEqual(page["final_url"], "https://acme.test/products/widget")
+        self.assertEqual(page["title"], "Acme Widgets")
+        self.assertIn("Acme ships", page["raw_content"])
+        self.assertEqual(page["source"], "local_fetch")
+
+    def test_unusable_responses_land_in_failed_results(self):
+        def handler(request):
+            path = request.url.path
+            if path == "/report.pdf":
+                return httpx.Response(200, headers={"content-type": "application/pdf"}, content=b"%PDF-1.7")
+            if path == "/missing":
+                return httpx.Response(404, headers={"content-type": "text/html"}, text="gone")
+            if path == "/empty":
+                return httpx.Response(200, headers={"content-type": "text/html"}, text="<html><script>x</script></html>")
+            if path == "/down":
+                raise httpx.ConnectError("refused", request=request)
+            return httpx.Response(200, headers={"content-type": "text/plain"}, text="plain words")
+
+        urls = [
+            "https://a.test/report.pdf",
+            "https://a.test/missing",
+            "https://a.test/empty",
+            "https://a.test/down",
+            "https://a.test/ok.txt",
+        ]
+        response = self._fetcher(handler).fetch_many(urls)
+        self.assertEqual([page["url"] for page in response["results"]], ["https://a.test/ok.txt"])
+        self.assertEqual(response["results"][0]["raw_content"], "plain words")
+        failed = {item["url"]: item["error"] for item in response["failed_results"]}
+        self.assertEqual(set(failed), set(urls[:4]))
+        self.assertIn("Unsupported content type", failed["https://a.test/report.pdf"])
+        self.assertIn("HTTP 404", failed["https://a.test/missing"])
+        self.assertIn("No readable text", failed["https://a.test/empty"])
+
+    def test_oversized_body_is_truncated_to_max_bytes(self):
+        def handler(request):
+            return httpx.Response(200, headers={"content-type": "text/plain"}, content=b"a" * 5000 + b"TAIL")
+
+        page = self._fetcher(handler, max_bytes=1000).fetch("https://big.test/")
+        self.assertEqual(page["raw_content"], "a" * 1000)
+
+    def test_fetch_raises_for_invalid_url(self):
+        fetcher = self._fetcher(lambda request: httpx.Response(200))
+        with self.assertRaises(PageFetchError):
+            fetcher.fetch("https://[::1")
+
+    def test_per_domain_concurrency_is_capped(self):
+        lock = threading.Lock()
+        active = {}
+        peak = {}
+
+        def handler(request):
+            host = request.url.host
+            with lock:
+                active[host] = active.get(host, 0) + 1
+                peak[host] = max(peak.get(host, 0), active[host])
+            time.sleep(0.05)
+            with lock:
+                active[host] -= 1
+            return httpx.Response(200, headers={"content-type": "text/plain"}, text=host)
+
+        urls = [f"https://slow.test/{i}" for i in range(4)] + [f"https://other.test/{i}" for i in range(4)]
+        response = self._fetcher(handler, max_workers=8, per_domain=1).fetch_many(urls)
+        self.assertEqual(len(response["results"]), 8)
+        self.assertEqual(peak, {"slow.test": 1, "other.test": 1})
+
+    def test_min_interval_spaces_request_starts_per_domain(self):
+        starts = []
+        lock = threading.Lock()
+
+        def handler(request):
+            with lock:
+                starts.append(time.monotonic())
+            return httpx.Response(200, headers={"content-type": "text/plain"}, text="ok")
+
+        fetcher = self._fetcher(handler, max_workers=3, per_domain=3, min_interval=0.1)
+        fetcher.fetch_many([f"https://polite.test/{i}" for i in range(3)])
+        starts.sort()
+        gaps = [later - earlier for earlier, later in zip(starts, starts[1:])]
+        self.assertEqual(len(gaps), 2)
+        for gap in gaps:
+            self.assertGreaterEqual(gap, 0.08)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+"""Tests for BM25 passage selection in :mod:`utils.passage_ranker`."""
+
+import unittest
+from unittest import mock
+
+from tools import _tavily_common
+from utils.passage_ranker import BM25, chunk_passages, rank_passages, tokenize
+
+PRICING = "Acme widgets cost $40 per seat per month on the annual pricing plan."
+HISTORY = "Acme was founded in 1990 by two engineers in a garage."
+SUPPORT = "Support is available around the clock by phone and chat."
+
+
+class BM25Test(unittest.TestCase):
+    def test_tokenize_drops_stopwords_and_punctuation(self):
+        self.assertEqual(tokenize("What is the PRICE of Acme's widgets?"), ["price", "acme", "s", "widgets"])
+
+    def test_matching_rare_terms_score_highest(self):
+        scores = BM25([PRICING, HISTORY, SUPPORT]).scores("widget pricing plan per seat")
+        self.assertEqual(max(range(3), key=scores.__getitem__), 0)
+        self.assertEqual(scores[1:], [0.0, 0.0])
+
+    def test_shorter_documents_win_ties_on_term_frequency(self):
+        long_doc = "pricing " + "filler words about nothing in particular " * 10
+        scores = BM25(["pricing details", long_doc]).scores("pricing")
+        self.assertGreater(scores[0], scores[1])
+
+    def test_stopword_only_query_scores_zero(self):
+        self.assertEqual(BM25([PRICING, HISTORY]).scores("the of and"), [0.0, 0.0])
+
+
+class ChunkPassagesTest(unittest.TestCase):
+    def test_lines_are_packed_without_losing_words(self):
+        text = "\n\n".join([PRICING, HISTORY, SUPPORT] * 3)
+        passages = chunk_passages(text, max_tokens=40)
+        self.assertGreater(len(passages), 1)
+        self.assertTrue(all(len(passage) <= 160 for passage in passages))
+        self.assertEqual(" ".join(passages).split(), text.split())
+
+    def test_overlap_repeats_the_tail_of_the_previous_passage(self):
+        text = " ".join(f"word{i}." for i in range(200))
+        passages = chunk_passages(text, max_tokens=20, overlap_tokens=5)
+        self.assertGreater(len(passages), 2)
+        for previous, passage in zip(passages, passages[1:]):
+            tail, body = passage.split("\n", 1)
+            # Whole words only, and never more than the overlap budget
+            self.assertTrue(previous.endswith(tail))
+            self.assertLessEqual(len(tail), 20)
+            self.assertIn(" " + tail.split()[0], " " + previous)
+            self.assertNotIn(body, previous)
+        bodies = [passages[0]] + [passage.split("\n", 1)[1] for passage in passages[1:]]
+        self.assertEqual(" ".join(bodies), text)
+
+    def test_overlap_is_capped_at_half_the_passage(self):
+        text = " ".join(f"w{i}" for i in range(100))
+        for passage in chunk_passages(text, max_tokens=10, overlap_tokens=50)[1:]:
+            tail, body = passage.split("\n", 1)
+            self.assertLessEqual(len(tail), 20)
+            self.assertLessEqual(len(body), 20)
+
+    def test_empty_and_short_text(self):
+        self.assertEqual(chunk_passages("", overlap_tokens=10), [])
+        self.assertEqual(chunk_passages("  one line  ", overlap_tokens=10), ["one line"])
+
+
+class RankPassagesTest(unittest.TestCase):
+    def _documents(self):
+        return [
+            {"url": "https://acme.example/about", "title": "About", "text": f"{HISTORY}\n{SUPPORT}"},
+            {"url": "https://acme.example/pricing", "title": "Pricing", "text": f"{SUPPORT}\n{PRICING}"},
+        ]
+
+    def test_passages_are_ordered_by_relevance_across_pages(self):
+        passages = rank_passages(self._documents(), "annual pricing per seat", top_k=2, passage_tokens=20)
+        self.assertEqual(
+            [(p["url"], p["passage"]) for p in passages],
+            [("https://acme.example/pricing", 1), ("https://acme.example/about", 0)],
+        )
+        self.assertEqual(passages[0]["text"], PRICING)
+        self.assertGreater(passages[0]["score"], passages[1]["score"])
+
+    def test_without_a_query_pages_contribute_round_robin(self):
+        passages = rank_passages(self._documents(), "  ", top_k=3, passage_tokens=20)
+        self.assertEqual(
+            [(p["url"], p["passage"]) for p in passages],
+            [
+                ("https://acme.example/about", 0),
+                ("https://acme.example/pricing", 0),
+                ("https://acme.example/about", 1),
+            ],
+        )
+        self.assertEqual({p["score"] for p in passages}, {0.0})
+
+    def test_token_budget_skips_passages_that_do_not_fit(self):
+        documents = [{"url": "u", "title": "", "text": f"{'pricing ' * 40}\n{PRICING}"}]
+        passages = rank_passages(documents, "pricing", top_k=5, token_budget=30, passage_tokens=80)
+        # The best passage always fits; later ones only within the budget
+        self.assertEqual(len(passages), 1)
+        self.assertEqual(rank_passages([], "pricing"), [])
+
+
+class RankExtractResponseTest(unittest.TestCase):
+    def setUp(self):
+        settings = {"enabled": True, "top_k": 1, "token_budget": 500, "passage_tokens": 20}
+        patcher = mock.patch.object(_tavily_common, "get_extract_passage_settings", return_value=settings)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.response = {
+            "results": [{"url": "https://acme.example", "title": "Acme", "raw_content": f"{HISTORY}\n{PRICING}"}],
+            "failed_results": [{"url": "https://down.example", "error": "timeout"}],
+        }
+
+    def test_falls_back_to_the_last_search_query(self):
+        token = _tavily_common.last_search_query_var.set("acme pricing per seat")
+        self.addCleanup(_tavily_common.last_search_query_var.reset, token)
+        ranked = _tavily_common.rank_extract_response(self.response, None)
+        self.assertEqual(ranked["query"], "acme pricing per seat")
+        self.assertEqual([p["text"] for p in ranked["passages"]], [PRICING])
+        self.assertEqual(
+            ranked["pages"],
+            [{
+                "url": "https://acme.example",
+                "title": "Acme",
+                "characters": len(f"{HISTORY}\n{PRICING}"),
+                "passages_returned": 1,
+            }],
+        )
+        self.assertEqual(ranked["failed_results"], self.response["failed_results"])
+
+    def test_explicit_query_wins(self):
+        ranked = _tavily_common.rank_extract_response(self.response, "founded engineers garage")
+        self.assertEqual([p["text"] for p in ranked["passages"]], [HISTORY])
+
+
+if __name__ == "__main__":
+    unittest.main()
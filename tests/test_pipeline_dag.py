@@ -0,0 +1,153 @@
+"""Tests for :mod:`utils.pipeline_dag`."""
+
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.agent_context import agent_scope, get_current_agent, submit_with_context
+from utils.pipeline_dag import StageCancelled, StageError, StageGraph, raise_if_cancelled
+
+
+class StageGraphOrderTest(unittest.TestCase):
+    def test_order_respects_deps_and_after(self):
+        graph = StageGraph()
+        graph.add("report", lambda data: data, deps=["data"], after=["setup"])
+        graph.add("data", lambda: 1)
+        graph.add("setup", lambda: None)
+        order = graph.order()
+        self.assertLess(order.index("data"), order.index("report"))
+        self.assertLess(order.index("setup"), order.index("report"))
+
+    def test_cycle_is_rejected(self):
+        graph = StageGraph()
+        graph.add("a", lambda b: b, deps=["b"])
+        graph.add("b", lambda a: a, deps=["a"])
+        with self.assertRaisesRegex(ValueError, "cycle"):
+            graph.order()
+        with self.assertRaises(ValueError):
+            graph.run()
+
+    def test_undefined_dependency_and_duplicate_stage(self):
+        graph = StageGraph()
+        graph.add("a", lambda missing: missing, deps=["missing"])
+        with self.assertRaisesRegex(ValueError, "undefined"):
+            graph.order()
+        with self.assertRaises(ValueError):
+            graph.add("a", lambda: None)
+
+
+class StageGraphRunTest(unittest.TestCase):
+    def test_results_flow_between_stages(self):
+        graph = StageGraph(max_workers=2)
+        graph.add("vendors", lambda: ["acme"])
+        graph.add("swot", lambda vendors: [f"swot:{v}" for v in vendors], deps=["vendors"])
+        graph.add("report", lambda vendors, swot: (vendors, swot), deps=["vendors", "swot"])
+        completed = []
+        results = graph.run(on_complete=lambda name, result: completed.append(name))
+        self.assertEqual(results["report"], (["acme"], ["swot:acme"]))
+        self.assertEqual(completed.index("vendors"), 0)
+        self.assertEqual(completed[-1], "report")
+        path, seconds = graph.critical_path()
+        self.assertEqual(path, ["vendors", "swot", "report"])
+        self.assertGreaterEqual(seconds, 0.0)
+
+    def test_independent_stages_run_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+        graph = StageGraph(max_workers=2)
+        graph.add("left", barrier.wait)
+        graph.add("right", barrier.wait)
+        graph.run()
+
+    def test_stages_inherit_caller_context(self):
+        graph = StageGraph()
+        graph.add("who", get_current_agent)
+        with agent_scope("pipeline_test"):
+            self.assertEqual(graph.run()["who"], "pipeline_test")
+
+    def test_failure_cancels_and_joins_running_stages(self):
+        ran = []
+        failures = []
+        stopped = []
+        slow_started = threading.Event()
+
+        def slow():
+            slow_started.set()
+            try:
+                while True:
+                    raise_if_cancelled()
+                    time.sleep(0.01)
+            except StageCancelled:
+                stopped.append("slow")
+                raise
+
+        def fail():
+            slow_started.wait(5)
+            raise RuntimeError("pestle down")
+
+        graph = StageGraph(max_workers=3)
+        graph.add("slow", slow)
+        graph.add("pestle", fail)
+        graph.add("report", lambda pestle: ran.append(pestle), deps=["pestle"])
+
+        started = time.monotonic()
+        with self.assertRaises(StageError) as caught:
+            graph.run(on_failure=lambda name, error: failures.append((name, error)))
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertEqual(caught.exception.stage, "pestle")
+        self.assertIsInstance(caught.exception.__cause__, RuntimeError)
+        self.assertEqual([name for name, _ in failures], ["pestle"])
+        # The running stage observed the flag and finished before run() raised
+        self.assertEqual(stopped, ["slow"])
+        self.assertEqual(ran, [])
+        raise_if_cancelled()
+
+    def test_nested_tasks_see_cancellation(self):
+        observed = []
+        pool = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(pool.shutdown)
+        ready = threading.Event()
+
+        def worker():
+            ready.set()
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline:
+                try:
+                    raise_if_cancelled()
+                except StageCancelled:
+                    observed.append("cancelled")
+                    return
+                time.sleep(0.01)
+
+        def spawner():
+            return submit_with_context(pool, worker).result()
+
+        def fail():
+            ready.wait(5)
+            raise RuntimeError("boom")
+
+        graph = StageGraph(max_workers=2)
+        graph.add("spawner", spawner)
+        graph.add("fail", fail)
+        with self.assertRaises(StageError):
+            graph.run()
+        self.assertEqual(observed, ["cancelled"])
+
+    def test_join_gives_up_after_cancel_timeout(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def fail():
+            raise RuntimeError("boom")
+
+        graph = StageGraph(max_workers=2, cancel_timeout=0.1)
+        graph.add("stubborn", lambda: release.wait(10))
+        graph.add("fail", fail)
+        started = time.monotonic()
+        with self.assertRaises(StageError):
+            graph.run()
+        self.assertLess(time.monotonic() - started, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
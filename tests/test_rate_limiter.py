@@ -0,0 +1,163 @@
+"""Tests for :mod:`utils.rate_limiter`."""
+
+import asyncio
+import threading
+import time
+import unittest
+from unittest import mock
+
+from utils.rate_limiter import AdaptiveConcurrencyLimiter, RequestGovernor, TokenBucket
+
+
+class TokenBucketTest(unittest.TestCase):
+    def test_zero_rate_is_unlimited(self):
+        bucket = TokenBucket(0)
+        self.assertEqual([bucket.reserve() for _ in range(100)], [0.0] * 100)
+
+    def test_burst_then_spaced_reservations(self):
+        with mock.patch("utils.rate_limiter.time.monotonic", return_value=100.0):
+            bucket = TokenBucket(rate=2.0, burst=3)
+            delays = [bucket.reserve() for _ in range(5)]
+        self.assertEqual(delays[:3], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(delays[3], 0.5)
+        self.assertAlmostEqual(delays[4], 1.0)
+
+    def test_refills_over_time(self):
+        clock = [100.0]
+        with mock.patch("utils.rate_limiter.time.monotonic", side_effect=lambda: clock[0]):
+            bucket = TokenBucket(rate=1.0, burst=1)
+            self.assertEqual(bucket.reserve(), 0.0)
+            clock[0] += 1.0
+            self.assertEqual(bucket.reserve(), 0.0)
+            self.assertAlmostEqual(bucket.reserve(), 1.0)
+
+
+class AdaptiveConcurrencyLimiterTest(unittest.TestCase):
+    def test_window_caps_in_flight(self):
+        limiter = AdaptiveConcurrencyLimiter(initial=2, max_limit=4)
+        self.assertTrue(limiter.try_acquire())
+        self.assertTrue(limiter.try_acquire())
+        self.assertFalse(limiter.try_acquire())
+        limiter.release(None)
+        self.assertTrue(limiter.try_acquire())
+
+    def test_additive_increase(self):
+        limiter = AdaptiveConcurrencyLimiter(initial=2, max_limit=3)
+        for _ in range(2):
+            limiter.acquire()
+            limiter.release(True)
+        self.assertEqual(limiter.limit, 2)  # 2 + 1/2 + 1/2.5 = 2.9
+        limiter.acquire()
+        limiter.release(True)
+        self.assertEqual(limiter.limit, 3)
+        for _ in range(10):
+            limiter.acquire()
+            limiter.release(True)
+        self.assertEqual(limiter.limit, 3)
+
+    def test_multiplicative_decrease_respects_cooldown_and_floor(self):
+        limiter = AdaptiveConcurrencyLimiter(initial=8, min_limit=2, max_limit=8, cooldown=60.0)
+        limiter.acquire()
+        limiter.release(False)
+        self.assertEqual(limiter.limit, 4)
+        limiter.acquire()
+        limiter.release(False)
+        self.assertEqual(limiter.limit, 4)
+
+        limiter = AdaptiveConcurrencyLimiter(initial=3, min_limit=2, max_limit=8, cooldown=0.0)
+        for _ in range(3):
+            limiter.acquire()
+            limiter.release(False)
+        self.assertEqual(limiter.limit, 2)
+
+    def test_blocked_thread_wakes_on_release(self):
+        limiter = AdaptiveConcurrencyLimiter(initial=1, max_limit=1)
+        limiter.acquire()
+        acquired = threading.Event()
+        waiter = threading.Thread(target=lambda: (limiter.acquire(), acquired.set()))
+        waiter.start()
+        self.assertFalse(acquired.wait(0.05))
+        limiter.release(None)
+        self.assertTrue(acquired.wait(5))
+        waiter.join(5)
+
+    def test_async_waiter_wakes_on_release_from_another_thread(self):
+        limiter = AdaptiveConcurrencyLimiter(initial=1, max_limit=1)
+        limiter.acquire()
+
+        async def main():
+            threading.Timer(0.05, limiter.release, args=(None,)).start()
+            started = time.monotonic()
+            await asyncio.wait_for(limiter.acquire_async(), timeout=5)
+            return time.monotonic() - started
+
+        waited = asyncio.run(main())
+        self.assertGreaterEqual(waited, 0.04)
+        self.assertEqual(limiter.stats(), {"limit": 1, "in_flight": 1})
+
+    def test_cancelled_async_waiter_takes_no_slot(self):
+        limiter = AdaptiveConcurrencyLimiter(initial=1, max_limit=1)
+        limiter.acquire()
+
+        async def main():
+            task = asyncio.ensure_future(limiter.acquire_async())
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(main())
+        limiter.release(None)
+        self.assertEqual(limiter.stats()["in_flight"], 0)
+
+
+class RequestGovernorTest(unittest.TestCase):
+    @staticmethod
+    def _classify(exc):
+        overloaded = isinstance(exc, ConnectionError)
+        return overloaded, overloaded, None
+
+    def test_retries_overload_and_shrinks_window(self):
+        governor = RequestGovernor(initial_concurrency=4, max_retries=3, base_delay=0.0, classify=self._classify)
+        attempts = []
+
+        def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise ConnectionError("429")
+            return "ok"
+
+        self.assertEqual(governor.call(flaky), "ok")
+        stats = governor.stats()
+        self.assertEqual((stats["attempts"], stats["retries"], stats["throttled"]), (3, 2, 2))
+        self.assertLess(stats["concurrency"]["limit"], 4)
+        self.assertEqual(stats["concurrency"]["in_flight"], 0)
+
+    def test_non_retryable_errors_fail_at_once(self):
+        governor = RequestGovernor(max_retries=3, classify=self._classify)
+        with self.assertRaises(ValueError):
+            governor.call(lambda: (_ for _ in ()).throw(ValueError("bad request")))
+        stats = governor.stats()
+        self.assertEqual((stats["attempts"], stats["retries"], stats["failures"]), (1, 0, 1))
+
+    def test_async_call_gives_up_after_max_retries(self):
+        governor = RequestGovernor(max_retries=2, base_delay=0.0, classify=self._classify)
+
+        async def always_overloaded():
+            raise ConnectionError("503")
+
+        with self.assertRaises(ConnectionError):
+            asyncio.run(governor.acall(always_overloaded))
+        stats = governor.stats()
+        self.assertEqual((stats["attempts"], stats["retries"], stats["failures"]), (3, 2, 1))
+        self.assertEqual(stats["concurrency"]["in_flight"], 0)
+
+    def test_governors_can_share_a_bucket(self):
+        primary = RequestGovernor(rate=5, burst=2)
+        secondary = RequestGovernor(rate=100, bucket=primary.bucket)
+        self.assertIs(secondary.bucket, primary.bucket)
+        self.assertEqual(secondary.stats()["rate"], 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
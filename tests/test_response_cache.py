@@ -0,0 +1,101 @@
+"""Tests for :class:`utils.response_cache.ResponseCache` TTLs and LRU eviction."""
+
+import math
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from utils import response_cache
+from utils.response_cache import ResponseCache
+
+# JSON-encodes to 102 bytes
+VALUE = "x" * 100
+
+
+class _Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+class ResponseCacheTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "cache.sqlite")
+        self.clock = _Clock()
+        patcher = mock.patch.object(response_cache, "time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _cache(self, **kwargs):
+        cache = ResponseCache(self.path, **kwargs)
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_entries_expire_after_their_namespace_ttl(self):
+        cache = self._cache(default_ttl=60, ttls={"search": 10, "crawl": math.inf})
+        cache.set("search", "q", {"results": [1]})
+        cache.set("extract", "u", "page")
+        cache.set("crawl", "site", "pages")
+
+        self.clock.now += 30
+        self.assertIsNone(cache.get("search", "q"))
+        self.assertEqual(cache.get("extract", "u"), "page")
+        self.clock.now += 60
+        self.assertEqual(cache.get_many("extract", ["u"]), [None])
+        self.assertEqual(cache.get("crawl", "site"), "pages")
+
+        stats = cache.stats()
+        self.assertEqual(stats["entries"], 1)
+        self.assertEqual(stats["hits"], {"search": 0, "extract": 1, "crawl": 1})
+        self.assertEqual(stats["misses"], {"search": 1, "extract": 1, "crawl": 0})
+
+    def test_non_positive_ttl_skips_the_write(self):
+        cache = self._cache(ttls={"search": 0})
+        cache.set("search", "q", "results")
+        self.assertIsNone(cache.get("search", "q"))
+        self.assertEqual(cache.stats()["entries"], 0)
+
+    def test_least_recently_used_entries_are_evicted_over_max_bytes(self):
+        cache = self._cache(max_bytes=350)
+        for key in ("a", "b", "c"):
+            cache.set("ns", key, VALUE)
+            self.clock.now += 1
+        # Reading "a" makes "b" the least recently used entry
+        self.assertEqual(cache.get("ns", "a"), VALUE)
+        self.clock.now += 1
+
+        cache.set("ns", "d", VALUE)
+        self.assertEqual(cache.get_many("ns", ["a", "b", "c", "d"]), [VALUE, None, VALUE, VALUE])
+        stats = cache.stats()
+        self.assertEqual(stats["evictions"], 1)
+        self.assertEqual(stats["bytes"], 3 * len(f'"{VALUE}"'))
+
+    def test_values_larger_than_the_cache_are_not_stored(self):
+        cache = self._cache(max_bytes=50)
+        cache.set("ns", "big", VALUE)
+        self.assertIsNone(cache.get("ns", "big"))
+
+    def test_usage_survives_reopening(self):
+        cache = self._cache()
+        cache.set_many("ns", {"a": VALUE, "b": VALUE})
+        cache.set("ns", "a", "short")
+        expected = cache.stats()["bytes"]
+        cache.close()
+
+        reopened = self._cache()
+        self.assertEqual(reopened.stats()["bytes"], expected)
+        self.assertEqual(reopened.get("ns", "a"), "short")
+
+    def test_raw_values_round_trip_as_bytes(self):
+        cache = self._cache()
+        cache.set_many("vectors", {"k": b"\x00\x01\x02"}, raw=True)
+        self.assertEqual(cache.get_many("vectors", ["k", "missing"], raw=True), [b"\x00\x01\x02", None])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+"""Tests for ``tavily_search_many`` merging and ``describe_missing_tools``."""
+
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import dspy
+
+from tools import _tavily_common, web_tools
+from tools.web_tools import describe_missing_tools, tavily_search_many
+from utils.agent_context import agent_scope
+from utils.source_logger import source_session
+
+
+def _hit(url, title=None):
+    return {"title": title or url, "url": url, "snippet": f"About {url}"}
+
+
+class TavilySearchManyTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        cwd = os.getcwd()
+        os.chdir(tmp.name)
+        self.addCleanup(os.chdir, cwd)
+
+        self.responses = {}
+        self.threads = set()
+        self.lock = threading.Lock()
+
+        def fetch(query, max_results):
+            with self.lock:
+                self.threads.add(threading.current_thread().name)
+            response = self.responses[query]
+            if isinstance(response, Exception):
+                raise response
+            return response[:max_results]
+
+        for patcher in (
+            mock.patch.object(web_tools, "_fetch_search", side_effect=fetch),
+            mock.patch.object(_tavily_common, "TAVILY_PREFETCH_TOP_K", 0),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        session = source_session("search-many-test")
+        self.source_logger = session.__enter__()
+        self.addCleanup(session.__exit__, None, None, None)
+
+    def test_results_interleave_by_rank_and_dedupe_urls(self):
+        self.responses = {
+            "acme pricing": [_hit("https://acme.example/pricing"), _hit("https://acme.example/")],
+            "acme reviews": [_hit("https://reviews.example/acme"), _hit("https://acme.example/pricing#plans")],
+            "acme careers": [_hit("acme.example")],
+        }
+        with agent_scope("vendor_agent"):
+            response = tavily_search_many(
+                ["acme pricing", "  ACME   Pricing ", "acme reviews", "", "acme careers"], max_results_per_query=5
+            )
+
+        self.assertEqual(response["errors"], {})
+        self.assertEqual(
+            [(item["url"], item["queries"]) for item in response["results"]],
+            [
+                ("https://acme.example/pricing", ["acme pricing", "acme reviews"]),
+                ("https://reviews.example/acme", ["acme reviews"]),
+                ("acme.example", ["acme careers", "acme pricing"]),
+            ],
+        )
+        self.assertTrue(all(name.startswith("tavily-search") for name in self.threads))
+        # Every query's hits are logged under the calling agent
+        manifest = self.source_logger.get_session_manifest()
+        self.assertEqual(manifest["agents"], {"vendor_agent": 5})
+        self.assertEqual(manifest["total_sources"], 5)
+
+    def test_failed_queries_are_reported_without_dropping_the_rest(self):
+        self.responses = {
+            "acme pricing": [_hit("https://acme.example/pricing")],
+            "acme outage": RuntimeError("Tavily search returned HTTP 502"),
+        }
+        response = tavily_search_many(["acme pricing", "acme outage"])
+        self.assertEqual([item["url"] for item in response["results"]], ["https://acme.example/pricing"])
+        self.assertEqual(response["errors"], {"acme outage": "Tavily search returned HTTP 502"})
+
+    def test_query_limit_and_empty_input(self):
+        self.assertEqual(tavily_search_many([" ", ""]), {"results": [], "errors": {}})
+        with mock.patch.object(_tavily_common, "TAVILY_SEARCH_MANY_MAX_QUERIES", 2):
+            with self.assertRaises(ValueError):
+                tavily_search_many(["a", "b", "c"])
+        self.assertEqual(self.threads, set())
+
+
+def search_web(query: str) -> str:
+    """Search the web."""
+    return query
+
+
+def finalize_vendor(name: str) -> str:
+    """Record a verified vendor."""
+    return name
+
+
+class DescribeMissingToolsTest(unittest.TestCase):
+    def _agent(self, saved_instructions):
+        agent = dspy.ReAct("question -> answer", tools=[search_web, finalize_vendor])
+        # A program saved before finalize_vendor existed restores instructions that omit it
+        agent.react.signature = agent.react.signature.with_instructions(saved_instructions)
+        return agent
+
+    def test_appends_only_tools_the_instructions_omit(self):
+        agent = self._agent("Answer the question. Tools: search_web, finish.")
+        describe_missing_tools(agent, ["search_web", "finalize_vendor", "not_a_tool"])
+        instructions = agent.react.signature.instructions
+        self.assertEqual(instructions.count("Also available:"), 1)
+        self.assertIn("Also available: finalize_vendor", instructions)
+        self.assertIn("Record a verified vendor", instructions)
+
+        # Idempotent: a second call finds the tool already described
+        describe_missing_tools(agent, ["finalize_vendor"])
+        self.assertEqual(agent.react.signature.instructions, instructions)
+
+    def test_non_react_modules_are_left_alone(self):
+        module = dspy.Predict("question -> answer")
+        describe_missing_tools(module, ["finalize_vendor"])
+        self.assertNotIn("finalize_vendor", module.signature.instructions)
+
+
+if __name__ == "__main__":
+    unittest.main()
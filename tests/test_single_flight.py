@@ -0,0 +1,154 @@
+"""Tests for :mod:`utils.single_flight`."""
+
+import asyncio
+import threading
+import time
+import unittest
+
+from utils.single_flight import AsyncSingleFlight, SingleFlight
+
+
+def _wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached in time")
+        time.sleep(0.001)
+
+
+class SingleFlightTest(unittest.TestCase):
+    def _run_concurrently(self, flight, fn, callers=4):
+        """Start one leader, then ``callers - 1`` followers while it is still running."""
+        outcomes = [None] * callers
+        errors = [None] * callers
+
+        def call(index):
+            try:
+                outcomes[index] = flight.do("key", fn)
+            except Exception as exc:
+                errors[index] = exc
+
+        leader = threading.Thread(target=call, args=(0,))
+        leader.start()
+        _wait_until(lambda: flight.in_flight("key"))
+        followers = [threading.Thread(target=call, args=(i,)) for i in range(1, callers)]
+        for thread in followers:
+            thread.start()
+        return leader, followers, outcomes, errors
+
+    def test_followers_share_the_leaders_result(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def fn():
+            calls.append(1)
+            release.wait(5)
+            return {"items": [1, 2]}
+
+        leader, followers, outcomes, errors = self._run_concurrently(flight, fn)
+        _wait_until(lambda: flight.stats()["coalesced"] == len(followers))
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join(5)
+
+        self.assertEqual(calls, [1])
+        self.assertEqual(errors, [None] * 4)
+        self.assertEqual(outcomes[0], ({"items": [1, 2]}, False))
+        for result, shared in outcomes[1:]:
+            self.assertTrue(shared)
+            self.assertEqual(result, {"items": [1, 2]})
+        self.assertEqual(flight.stats(), {"executed": 1, "coalesced": 3})
+
+    def test_followers_get_private_copies(self):
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def fn():
+            release.wait(5)
+            return {"items": []}
+
+        leader, followers, outcomes, _ = self._run_concurrently(flight, fn, callers=3)
+        _wait_until(lambda: flight.stats()["coalesced"] == len(followers))
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join(5)
+
+        outcomes[1][0]["items"].append("mutated")
+        self.assertEqual(outcomes[0][0], {"items": []})
+        self.assertEqual(outcomes[2][0], {"items": []})
+
+    def test_leader_exception_propagates_to_followers(self):
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def fn():
+            release.wait(5)
+            raise ValueError("upstream failed")
+
+        leader, followers, _, errors = self._run_concurrently(flight, fn)
+        _wait_until(lambda: flight.stats()["coalesced"] == len(followers))
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join(5)
+
+        self.assertTrue(all(isinstance(error, ValueError) for error in errors))
+        self.assertFalse(flight.in_flight("key"))
+
+    def test_join_waits_for_the_call_in_flight(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        joined = []
+
+        def fn():
+            release.wait(5)
+            return {"items": [1]}
+
+        self.assertEqual(flight.join("key"), (False, None))
+        leader, _, outcomes, _ = self._run_concurrently(flight, fn, callers=1)
+        joiner = threading.Thread(target=lambda: joined.append(flight.join("key")))
+        joiner.start()
+        _wait_until(lambda: flight.stats()["coalesced"] == 1)
+        release.set()
+        for thread in (leader, joiner):
+            thread.join(5)
+
+        self.assertEqual(joined, [(True, {"items": [1]})])
+        self.assertEqual(outcomes[0], ({"items": [1]}, False))
+        self.assertEqual(flight.stats(), {"executed": 1, "coalesced": 1})
+
+    def test_sequential_calls_run_again(self):
+        flight = SingleFlight()
+        self.assertEqual(flight.do("key", lambda: 1), (1, False))
+        self.assertEqual(flight.do("key", lambda: 2), (2, False))
+        self.assertEqual(flight.stats(), {"executed": 2, "coalesced": 0})
+
+
+class AsyncSingleFlightTest(unittest.TestCase):
+    def test_followers_share_result_and_exception(self):
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def succeed():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return [1]
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        async def main():
+            results = await asyncio.gather(*(flight.do("ok", succeed) for _ in range(3)))
+            failures = await asyncio.gather(*(flight.do("bad", fail) for _ in range(2)), return_exceptions=True)
+            return results, failures
+
+        results, failures = asyncio.run(main())
+        self.assertEqual(calls, [1])
+        self.assertEqual(sorted(shared for _, shared in results), [False, True, True])
+        self.assertTrue(all(result == [1] for result, _ in results))
+        self.assertTrue(all(isinstance(failure, ValueError) for failure in failures))
+
+
+if __name__ == "__main__":
+    unittest.main()
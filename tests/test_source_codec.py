@@ -0,0 +1,112 @@
+"""Tests for compressed source logs in :mod:`utils.source_codec`."""
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from utils import source_codec
+from utils.source_codec import get_codec, iter_jsonl, read_text
+from utils.source_logger import SourceLogger
+
+
+def _frame(codec, records):
+    return codec.compress("".join(json.dumps(record) + "\n" for record in records).encode("utf-8"))
+
+
+class IterJsonlTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+
+    def _codec(self, name):
+        if name == "zstd" and source_codec._zstd_codec(3) is None:
+            self.skipTest("no zstd implementation installed")
+        return get_codec(name)
+
+    def _write(self, codec, *frames):
+        path = self.dir / f"log.jsonl{codec.suffix}"
+        with open(path, "ab") as handle:
+            for frame in frames:
+                handle.write(frame)
+        return path
+
+    def test_appended_frames_round_trip(self):
+        for name in ("none", "gzip", "zstd"):
+            with self.subTest(codec=name):
+                codec = self._codec(name)
+                first = [{"url": f"https://a.example/{i}", "title": "ünïcode"} for i in range(3)]
+                second = [{"url": "https://b.example", "content": "x" * 10_000}]
+                path = self._write(codec, _frame(codec, first), _frame(codec, second))
+                self.assertEqual(list(iter_jsonl(path)), first + second)
+                self.assertEqual(read_text(path).count("\n"), 4)
+                path.unlink()
+
+    def test_truncated_final_frame_keeps_earlier_records(self):
+        for name in ("gzip", "zstd"):
+            with self.subTest(codec=name):
+                codec = self._codec(name)
+                complete = [{"url": f"https://a.example/{i}"} for i in range(3)]
+                partial = _frame(codec, [{"url": f"https://b.example/{i}", "content": "y" * 500} for i in range(20)])
+                path = self._write(codec, _frame(codec, complete), partial[: len(partial) // 2])
+                with self.assertLogs(source_codec.logger, "WARNING"):
+                    records = list(iter_jsonl(path))
+                self.assertEqual(records[:3], complete)
+                self.assertTrue(all(record["url"].startswith("https://b.example/") for record in records[3:]))
+                path.unlink()
+
+    def test_plain_file_skips_a_torn_last_line(self):
+        path = self.dir / "log.jsonl"
+        path.write_text('{"url": "https://a.example"}\n\n{"url": "https://b.ex', encoding="utf-8")
+        with self.assertLogs(source_codec.logger, "WARNING"):
+            self.assertEqual(list(iter_jsonl(path)), [{"url": "https://a.example"}])
+        path.write_bytes(b"")
+        self.assertEqual(list(iter_jsonl(path)), [])
+
+
+class GetCodecTest(unittest.TestCase):
+    def test_names_and_fallbacks(self):
+        self.assertEqual(get_codec(None).name, "none")
+        self.assertEqual(get_codec("GZ").suffix, ".gz")
+        with mock.patch.object(source_codec, "_zstd_codec", return_value=None):
+            with self.assertLogs(source_codec.logger, "WARNING"):
+                self.assertEqual(get_codec("zstd").name, "gzip")
+        with self.assertRaises(ValueError):
+            get_codec("brotli")
+
+    def test_gzip_frames_are_deterministic(self):
+        codec = get_codec("gzip")
+        self.assertEqual(codec.compress(b"same bytes"), codec.compress(b"same bytes"))
+
+
+class CompressedSourceLoggerTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        cwd = os.getcwd()
+        os.chdir(tmp.name)
+        self.addCleanup(os.chdir, cwd)
+
+    def test_gzip_session_logs_and_blobs_read_back(self):
+        source_logger = SourceLogger("gzip-test", batch_size=1, compression="gzip", blob_min_chars=100)
+        self.addCleanup(source_logger.index.close)
+        self.addCleanup(source_logger.close)
+        page = "Acme widget pricing. " * 40
+        for i in range(3):
+            source_logger.log_tavily_results(
+                [{"url": f"https://acme.example/{i}", "content": page}], "acme", "tavily_extract", "vendor_agent"
+            )
+        source_logger.close()
+
+        log_file = source_logger.base_dir / "vendor_agent_tavily_extract.jsonl.gz"
+        self.assertEqual([record["url"] for record in iter_jsonl(log_file)],
+                         [f"https://acme.example/{i}" for i in range(3)])
+        self.assertEqual(len(list(source_logger.base_dir.glob("blobs/*/*.txt.gz"))), 1)
+        self.assertEqual([record["content"] for record in source_logger.find_sources()], [page] * 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
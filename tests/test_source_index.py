@@ -0,0 +1,135 @@
+"""Tests for :class:`utils.source_index.SourceIndex` filters, FTS search and ``counts_by``."""
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from utils.source_index import SourceIndex
+from utils.source_logger import SourceLogger
+
+
+def _row(agent, tool, url, query, body, content_hash=None):
+    record = json.dumps({"agent": agent, "tool": tool, "url": url, "query": query})
+    return (f"{agent}_{tool}", record, agent, tool, url, query, url, "2026-01-01T00:00:00",
+            content_hash or f"hash-{body}", body)
+
+
+ROWS = [
+    _row("vendor_agent", "tavily_search", "https://a.example", "acme pricing", "Acme widget pricing per seat"),
+    _row("pestle_agent", "tavily_search", "https://b.example", "tariffs", "Import tariffs on steel widget parts rose"),
+    _row("pestle_agent", "tavily_extract", "https://a.example", "acme pricing", "Acme widget pricing per seat"),
+    _row("swot_agent", "tavily_search", "https://c.example", "acme culture", "Engineers praise the culture"),
+]
+
+
+class SourceIndexTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / "sources.sqlite3"
+
+    def _index(self, session_id="index-test"):
+        index = SourceIndex(self.path, session_id)
+        self.addCleanup(index.close)
+        return index
+
+    def test_add_returns_row_ids_and_filters_match_exactly(self):
+        index = self._index()
+        ids = index.add(ROWS)
+        self.assertEqual(len(ids), 4)
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(index.add([]), [])
+
+        pestle = [json.loads(line)["tool"] for line in index.records(agent="pestle_agent")]
+        self.assertEqual(pestle, ["tavily_search", "tavily_extract"])
+        self.assertEqual(len(index.records(url="https://a.example", query="acme pricing")), 2)
+        self.assertEqual(index.records(agent="rfp_agent"), [])
+        paged = [row_id for row_id, _ in index.iter_records(page_size=1)]
+        self.assertEqual(paged, ids)
+
+    def test_counts_by_groups_within_the_session(self):
+        index = self._index()
+        index.add(ROWS)
+        other = self._index("other-session")
+        other.add(ROWS[:1])
+
+        self.assertEqual(index.counts_by("agent"), {"vendor_agent": 1, "pestle_agent": 2, "swot_agent": 1})
+        self.assertEqual(index.counts_by("tool"), {"tavily_search": 3, "tavily_extract": 1})
+        self.assertEqual(index.count(), 4)
+        self.assertEqual(other.count(), 1)
+        self.assertEqual(sorted(index.distinct_urls()), ["https://a.example", "https://b.example", "https://c.example"])
+        with self.assertRaises(ValueError):
+            index.counts_by("record; DROP TABLE sources")
+
+    def test_full_text_search_ranks_by_bm25(self):
+        index = self._index()
+        if not index.fts_enabled:
+            self.skipTest("SQLite build lacks FTS5")
+        index.add(ROWS)
+
+        urls = [json.loads(line)["url"] for line in index.search("widget pricing")]
+        # Both copies of the shared body match, ahead of the page that only mentions the widget
+        self.assertEqual(urls, ["https://a.example", "https://a.example", "https://b.example"])
+        self.assertEqual(len(index.search("widget pricing", limit=1)), 1)
+        by_agent = [json.loads(line)["agent"] for line in index.search("pricing", agent="pestle_agent")]
+        self.assertEqual(by_agent, ["pestle_agent"])
+        self.assertEqual(index.search("the of and"), [])
+        # Query syntax is quoted, not interpreted
+        self.assertEqual(index.search('culture" OR "tariffs'), index.search("culture tariffs"))
+
+
+class SourceLoggerSearchTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        cwd = os.getcwd()
+        os.chdir(tmp.name)
+        self.addCleanup(os.chdir, cwd)
+
+    def _logger(self):
+        source_logger = SourceLogger("search-test")
+        self.addCleanup(source_logger.index.close)
+        self.addCleanup(source_logger.close)
+        source_logger.log_tavily_results(
+            [
+                {"url": "https://a.example", "title": "Pricing", "content": "Acme widget pricing per seat"},
+                {"url": "https://b.example", "title": "Tariffs", "content": "Import tariffs on steel"},
+            ],
+            "acme",
+            "tavily_search",
+            "vendor_agent",
+        )
+        return source_logger
+
+    def test_search_sources_resolves_records(self):
+        results = self._logger().search_sources("pricing")
+        self.assertEqual(
+            [(r["url"], r["content"]) for r in results], [("https://a.example", "Acme widget pricing per seat")]
+        )
+
+    def test_search_falls_back_to_a_term_scan_without_fts(self):
+        source_logger = self._logger()
+        with mock.patch.object(source_logger.index, "fts_enabled", False):
+            results = source_logger.search_sources("steel tariffs pricing")
+        self.assertEqual([r["url"] for r in results], ["https://b.example", "https://a.example"])
+
+    def test_records_are_backfilled_from_logs_written_before_the_index(self):
+        source_logger = self._logger()
+        source_logger.close()
+        source_logger.index.close()
+        (source_logger.base_dir / "sources.sqlite3").unlink()
+        for leftover in source_logger.base_dir.glob("sources.sqlite3-*"):
+            leftover.unlink()
+
+        reopened = SourceLogger("search-test")
+        self.addCleanup(reopened.index.close)
+        self.addCleanup(reopened.close)
+        self.assertEqual(reopened.index.count(), 2)
+        self.assertEqual(reopened.get_session_manifest()["agents"], {"vendor_agent": 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+"""Tests for the background writer and manifest of :class:`utils.source_logger.SourceLogger`."""
+
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from utils.source_codec import iter_jsonl
+from utils.source_logger import SourceLogger
+
+
+def _result(i, content=None):
+    return {"url": f"https://acme.example/{i}", "title": f"Page {i}", "content": content or f"snippet {i}"}
+
+
+class SourceLoggerTestCase(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        cwd = os.getcwd()
+        os.chdir(tmp.name)
+        self.addCleanup(os.chdir, cwd)
+
+    def _logger(self, session_id="logger-test", **kwargs):
+        source_logger = SourceLogger(session_id, **kwargs)
+        self.addCleanup(source_logger.index.close)
+        self.addCleanup(source_logger.close)
+        return source_logger
+
+    @staticmethod
+    def _writer_threads(source_logger):
+        return [t for t in threading.enumerate() if t.name == f"source-logger-{source_logger.session_id}"]
+
+
+class SourceLoggerWriterTest(SourceLoggerTestCase):
+    def test_records_stay_queued_until_flush(self):
+        # Neither the batch size nor the interval is reached on its own
+        source_logger = self._logger(batch_size=1000, flush_interval=60)
+        source_logger.log_tavily_results([_result(1), _result(2)], "acme", "tavily_search", "vendor_agent")
+        log_file = source_logger.base_dir / "vendor_agent_tavily_search.jsonl"
+        self.assertFalse(log_file.exists())
+
+        self.assertTrue(source_logger.flush(timeout=5))
+        self.assertEqual([record["url"] for record in iter_jsonl(log_file)],
+                         ["https://acme.example/1", "https://acme.example/2"])
+
+    def test_records_from_many_threads_go_through_one_writer(self):
+        source_logger = self._logger(batch_size=7, flush_interval=60)
+
+        def log(agent):
+            for i in range(20):
+                source_logger.log_tavily_results([_result(i)], f"query {i}", "tavily_search", agent)
+
+        threads = [threading.Thread(target=log, args=(f"agent{n}",)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        source_logger.flush(timeout=5)
+
+        self.assertEqual(len(self._writer_threads(source_logger)), 1)
+        for n in range(4):
+            records = source_logger.find_sources(agent_name=f"agent{n}")
+            self.assertEqual([record["query"] for record in records], [f"query {i}" for i in range(20)])
+
+    def test_close_drains_the_queue_and_stops_the_writer(self):
+        source_logger = self._logger(batch_size=1000, flush_interval=60)
+        source_logger.log_tavily_results([_result(1)], "acme", "tavily_search", "vendor_agent")
+        source_logger.flush(timeout=5)
+        handles = list(source_logger.file_handles.values())
+        source_logger.log_tavily_results([_result(2)], "acme", "tavily_search", "vendor_agent")
+        source_logger.close()
+
+        self.assertEqual(self._writer_threads(source_logger), [])
+        self.assertEqual(len(handles), 1)
+        self.assertTrue(handles[0].closed)
+        self.assertEqual(source_logger.file_handles, {})
+        self.assertEqual(len(source_logger.find_sources()), 2)
+        self.assertTrue(source_logger.flush(timeout=0))
+
+        # Logging after close starts a fresh writer and appends to the same file
+        source_logger.log_tavily_results([_result(3)], "acme", "tavily_search", "vendor_agent")
+        source_logger.close()
+        log_file = source_logger.base_dir / "vendor_agent_tavily_search.jsonl"
+        self.assertEqual(len(list(iter_jsonl(log_file))), 3)
+
+    def test_listeners_receive_indexed_records(self):
+        source_logger = self._logger()
+        batches = []
+        source_logger.add_listener(batches.append)
+        source_logger.log_tavily_results([_result(1)], "acme", "tavily_search", "pestle_agent")
+        source_logger.flush(timeout=5)
+        source_logger.remove_listener(batches.append)
+        source_logger.log_tavily_results([_result(2)], "acme", "tavily_search", "pestle_agent")
+        source_logger.flush(timeout=5)
+
+        self.assertEqual(len(batches), 1)
+        (record,) = batches[0]
+        self.assertEqual((record["url"], record["content"]), ("https://acme.example/1", "snippet 1"))
+        self.assertIsInstance(record["source_id"], int)
+
+
+
+class SourceManifestTest(SourceLoggerTestCase):
+    def _log_run(self, source_logger):
+        source_logger.log_tavily_results([_result(1), _result(2)], "acme", "tavily_search", "vendor_agent")
+        source_logger.log_tavily_results([_result(2)], "acme", "tavily_extract", "vendor_agent")
+        source_logger.log_tavily_results([_result(3)], "tariffs", "tavily_search", "pestle_agent")
+
+    def test_counters_track_files_agents_tools_and_unique_urls(self):
+        source_logger = self._logger()
+        self._log_run(source_logger)
+        manifest = source_logger.get_session_manifest()
+
+        self.assertEqual(
+            manifest["files"],
+            {
+                "pestle_agent_tavily_search.jsonl": 1,
+                "vendor_agent_tavily_extract.jsonl": 1,
+                "vendor_agent_tavily_search.jsonl": 2,
+            },
+        )
+        self.assertEqual(manifest["agents"], {"pestle_agent": 1, "vendor_agent": 3})
+        self.assertEqual(manifest["tools"], {"tavily_extract": 1, "tavily_search": 3})
+        self.assertEqual((manifest["total_sources"], manifest["unique_urls"]), (4, 3))
+        self.assertIsNotNone(manifest["updated_at"])
+
+    def test_manifest_file_is_persisted_as_batches_land(self):
+        source_logger = self._logger(batch_size=1000, flush_interval=60)
+        self._log_run(source_logger)
+        # Polling without a flush does not wait for the queued records
+        self.assertEqual(source_logger.get_session_manifest(flush=False)["total_sources"], 0)
+        self.assertFalse(source_logger.manifest_path.exists())
+
+        source_logger.flush(timeout=5)
+        on_disk = json.loads(source_logger.manifest_path.read_text(encoding="utf-8"))
+        self.assertEqual(on_disk["session_id"], "logger-test")
+        self.assertEqual(on_disk["total_sources"], 4)
+        self.assertEqual(on_disk["agents"], source_logger.get_session_manifest(flush=False)["agents"])
+
+    def test_reopened_session_resumes_its_counters(self):
+        source_logger = self._logger()
+        self._log_run(source_logger)
+        source_logger.close()
+
+        reopened = self._logger()
+        reopened.log_tavily_results([_result(4)], "acme", "tavily_search", "swot_agent")
+        manifest = reopened.get_session_manifest()
+        self.assertEqual(manifest["total_sources"], 5)
+        self.assertEqual(manifest["unique_urls"], 4)
+        self.assertEqual(manifest["agents"], {"pestle_agent": 1, "swot_agent": 1, "vendor_agent": 3})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+"""Tests for :func:`utils.source_logger.prune_source_sessions`."""
+
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from utils import source_logger
+from utils.source_logger import prune_source_sessions
+
+DAY = 86400
+
+
+class PruneSourceSessionsTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name) / "sources"
+        self.index_root = Path(tmp.name) / "vector_index"
+        self.root.mkdir()
+        self.index_root.mkdir()
+
+    def _session(self, session_id, age_days):
+        session_dir = self.root / session_id
+        session_dir.mkdir()
+        (session_dir / "manifest.json").write_text("{}")
+        (self.index_root / f"session_{session_id}").mkdir()
+        stamp = time.time() - age_days * DAY
+        for path in (session_dir / "manifest.json", session_dir):
+            os.utime(path, (stamp, stamp))
+
+    def _prune(self, **kwargs):
+        return sorted(prune_source_sessions(root=self.root, index_root=self.index_root, **kwargs))
+
+    def _remaining(self):
+        return sorted(path.name for path in self.root.iterdir())
+
+    def _remaining_indexes(self):
+        return sorted(path.name for path in self.index_root.iterdir())
+
+    def test_disabled_by_default_values(self):
+        self._session("old", 30)
+        self.assertEqual(self._prune(max_age_days=0, keep_last=0), [])
+        self.assertEqual(self._remaining(), ["old"])
+        self.assertEqual(self._remaining_indexes(), ["session_old"])
+
+    def test_age_cutoff(self):
+        self._session("old", 10)
+        self._session("recent", 1)
+        self.assertEqual(self._prune(max_age_days=7, keep_last=0), ["old"])
+        self.assertEqual(self._remaining(), ["recent"])
+        self.assertEqual(self._remaining_indexes(), ["session_recent"])
+
+    def test_keep_last_keeps_newest(self):
+        for index, session_id in enumerate(["a", "b", "c", "d"]):
+            self._session(session_id, 4 - index)
+        self.assertEqual(self._prune(max_age_days=0, keep_last=2), ["a", "b"])
+        self.assertEqual(self._remaining(), ["c", "d"])
+
+    def test_active_sessions_are_kept_and_count_towards_keep_last(self):
+        for index, session_id in enumerate(["a", "b", "c"]):
+            self._session(session_id, 3 - index)
+        with mock.patch.dict(source_logger._session_loggers, {"a": mock.Mock()}):
+            removed = self._prune(max_age_days=0, keep_last=2)
+        self.assertEqual(removed, ["b"])
+        self.assertEqual(self._remaining(), ["a", "c"])
+
+    def test_orphaned_indexes_are_removed_even_when_retention_is_off(self):
+        self._session("live", 1)
+        (self.index_root / "session_gone").mkdir()
+        (self.index_root / "shared.sqlite").write_text("")
+        self.assertEqual(self._prune(max_age_days=0, keep_last=0), [])
+        self.assertEqual(self._remaining_indexes(), ["session_live", "shared.sqlite"])
+
+
+if __name__ == "__main__":
+    unittest.main()
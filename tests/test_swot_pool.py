@@ -0,0 +1,96 @@
+"""Tests for :class:`agents.swot_agent.SwotWorkerPool` with the SWOT agent stubbed out."""
+
+import threading
+import unittest
+from unittest import mock
+
+from agents import swot_agent
+from agents.swot_agent import SwotWorkerPool
+from utils.agent_context import get_current_agent
+
+
+def _vendor(name, website=None):
+    return {"name": name, "website": website or f"https://{name.lower()}.example"}
+
+
+class SwotWorkerPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.gates = {}
+        self.started = []
+        self.agents = []
+        self.lock = threading.Lock()
+
+        def analyze(vendor, category, region, focus_areas, agent):
+            with self.lock:
+                self.started.append((vendor["name"], get_current_agent()))
+                gate = self.gates.get(vendor["name"])
+            if gate is not None:
+                gate.wait(5)
+            return f"swot:{vendor['name']}"
+
+        def create_agent(use_tools=True, max_iters=30):
+            agent = object()
+            self.agents.append(agent)
+            return agent
+
+        for patcher in (
+            mock.patch.object(swot_agent, "analyze_vendor_swot", side_effect=analyze),
+            mock.patch.object(swot_agent, "create_swot_agent", side_effect=create_agent),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _pool(self, limit, max_workers=2, on_done=None):
+        pool = SwotWorkerPool("widgets", None, limit=limit, max_workers=max_workers, on_done=on_done)
+        self.addCleanup(pool.close)
+        return pool
+
+    def test_submit_dedups_by_vendor_key_and_caps_at_limit(self):
+        done = []
+        pool = self._pool(limit=2, on_done=lambda vendor: done.append(vendor["name"]))
+        self.assertTrue(pool.submit(_vendor("Acme", "https://www.acme.example/about")))
+        self.assertFalse(pool.submit(_vendor("ACME Corp", "acme.example")))
+        self.assertTrue(pool.submit(_vendor("Globex")))
+        self.assertFalse(pool.submit(_vendor("Initech")))
+        self.assertEqual(pool.submitted, 2)
+
+        self.assertEqual(pool.results(), ["swot:Acme", "swot:Globex"])
+        self.assertEqual(sorted(done), ["Acme", "Globex"])
+        # Each task runs as the SWOT agent, and agents are reused rather than created per vendor
+        self.assertEqual({agent for _, agent in self.started}, {"swot_agent"})
+        self.assertLessEqual(len(self.agents), 2)
+
+    def test_reconcile_follows_the_final_ranking(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        self.gates["Streamed"] = release
+        pool = self._pool(limit=2, max_workers=1)
+
+        # "Streamed" occupies the only worker, so "Dropped" stays queued
+        pool.submit(_vendor("Streamed"))
+        pool.submit(_vendor("Dropped"))
+        final = [_vendor("Ranked first"), _vendor("Streamed"), _vendor("Dropped")]
+        self.assertEqual(pool.reconcile(final), 1)
+        self.assertEqual(pool.submitted, 2)
+        self.assertFalse(pool.submit(_vendor("Late")))
+
+        release.set()
+        self.assertEqual(pool.results(), ["swot:Ranked first", "swot:Streamed"])
+        self.assertNotIn("Dropped", [name for name, _ in self.started])
+
+    def test_close_drops_queued_analyses(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        self.gates["First"] = release
+        pool = self._pool(limit=3, max_workers=1)
+        for name in ("First", "Second", "Third"):
+            pool.submit(_vendor(name))
+
+        pool.close()
+        release.set()
+        self.assertEqual(pool.results(), ["swot:First"])
+        self.assertEqual([name for name, _ in self.started], ["First"])
+
+
+if __name__ == "__main__":
+    unittest.main()
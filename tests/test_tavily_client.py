@@ -0,0 +1,135 @@
+"""Tests for :mod:`tools.tavily_client` retry classification on ``httpx.MockTransport``."""
+
+import asyncio
+import json
+import unittest
+
+import httpx
+
+from tools.tavily_client import (
+    AsyncTavilyHTTPClient,
+    TavilyAPIError,
+    TavilyHTTPClient,
+    classify_tavily_error,
+)
+from utils.rate_limiter import RequestGovernor
+
+SEARCH_OK = {"results": [{"title": "Acme", "url": "https://acme.example", "content": "widgets"}]}
+
+
+def _governor(max_retries=2):
+    # No backoff sleeps: a zero cap also bounds Retry-After
+    return RequestGovernor(max_retries=max_retries, base_delay=0.0, max_delay=0.0, classify=classify_tavily_error)
+
+
+class _Script:
+    """Transport handler that replays one scripted outcome per request."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.requests = []
+
+    def __call__(self, request):
+        self.requests.append(request)
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        status, body, headers = outcome
+        return httpx.Response(status, json=body, headers=headers)
+
+
+class ClassifyTavilyErrorTest(unittest.TestCase):
+    def test_classification(self):
+        request = httpx.Request("POST", "https://api.tavily.com/search")
+        cases = [
+            (TavilyAPIError("throttled", status_code=429, retry_after=3.0), (True, True, 3.0)),
+            (TavilyAPIError("bad gateway", status_code=502), (True, True, None)),
+            (TavilyAPIError("bad request", status_code=400), (False, False, None)),
+            (TavilyAPIError("unauthorized", status_code=401), (False, False, None)),
+            (httpx.ReadTimeout("slow", request=request), (False, True, None)),
+            (httpx.PoolTimeout("pool", request=request), (True, True, None)),
+            (httpx.ConnectError("refused", request=request), (True, False, None)),
+            (ValueError("bug"), (False, False, None)),
+        ]
+        for exc, expected in cases:
+            with self.subTest(exc=type(exc).__name__, status=getattr(exc, "status_code", None)):
+                self.assertEqual(classify_tavily_error(exc), expected)
+
+
+class TavilyHTTPClientTest(unittest.TestCase):
+    def _client(self, handler, governor):
+        client = TavilyHTTPClient(api_key="test-key", transport=httpx.MockTransport(handler), governor=governor)
+        self.addCleanup(client.close)
+        return client
+
+    def test_throttling_and_server_errors_are_retried(self):
+        script = _Script(
+            (503, {"detail": "unavailable"}, {}),
+            (429, {"detail": {"error": "slow down"}}, {"retry-after": "1"}),
+            (200, SEARCH_OK, {}),
+        )
+        governor = _governor()
+        client = self._client(script, governor)
+
+        self.assertEqual(client.search("acme widgets", max_results=5), SEARCH_OK)
+        self.assertEqual(len(script.requests), 3)
+        sent = script.requests[-1]
+        self.assertEqual(sent.url.path, "/search")
+        self.assertEqual(sent.headers["authorization"], "Bearer test-key")
+        self.assertEqual(
+            json.loads(sent.content), {"query": "acme widgets", "max_results": 5, "include_answer": False}
+        )
+
+        stats = governor.stats()
+        self.assertEqual((stats["attempts"], stats["retries"], stats["throttled"]), (3, 2, 2))
+        self.assertEqual(client.stats()["errors"], 2)
+
+    def test_client_errors_are_not_retried(self):
+        script = _Script((400, {"detail": {"error": "Query is too long"}}, {}))
+        client = self._client(script, _governor())
+        with self.assertRaises(TavilyAPIError) as caught:
+            client.search("x" * 500)
+        self.assertEqual(caught.exception.status_code, 400)
+        self.assertIn("Query is too long", str(caught.exception))
+        self.assertEqual(len(script.requests), 1)
+
+    def test_read_timeouts_count_as_overload_but_are_not_retried(self):
+        request = httpx.Request("POST", "https://api.tavily.com/extract")
+        script = _Script(httpx.ReadTimeout("timed out", request=request))
+        governor = _governor()
+        client = self._client(script, governor)
+        with self.assertRaises(httpx.ReadTimeout):
+            client.extract(["https://acme.example"])
+        self.assertEqual(len(script.requests), 1)
+        self.assertEqual((governor.stats()["throttled"], governor.stats()["failures"]), (1, 1))
+
+    def test_connection_errors_retry_until_the_budget_runs_out(self):
+        request = httpx.Request("POST", "https://api.tavily.com/search")
+        script = _Script(*[httpx.ConnectError("refused", request=request)] * 3)
+        governor = _governor(max_retries=2)
+        client = self._client(script, governor)
+        with self.assertRaises(httpx.ConnectError):
+            client.search("acme")
+        self.assertEqual(len(script.requests), 3)
+        stats = governor.stats()
+        self.assertEqual((stats["retries"], stats["throttled"], stats["failures"]), (2, 0, 1))
+
+
+class AsyncTavilyHTTPClientTest(unittest.TestCase):
+    def test_async_client_retries_through_the_governor(self):
+        script = _Script((502, {"detail": "bad gateway"}, {}), (200, {"results": [], "failed_results": []}, {}))
+
+        async def _extract():
+            client = AsyncTavilyHTTPClient(api_key="test-key", transport=httpx.MockTransport(script),
+                                           governor=_governor())
+            try:
+                return await client.extract(["https://acme.example"])
+            finally:
+                await client.aclose()
+
+        self.assertEqual(asyncio.run(_extract()), {"results": [], "failed_results": []})
+        self.assertEqual([request.url.path for request in script.requests], ["/extract", "/extract"])
+
+
+if __name__ == "__main__":
+    unittest.main()
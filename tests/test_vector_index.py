@@ -0,0 +1,104 @@
+"""Tests for persistence and search in :class:`utils.vector_index.LocalVectorIndex`."""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from tests.test_citation_matcher import HashEmbedding
+from utils.vector_index import LocalVectorClient, LocalVectorIndex
+
+DOCS = {
+    "solar": "Solar panel tariffs rose sharply across the region",
+    "wind": "Wind turbine orders doubled as offshore leasing expanded",
+    "grid": "Grid operators delayed interconnection of new solar farms",
+}
+
+
+class LocalVectorIndexTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / "index"
+        self.embedder = HashEmbedding()
+
+    def _index(self, **kwargs):
+        index = LocalVectorIndex(self.path, self.embedder, **kwargs)
+        self.addCleanup(index.close)
+        return index
+
+    def _fill(self, index):
+        ids = list(DOCS)
+        return index.upsert([DOCS[i] for i in ids], [{"topic": i} for i in ids], ids)
+
+    def test_query_returns_nearest_documents_in_chroma_shape(self):
+        index = self._index()
+        self.assertEqual(self._fill(index), 3)
+        result = index.query(["offshore wind turbine orders", "solar panel tariffs"], n_results=2)
+
+        self.assertEqual(set(result), {"ids", "documents", "metadatas", "distances"})
+        self.assertEqual([ids[0] for ids in result["ids"]], ["wind", "solar"])
+        self.assertEqual(result["metadatas"][0][0], {"topic": "wind"})
+        self.assertEqual(result["documents"][1][0], DOCS["solar"])
+        for distances in result["distances"]:
+            self.assertEqual(len(distances), 2)
+            self.assertEqual(distances, sorted(distances))
+
+    def test_reopened_index_is_searchable_without_re_embedding(self):
+        self._fill(self._index())
+        calls = len(self.embedder.calls)
+
+        reopened = self._index()
+        self.assertEqual(reopened.count(), 3)
+        self.assertEqual(self._fill(reopened), 0)
+        self.assertEqual(len(self.embedder.calls), calls)
+        self.assertEqual(reopened.query(["wind turbine"], n_results=1)["ids"], [["wind"]])
+        self.assertEqual((self.path / "vectors.f32").stat().st_size, 3 * 64 * 4)
+
+    def test_changed_documents_are_re_embedded_in_place(self):
+        index = self._index()
+        self._fill(index)
+        self.assertEqual(index.upsert(["Hydrogen electrolyser capacity tripled"], [{}], ["grid"]), 1)
+        self.assertEqual(self.embedder.calls[-1], ["Hydrogen electrolyser capacity tripled"])
+        self.assertEqual(index.count(), 3)
+        self.assertEqual((self.path / "vectors.f32").stat().st_size, 3 * 64 * 4)
+        self.assertEqual(index.query(["hydrogen electrolyser"], n_results=1)["ids"], [["grid"]])
+
+    def test_empty_index_and_dimension_mismatch(self):
+        index = self._index()
+        self.assertEqual(index.query(["anything"], n_results=3)["ids"], [[]])
+        self._fill(index)
+        other = LocalVectorIndex(self.path, lambda texts: np.ones((len(texts), 8), dtype=np.float32))
+        self.addCleanup(other.close)
+        with self.assertRaises(ValueError):
+            other.upsert(["eight dimensions"], [{}], ["new"])
+
+    def test_hybrid_weight_blends_in_lexical_matches(self):
+        # A constant embedding makes every cosine score equal, so only BM25 can rank
+        def flat(texts):
+            return np.ones((len(texts), 4), dtype=np.float32)
+
+        index = LocalVectorIndex(self.path, flat, hybrid_weight=0.5)
+        self.addCleanup(index.close)
+        self._fill(index)
+        result = index.query(["interconnection delays"], n_results=3)
+        self.assertEqual(result["ids"][0][0], "grid")
+        self.assertAlmostEqual(result["distances"][0][0], 0.0, places=5)
+        self.assertAlmostEqual(result["distances"][0][1], 0.5, places=5)
+
+
+class LocalVectorClientTest(unittest.TestCase):
+    def test_collections_are_shared_and_deleted_from_disk(self):
+        with tempfile.TemporaryDirectory() as root:
+            client = LocalVectorClient(Path(root))
+            embedder = HashEmbedding()
+            collection = client.get_or_create_collection("session", embedder)
+            self.assertIs(client.create_collection("session", embedder), collection)
+            collection.add(["some text"], [{}], ["doc"])
+            client.delete_collection("session")
+            self.assertFalse((Path(root) / "session").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
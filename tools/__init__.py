@@ -1,5 +1,5 @@
 # Tools module for web search and page fetching
 
-from .web_tools import search_web, create_dspy_tools
+from .web_tools import search_web, tavily_search_many, create_dspy_tools
 
-__all__ = ["search_web", "create_dspy_tools"]
\ No newline at end of file
+__all__ = ["search_web", "tavily_search_many", "create_dspy_tools"]
\ No newline at end of file
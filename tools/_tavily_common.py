@@ -0,0 +1,882 @@
+"""Request plumbing shared by the blocking and asyncio Tavily tool wrappers.
+
+Internal to :mod:`tools`: :mod:`tools.web_tools` and
+:mod:`tools.async_web_tools` both build on these helpers, which hold the
+response cache, request coalescing, speculative extract prefetch, the scoped
+extract budget, session extract reuse and source logging. The public entry
+points are re-exported from :mod:`tools.web_tools`.
+"""
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Iterable, Tuple, List, Dict, Any, Optional, Callable
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import httpx
+from config.environment import (
+    PAGE_FETCH_FALLBACK_ENABLED,
+    TAVILY_EXTRACT_TIMEOUT,
+    TAVILY_MAX_EXTRACT_CALLS,
+    TAVILY_PREFETCH_TOP_K,
+    TAVILY_PREFETCH_WORKERS,
+    TAVILY_SEARCH_MANY_MAX_QUERIES,
+    get_extract_passage_settings,
+    get_tavily_cache_settings,
+)
+from tools.page_fetcher import get_page_fetcher
+from tools.tavily_client import get_tavily_client
+from utils.response_cache import ResponseCache
+from utils.single_flight import SingleFlight
+from utils.agent_context import get_current_agent
+from utils.passage_ranker import rank_passages
+from utils.source_logger import get_source_logger
+
+
+logger = logging.getLogger(__name__)
+
+# Optional UI log hook to surface tool activity to a CLI progress view
+TOOL_UI_LOG: Optional[Callable[[str], None]] = None
+
+_extract_call_count_var: ContextVar[int] = ContextVar(
+    "tavily_extract_call_count",
+    default=0,
+)
+_extract_limit_var: ContextVar[int] = ContextVar(
+    "tavily_extract_limit",
+    default=TAVILY_MAX_EXTRACT_CALLS,
+)
+# Most recent search query in this context; ranks extract passages when no query is given
+last_search_query_var: ContextVar[str] = ContextVar(
+    "tavily_last_search_query",
+    default="",
+)
+
+# Identity of the active extract budget scope, used to cancel its pending prefetches
+_extract_scope_var: ContextVar[Optional[object]] = ContextVar(
+    "tavily_extract_scope",
+    default=None,
+)
+# Domain of the entity under research (e.g. the vendor website); prefetch prefers it
+_focus_domain_var: ContextVar[str] = ContextVar(
+    "tavily_focus_domain",
+    default="",
+)
+
+# Persistent response cache shared by all Tavily wrappers (created lazily)
+_tavily_cache: Optional[ResponseCache] = None
+_tavily_cache_lock = threading.Lock()
+
+# Coalesces identical Tavily requests that are in flight at the same time
+tavily_flights = SingleFlight()
+
+
+@contextmanager
+def scoped_tavily_extract_budget(limit: Optional[int] = None):
+    """Reset the Tavily extract budget for a logical unit of work.
+
+    The scope also starts with no last search query, so work submitted from
+    another agent's context (e.g. a streamed SWOT task) never ranks extract
+    passages against that agent's searches.
+
+    Parameters
+    ----------
+    limit : int | None
+        Optional override for the number of extract calls permitted in the scope.
+        Defaults to the global ``TAVILY_MAX_EXTRACT_CALLS`` when omitted.
+    """
+
+    normalized_limit = TAVILY_MAX_EXTRACT_CALLS if limit is None else max(0, int(limit))
+    limit_token = _extract_limit_var.set(normalized_limit)
+    count_token = _extract_call_count_var.set(0)
+    query_token = last_search_query_var.set("")
+    scope = object()
+    scope_token = _extract_scope_var.set(scope)
+    try:
+        yield
+    finally:
+        extract_prefetcher.release_scope(scope)
+        _extract_scope_var.reset(scope_token)
+        last_search_query_var.reset(query_token)
+        _extract_call_count_var.reset(count_token)
+        _extract_limit_var.reset(limit_token)
+
+
+@contextmanager
+def scoped_focus_domain(url_or_domain: Optional[str]):
+    """Mark the website under research so search-hit prefetch favours its pages.
+
+    Parameters
+    ----------
+    url_or_domain : str | None
+        Website URL or bare domain (e.g. a vendor's homepage). Falsy values
+        leave the current focus unchanged.
+    """
+    if not url_or_domain:
+        yield
+        return
+    token = _focus_domain_var.set(_bare_domain(url_or_domain))
+    try:
+        yield
+    finally:
+        _focus_domain_var.reset(token)
+
+
+def get_tavily_extract_budget_state() -> Tuple[int, int]:
+    """Return the (used_calls, remaining_calls) for the active extract budget."""
+
+    limit = max(0, int(_extract_limit_var.get()))
+    used = max(0, int(_extract_call_count_var.get()))
+    return used, max(limit - used, 0)
+
+
+def _get_extract_warning_threshold(limit: int) -> int:
+    """Return remaining-call threshold at which we should warn the agent."""
+    if limit <= 0:
+        return 0
+    return min(3, max(1, limit // 5))
+
+
+def _format_extract_warning(remaining: int, limit: int) -> str:
+    """Return a human-friendly warning about remaining extract calls."""
+    if remaining <= 0:
+        return (
+            f"⚠️ tavily_extract budget exhausted: no calls remaining out of {limit}. "
+            "Further tavily_extract usage will raise an error."
+        )
+
+    return (
+        f"⚠️ tavily_extract budget nearly exhausted: {remaining} call(s) remaining out of {limit}. "
+        "Prefer tavily_search snippets or cache results before extracting again."
+    )
+
+
+def normalize_url(url: str) -> str:
+    """Return a normalized representation for caching purposes."""
+    text = (url or "").strip()
+    if not text:
+        return ""
+    candidate = text if "://" in text else f"https://{text}"
+    try:
+        parsed = httpx.URL(candidate)
+    except Exception:  # pragma: no cover - invalid URLs should not crash tools
+        return text.lower()
+    # Drop the fragment and spell out an empty path so "a.com" and "a.com/#x" match
+    return str(parsed.copy_with(fragment=None, path=parsed.path))
+
+
+def _domain_from_url(url: str) -> str:
+    normalized = normalize_url(url)
+    try:
+        return httpx.URL(normalized).host or normalized
+    except Exception:  # pragma: no cover - fall back to normalized when parsing fails
+        return normalized
+
+
+def _bare_domain(url: str) -> str:
+    """Host without a leading ``www.`` for same-site comparisons."""
+    host = _domain_from_url(url).lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def ensure_url_list(urls) -> list[str]:
+    """Coerce tavily_extract inputs into a list for caching and validation."""
+    if isinstance(urls, str):
+        return [urls]
+    if urls is None:
+        return []
+    if isinstance(urls, Iterable):
+        return [str(u) for u in urls if u]
+    raise TypeError("tavily_extract expects a string or iterable of strings")
+
+
+def normalize_query(query: str) -> str:
+    """Return a case- and whitespace-insensitive form of a search query."""
+    return " ".join((query or "").split()).lower()
+
+
+def get_tavily_cache() -> Optional[ResponseCache]:
+    """Return the shared Tavily response cache, or None when caching is disabled."""
+    global _tavily_cache
+    settings = get_tavily_cache_settings()
+    if not settings["enabled"]:
+        return None
+    if _tavily_cache is None:
+        with _tavily_cache_lock:
+            if _tavily_cache is None:
+                try:
+                    _tavily_cache = ResponseCache(
+                        settings["path"],
+                        max_bytes=settings["max_bytes"],
+                        ttls=settings["ttls"],
+                    )
+                except Exception as exc:  # pragma: no cover - cache must never break tools
+                    logger.warning("Tavily response cache unavailable: %s", exc)
+                    return None
+    return _tavily_cache
+
+
+def get_tavily_cache_stats() -> Dict[str, Any]:
+    """Return hit/miss counters for the Tavily response cache."""
+    cache = get_tavily_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+
+def cache_lookup(tool_name: str, key: str) -> Optional[Any]:
+    cache = get_tavily_cache()
+    if cache is None:
+        return None
+    try:
+        return cache.get(tool_name, key)
+    except Exception as exc:  # pragma: no cover - cache must never break tools
+        logger.debug("Tavily cache lookup failed for %s: %s", tool_name, exc)
+        return None
+
+
+def cache_store(tool_name: str, key: str, value: Any) -> None:
+    cache = get_tavily_cache()
+    if cache is None:
+        return
+    try:
+        cache.set(tool_name, key, value)
+    except Exception as exc:  # pragma: no cover - cache must never break tools
+        logger.debug("Tavily cache store failed for %s: %s", tool_name, exc)
+
+
+def _truncate_extract_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Clamp extracted page content to 100,000 characters."""
+    # Truncate raw_content if present
+    if "raw_content" in item and item["raw_content"]:
+        item["raw_content"] = item["raw_content"][:100000]
+    # Truncate content if present
+    if "content" in item and item["content"]:
+        item["content"] = item["content"][:100000]
+    return item
+
+
+def format_search_results(response: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Reduce a raw Tavily search response to title/url/snippet triage records."""
+    return [{"title": it.get("title",""), "url": it["url"], "snippet": it.get("content","")}
+            for it in response.get("results", [])]
+
+
+def lookup_cached_extracts(url_list: List[str]) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+    """Split URLs into cached extract items (by normalized URL) and URLs still to fetch."""
+    cached_items: Dict[str, Dict[str, Any]] = {}
+    missing: List[str] = []
+    for url in url_list:
+        normalized = normalize_url(url)
+        item = cache_lookup("tavily_extract", ResponseCache.make_key(normalized))
+        if isinstance(item, dict):
+            cached_items[normalized] = item
+        else:
+            missing.append(url)
+    return cached_items, missing
+
+
+def store_extract_response(resp: Any) -> Any:
+    """Truncate freshly extracted pages and cache each one under its normalized URL."""
+    if isinstance(resp, dict):
+        for item in resp.get("results") or []:
+            if not isinstance(item, dict):
+                continue
+            _truncate_extract_item(item)
+            normalized = normalize_url(item.get("url", ""))
+            if normalized:
+                cache_store("tavily_extract", ResponseCache.make_key(normalized), item)
+    return resp
+
+
+def extract_flight_key(missing: List[str]) -> str:
+    return "tavily_extract:" + ResponseCache.make_key(sorted(normalize_url(url) for url in missing))
+
+
+def merge_extract_response(
+    url_list: List[str],
+    cached_items: Dict[str, Dict[str, Any]],
+    resp: Any,
+) -> Any:
+    """Combine cached and freshly fetched pages, preserving the caller's URL order."""
+    if resp is None:
+        return {
+            "results": [cached_items[normalize_url(url)] for url in url_list],
+            "failed_results": [],
+        }
+    if not isinstance(resp, dict):
+        return resp
+
+    fetched_items: Dict[str, Dict[str, Any]] = {}
+    extra_items: List[Dict[str, Any]] = []
+    for item in resp.get("results") or []:
+        if not isinstance(item, dict):
+            continue
+        normalized = normalize_url(item.get("url", ""))
+        if normalized:
+            fetched_items[normalized] = item
+        else:
+            extra_items.append(item)
+
+    ordered: List[Dict[str, Any]] = []
+    for url in url_list:
+        normalized = normalize_url(url)
+        item = cached_items.get(normalized) or fetched_items.pop(normalized, None)
+        if item is not None:
+            ordered.append(item)
+    ordered.extend(fetched_items.values())
+    ordered.extend(extra_items)
+
+    merged = dict(resp)
+    merged["results"] = ordered
+    merged.setdefault("failed_results", [])
+    return merged
+
+
+def fetch_extract(url_list: List[str]) -> Tuple[Dict[str, Any], bool]:
+    """Return a Tavily extract response, serving cached pages per normalized URL.
+
+    Returns
+    -------
+    tuple[dict, bool]
+        The response and whether it was shared from another caller's identical
+        in-flight request (in which case this caller made no Tavily call).
+    """
+    cached_items, missing = lookup_cached_extracts(url_list)
+    if not missing:
+        return merge_extract_response(url_list, cached_items, None), False
+
+    def _request() -> Dict[str, Any]:
+        return store_extract_response(
+            get_tavily_client().extract(urls=missing, timeout=TAVILY_EXTRACT_TIMEOUT)
+        )
+
+    resp, shared = tavily_flights.do(extract_flight_key(missing), _request)
+    return merge_extract_response(url_list, cached_items, resp), shared
+
+
+class ExtractPrefetcher:
+    """Warm the extract cache for search hits an agent is likely to extract next.
+
+    Prefetches run on a small background pool while the LM decides its next
+    step. An extract that asks for a prefetched URL claims it before any
+    budget check and is charged one call for it, like any other extract;
+    prefetches nobody claims are never charged. Outstanding prefetches per
+    budget scope are capped at the calls it has left, queued ones beyond that
+    are cancelled as the scope spends its budget, and all of them are dropped
+    when the scope ends.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # normalized URL -> (future, owning budget scope), until claimed or released
+        self._entries: Dict[str, Tuple[Future, Optional[object]]] = {}
+        self._stats = {"scheduled": 0, "completed": 0, "failed": 0, "consumed": 0, "cancelled": 0, "unused": 0}
+
+    def outstanding(self, scope: Optional[object]) -> int:
+        """Return how many unclaimed prefetches ``scope`` owns."""
+        with self._lock:
+            return sum(1 for _, owner in self._entries.values() if owner is scope)
+
+    def schedule(self, urls: List[str], scope: Optional[object], slots: int) -> int:
+        """Queue new URLs while ``scope`` owns fewer than ``slots`` prefetches; return how many were queued."""
+        queued = 0
+        with self._lock:
+            slots -= sum(1 for _, owner in self._entries.values() if owner is scope)
+            for url in urls:
+                if queued >= slots:
+                    break
+                key = normalize_url(url)
+                if not key or key in self._entries:
+                    continue
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="tavily-prefetch",
+                    )
+                future = self._executor.submit(self._prefetch, key, url)
+                self._entries[key] = (future, scope)
+                self._stats["scheduled"] += 1
+                queued += 1
+        return queued
+
+    def _prefetch(self, key: str, url: str) -> Optional[Dict[str, Any]]:
+        """Extract one URL into the response cache and return its page, or ``None``."""
+        try:
+            resp, _ = fetch_extract([url])
+        except Exception as exc:
+            logger.debug("Extract prefetch failed for %s: %s", url, exc)
+            resp = None
+        page = next(
+            (
+                item for item in (resp or {}).get("results") or []
+                if isinstance(item, dict) and (item.get("raw_content") or item.get("content"))
+            ),
+            None,
+        )
+        with self._lock:
+            if page is None:
+                self._entries.pop(key, None)
+                self._stats["failed"] += 1
+            else:
+                self._stats["completed"] += 1
+        return page
+
+    def claim(self, urls: List[str], timeout: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """Take the prefetched pages for ``urls``, waiting for ones still in flight.
+
+        Returns
+        -------
+        dict
+            Page by normalized URL for every URL whose prefetch succeeded.
+        """
+        with self._lock:
+            claimed = {}
+            for url in urls:
+                key = normalize_url(url)
+                entry = self._entries.pop(key, None)
+                if entry is not None:
+                    claimed[key] = entry[0]
+        pages: Dict[str, Dict[str, Any]] = {}
+        for key, future in claimed.items():
+            try:
+                page = future.result(timeout=timeout)
+            except Exception:  # cancelled, timed out or failed: extract it normally
+                continue
+            if page is not None:
+                pages[key] = page
+        with self._lock:
+            self._stats["consumed"] += len(pages)
+        return pages
+
+    def pending(self, urls: List[str]) -> bool:
+        """Return whether any of ``urls`` has an unclaimed prefetch queued or in flight."""
+        with self._lock:
+            return any(
+                not self._entries[key][0].done()
+                for key in map(normalize_url, urls)
+                if key in self._entries
+            )
+
+    def wait_for(self, urls: List[str], timeout: Optional[float] = None) -> None:
+        """Block until prefetches for ``urls`` finish, leaving them unclaimed.
+
+        Their pages are then in the response cache for callers that do not
+        charge a budget for them.
+        """
+        with self._lock:
+            futures = [self._entries[key][0] for key in map(normalize_url, urls) if key in self._entries]
+        if futures:
+            wait(futures, timeout=timeout)
+
+    def cancel_pending(self, scope: Optional[object], keep: int = 0) -> int:
+        """Cancel queued prefetches for ``scope`` until it owns at most ``keep``."""
+        cancelled = 0
+        with self._lock:
+            owned = [(key, future) for key, (future, owner) in self._entries.items() if owner is scope]
+            excess = len(owned) - max(0, keep)
+            # Newest first, so the likeliest (earliest queued) hits survive
+            for key, future in reversed(owned):
+                if cancelled >= excess:
+                    break
+                if future.cancel():
+                    del self._entries[key]
+                    cancelled += 1
+            self._stats["cancelled"] += cancelled
+        return cancelled
+
+    def release_scope(self, scope: Optional[object]) -> None:
+        """Drop every prefetch owned by a finished budget scope."""
+        self.cancel_pending(scope)
+        with self._lock:
+            leftovers = [key for key, (_, owner) in self._entries.items() if owner is scope]
+            for key in leftovers:
+                del self._entries[key]
+            self._stats["unused"] += len(leftovers)
+
+    def stats(self) -> Dict[str, int]:
+        """Return scheduled/completed/consumed/cancelled/unused counters."""
+        with self._lock:
+            return dict(self._stats)
+
+
+extract_prefetcher = ExtractPrefetcher(TAVILY_PREFETCH_WORKERS)
+
+
+def get_extract_prefetch_stats() -> Dict[str, int]:
+    """Return statistics for speculative extract prefetching."""
+    return extract_prefetcher.stats()
+
+
+def _select_prefetch_urls(results: List[Dict[str, Any]], top_k: int) -> List[str]:
+    """Pick the hits worth prefetching: the focus site's pages if any, else the top-ranked."""
+    urls = [item.get("url") for item in results if isinstance(item, dict) and item.get("url")]
+    focus = _focus_domain_var.get()
+    if focus:
+        own_site = [
+            url for url in urls
+            if (host := _bare_domain(url)) == focus or host.endswith("." + focus)
+        ]
+        if own_site:
+            urls = own_site
+    return urls[:top_k]
+
+
+def maybe_prefetch_extracts(results: List[Dict[str, Any]]) -> None:
+    """Speculatively extract the likeliest next URLs, within the remaining budget."""
+    if TAVILY_PREFETCH_TOP_K <= 0 or not results or get_tavily_cache() is None:
+        return
+    remaining = max(0, int(_extract_limit_var.get())) - _extract_call_count_var.get()
+    if remaining <= 0:
+        return
+
+    store = get_source_logger().extract_store
+    candidates = [
+        url for url in _select_prefetch_urls(results, TAVILY_PREFETCH_TOP_K)
+        if normalize_url(url) not in store
+    ]
+    if candidates:
+        extract_prefetcher.schedule(candidates, _extract_scope_var.get(), remaining)
+
+
+def log_search_results(query: str, results: List[Dict[str, Any]]) -> None:
+    """Record search results in the session source log."""
+    if results:
+        source_logger = get_source_logger()
+        agent_name = get_current_agent()
+        source_logger.log_tavily_results(
+            results=results,
+            query=query,
+            tool_name="tavily_search",
+            agent_name=agent_name
+        )
+
+
+def log_extract_results(url_list: List[str], resp: Any, tool_name: str = "tavily_extract") -> None:
+    """Record extracted pages in the session source log."""
+    if not isinstance(resp, dict):
+        return
+    results = resp.get("results")
+    if isinstance(results, list) and results:
+        source_logger = get_source_logger()
+        agent_name = get_current_agent()
+        # Convert to same format as search results for consistent logging
+        formatted_results = []
+        for item in results:
+            # Full page text is kept in the source log for citation matching
+            full_text = item.get("raw_content") or item.get("content") or ""
+            formatted_results.append({
+                "title": item.get("title", ""),
+                "url": item.get("url", ""),
+                "snippet": full_text[:500],
+                "content": full_text,
+            })
+        source_logger.log_tavily_results(
+            results=formatted_results,
+            query=f"extract:{url_list}",
+            tool_name=tool_name,
+            agent_name=agent_name
+        )
+
+
+def log_site_results(resp: Any, url: str, tool_name: str) -> None:
+    """Record crawl/map results in the session source log."""
+    if resp and isinstance(resp, dict):
+        source_logger = get_source_logger()
+        agent_name = get_current_agent()
+        # Convert crawl/map results to consistent format
+        if "results" in resp and isinstance(resp["results"], list):
+            formatted_results = []
+            for item in resp["results"]:
+                formatted_results.append({
+                    "title": item.get("title", ""),
+                    "url": item.get("url", ""),
+                    "snippet": item.get("content", "")[:500] if "content" in item else ""
+                })
+            source_logger.log_tavily_results(
+                results=formatted_results,
+                query=f"{tool_name.removeprefix('tavily_')}:{url}",
+                tool_name=tool_name,
+                agent_name=agent_name
+            )
+
+
+def set_tool_ui_log(callback: Optional[Callable[[str], None]]) -> None:
+    """Set or clear a UI logging callback for tool activity messages."""
+    global TOOL_UI_LOG
+    TOOL_UI_LOG = callback
+
+
+def ui_log(message: str) -> None:
+    """Forward a tool activity message to the UI hook, if one is set; never raises."""
+    if TOOL_UI_LOG:
+        try:
+            TOOL_UI_LOG(message)
+        except Exception:
+            pass
+
+
+def prepare_search_queries(queries) -> List[str]:
+    """Coerce tavily_search_many input into distinct, non-empty queries."""
+    if isinstance(queries, str):
+        queries = [queries]
+    if not isinstance(queries, Iterable):
+        raise TypeError("tavily_search_many expects a list of query strings")
+
+    unique: List[str] = []
+    seen = set()
+    for query in queries:
+        text = str(query or "").strip()
+        key = normalize_query(text)
+        if key and key not in seen:
+            seen.add(key)
+            unique.append(text)
+
+    if len(unique) > TAVILY_SEARCH_MANY_MAX_QUERIES:
+        raise ValueError(
+            f"❌ tavily_search_many received {len(unique)} queries, but the maximum is "
+            f"{TAVILY_SEARCH_MANY_MAX_QUERIES} per call.\n\n"
+            "✅ SOLUTION: Split the queries across calls or drop the least important ones."
+        )
+    return unique
+
+
+def merge_search_results(
+    per_query: List[Tuple[str, List[Dict[str, Any]]]],
+) -> List[Dict[str, Any]]:
+    """Interleave per-query results by rank and drop duplicate URLs.
+
+    Each merged record lists every query that surfaced its URL.
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+    depth = max((len(results) for _, results in per_query), default=0)
+    for rank in range(depth):
+        for query, results in per_query:
+            if rank >= len(results):
+                continue
+            item = results[rank]
+            key = normalize_url(item.get("url", "")) or item.get("url", "")
+            if key in merged:
+                if query not in merged[key]["queries"]:
+                    merged[key]["queries"].append(query)
+                continue
+            merged[key] = {**item, "queries": [query]}
+    return list(merged.values())
+
+
+def validate_extract_urls(urls) -> List[str]:
+    """Coerce extract input and enforce the per-call URL limit."""
+    url_list = ensure_url_list(urls)
+    if len(url_list) > 2:
+        raise ValueError(
+            f"❌ tavily_extract received {len(url_list)} URLs, but the maximum is 2 per call.\n\n"
+            f"💡 RECOMMENDATION: Are you sure you need to extract the full content of that many pages? "
+            f"Typically only a few pages are needed. The tool allows a maximum of 2 URLs per call. "
+            f"Try extracting 1-2 most relevant pages first, review the content, then decide if more are needed.\n\n"
+            f"📋 You provided: {url_list}\n"
+            f"✅ SOLUTION: Call tavily_extract with only 2 URLs. "
+            f"prioritize and select the most relevant ones."
+        )
+    return url_list
+
+
+def remember_session_extracts(resp: Any) -> None:
+    """Add successfully extracted pages to the session-wide extract store."""
+    if not isinstance(resp, dict):
+        return
+    store = get_source_logger().extract_store
+    for item in resp.get("results") or []:
+        if isinstance(item, dict) and (item.get("raw_content") or item.get("content")):
+            store.put(normalize_url(item.get("url", "")), item)
+
+
+def lookup_session_extracts(url_list: List[str]) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+    """Split URLs into pages already extracted this session and URLs still to fetch."""
+    found, missing_keys = get_source_logger().extract_store.lookup(
+        [normalize_url(url) for url in url_list]
+    )
+    missing_set = set(missing_keys)
+    missing = [url for url in url_list if normalize_url(url) in missing_set]
+    if found:
+        ui_log(f"📄 Reusing {len(found)} page(s) already extracted this session")
+    return found, missing
+
+
+def claim_prefetched_extracts(url_list: List[str]) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+    """Take prefetched pages for ``url_list``, recording them like extracts; return them and the rest."""
+    pages = extract_prefetcher.claim(url_list, timeout=TAVILY_EXTRACT_TIMEOUT)
+    if not pages:
+        return {}, url_list
+    claimed = [url for url in url_list if normalize_url(url) in pages]
+    resp = {"results": [pages[normalize_url(url)] for url in claimed]}
+    log_extract_results(claimed, resp)
+    remember_session_extracts(resp)
+    return pages, [url for url in url_list if normalize_url(url) not in pages]
+
+
+def charge_prefetched_extract() -> None:
+    """Charge one call for an extract served entirely from prefetched pages.
+
+    The prefetch was capped by the budget when it was queued, so serving it
+    never fails; the count just stops at the limit.
+    """
+    limit = max(0, int(_extract_limit_var.get()))
+    used = min(limit, _extract_call_count_var.get() + 1)
+    _extract_call_count_var.set(used)
+    extract_prefetcher.cancel_pending(_extract_scope_var.get(), keep=limit - used)
+
+
+def extract_budget_exhausted() -> bool:
+    """Return whether the scoped extract budget has no calls left."""
+    limit = max(0, int(_extract_limit_var.get()))
+    return limit <= 0 or _extract_call_count_var.get() >= limit
+
+
+def fetch_pages_locally(url_list: List[str], reason: str) -> Dict[str, Any]:
+    """Fetch pages with the local fetcher instead of Tavily and record them like extracts."""
+    ui_log(f"🌐 Fetching page(s) directly ({reason}): {url_list[:3]}")
+    resp = get_page_fetcher().fetch_many(url_list)
+    log_extract_results(url_list, resp, tool_name="page_fetch")
+    remember_session_extracts(resp)
+    return resp
+
+
+def fill_failed_extracts(response: Any) -> Any:
+    """Retry URLs Tavily could not extract with the local fetcher."""
+    if not PAGE_FETCH_FALLBACK_ENABLED or not isinstance(response, dict):
+        return response
+    failed_urls = [
+        item.get("url") for item in response.get("failed_results") or []
+        if isinstance(item, dict) and item.get("url")
+    ]
+    if not failed_urls:
+        return response
+    local = fetch_pages_locally(failed_urls, "Tavily could not extract them")
+    response["results"] = list(response.get("results") or []) + local["results"]
+    response["failed_results"] = local["failed_results"]
+    return response
+
+
+def rank_extract_response(response: Any, query: Optional[str]) -> Any:
+    """Replace full extracted pages with the passages most relevant to ``query``.
+
+    Falls back to the agent's most recent search query when ``query`` is empty.
+    The complete page text has already been written to the source log.
+    """
+    settings = get_extract_passage_settings()
+    if not settings["enabled"] or not isinstance(response, dict):
+        return response
+    results = response.get("results")
+    if not isinstance(results, list):
+        return response
+
+    focus = (query or "").strip() or last_search_query_var.get()
+    documents = [
+        {
+            "url": item.get("url", ""),
+            "title": item.get("title", ""),
+            "text": item.get("raw_content") or item.get("content") or "",
+        }
+        for item in results
+        if isinstance(item, dict)
+    ]
+    passages = rank_passages(
+        documents,
+        focus,
+        top_k=settings["top_k"],
+        token_budget=settings["token_budget"],
+        passage_tokens=settings["passage_tokens"],
+    )
+
+    ranked: Dict[str, Any] = {
+        "query": focus,
+        "passages": [
+            {"url": p["url"], "title": p["title"], "score": p["score"], "text": p["text"]}
+            for p in passages
+        ],
+        "pages": [
+            {
+                "url": doc["url"],
+                "title": doc["title"],
+                "characters": len(doc["text"]),
+                "passages_returned": sum(1 for p in passages if p["url"] == doc["url"]),
+            }
+            for doc in documents
+        ],
+    }
+    for key in ("failed_results", "warnings"):
+        if response.get(key):
+            ranked[key] = response[key]
+    return ranked
+
+
+def check_extract_budget(url_list: List[str]) -> Tuple[int, int, int]:
+    """Enforce the per-call URL cap and the scoped extract budget.
+
+    Returns
+    -------
+    tuple[int, int, int]
+        (limit, calls used before this one, warning threshold)
+    """
+    # Check URL count limit BEFORE checking budget
+    if len(url_list) > 3:
+        raise ValueError(
+            f"❌ tavily_extract received {len(url_list)} URLs, but the maximum is 3 per call.\n\n"
+            f"💡 RECOMMENDATION: Are you sure you need to extract the full content of that many pages? "
+            f"Typically only a few pages are needed. The tool allows a maximum of 3 URLs per call. "
+            f"Try extracting 1-3 most relevant pages first, review the content, then decide if more are needed.\n\n"
+            f"📋 You provided: {url_list}\n"
+            f"✅ SOLUTION: Call tavily_extract with only the first 3 URLs, or better yet, "
+            f"prioritize and select the most relevant ones."
+        )
+
+    limit = _extract_limit_var.get()
+    limit = max(0, int(limit))
+    if limit <= 0:
+        message = (
+            "❌ tavily_extract is disabled because the active extract budget allows 0 calls.\n\n"
+        )
+        logger.error(message)
+        raise RuntimeError(message)
+
+    call_count = _extract_call_count_var.get()
+    if call_count >= limit:
+        message = (
+            f"❌ tavily_extract budget exhausted. Limit of {limit} calls reached for this run.\n\n"
+            "💡 RECOMMENDATION: Reduce extract usage, cache prior results, or increase TAVILY_MAX_EXTRACT_CALLS."
+        )
+        logger.error(message)
+        raise RuntimeError(message)
+
+    threshold = _get_extract_warning_threshold(limit)
+    remaining_before_call = max(limit - call_count, 0)
+    if threshold and remaining_before_call <= threshold:
+        logger.warning(_format_extract_warning(remaining_before_call, limit))
+
+    ellipsis = "" if len(url_list) <= 3 else " …"
+    ui_log(f"📄 Extracting page(s): {url_list[:3]}{ellipsis}")
+
+    return limit, call_count, threshold
+
+
+def charge_extract_budget(response: Any, shared: bool, limit: int, call_count: int, threshold: int) -> Any:
+    """Record an extract call against the scoped budget and attach low-budget warnings."""
+    # Callers that joined another agent's identical in-flight extract are not charged
+    updated_count = call_count if shared else call_count + 1
+    _extract_call_count_var.set(updated_count)
+    remaining_after_call = max(limit - updated_count, 0)
+    # Budget-aware cancellation: queued prefetches never outnumber the calls left
+    extract_prefetcher.cancel_pending(_extract_scope_var.get(), keep=remaining_after_call)
+    if threshold and remaining_after_call <= threshold:
+        warning_message = _format_extract_warning(remaining_after_call, limit)
+        logger.warning(warning_message)
+        if isinstance(response, dict):
+            warnings = response.setdefault("warnings", [])
+            if isinstance(warnings, list):
+                warnings.append(warning_message)
+            else:
+                response["warnings"] = [warning_message]
+    return response
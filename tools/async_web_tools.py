@@ -0,0 +1,343 @@
+"""Asyncio-native Tavily tools for agents driven through ``dspy.Module.acall``.
+
+These mirror the blocking wrappers in :mod:`tools.web_tools` (cache, request
+coalescing, extract budget and source logging) but await an
+``httpx.AsyncClient`` so many agents can share one event loop instead of
+occupying one OS thread each. Response-cache and source-log I/O runs in
+worker threads, and a request that a blocking caller or an extract prefetch
+already has in flight is joined rather than sent again.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import dspy
+from dspy.utils.callback import with_callbacks
+
+from config.environment import (
+    PAGE_FETCH_FALLBACK_ENABLED,
+    TAVILY_EXTRACT_TIMEOUT,
+    TAVILY_SEARCH_MANY_CONCURRENCY,
+)
+from tools._tavily_common import (
+    cache_lookup,
+    cache_store,
+    charge_extract_budget,
+    charge_prefetched_extract,
+    check_extract_budget,
+    claim_prefetched_extracts,
+    ensure_url_list,
+    extract_budget_exhausted,
+    extract_flight_key,
+    extract_prefetcher,
+    fetch_pages_locally,
+    fill_failed_extracts,
+    format_search_results,
+    last_search_query_var,
+    log_extract_results,
+    log_search_results,
+    log_site_results,
+    lookup_cached_extracts,
+    lookup_session_extracts,
+    maybe_prefetch_extracts,
+    merge_extract_response,
+    merge_search_results,
+    normalize_query,
+    normalize_url,
+    prepare_search_queries,
+    rank_extract_response,
+    remember_session_extracts,
+    store_extract_response,
+    tavily_flights,
+    ui_log,
+    validate_extract_urls,
+)
+from tools.tavily_client import get_async_tavily_client
+from tools.web_tools import create_citation_from_tavily
+from utils.pipeline_dag import raise_if_cancelled
+from utils.response_cache import ResponseCache
+from utils.single_flight import AsyncSingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Coalesces identical Tavily requests in flight on the same event loop
+_async_tavily_flights = AsyncSingleFlight()
+
+
+class AsyncCapableTool(dspy.Tool):
+    """``dspy.Tool`` that runs a blocking function on ``__call__`` and a coroutine on ``acall``.
+
+    ``dspy.ReAct.forward`` keeps using the thread-friendly sync path while
+    ``dspy.ReAct.aforward`` awaits the async implementation, so the same tool
+    instances serve both execution styles. Both paths stop with
+    :class:`~utils.pipeline_dag.StageCancelled` once the pipeline run they
+    belong to has been cancelled.
+    """
+
+    async_func: Optional[Callable[..., Awaitable[Any]]] = None
+
+    def __init__(self, func: Callable[..., Any], async_func: Callable[..., Awaitable[Any]], **kwargs):
+        super().__init__(func, **kwargs)
+        self.async_func = async_func
+
+    def __call__(self, **kwargs):
+        raise_if_cancelled()
+        return super().__call__(**kwargs)
+
+    @with_callbacks
+    async def acall(self, **kwargs):
+        raise_if_cancelled()
+        parsed_kwargs = self._validate_and_parse_args(**kwargs)
+        return await self.async_func(**parsed_kwargs)
+
+
+# --------------------------------------------------------------------------- #
+# Cached, coalesced request helpers
+# --------------------------------------------------------------------------- #
+
+async def _join_blocking_flight(flight_key: str) -> Tuple[bool, Any]:
+    """Share the result of an identical request a blocking caller has in flight."""
+    if not tavily_flights.in_flight(flight_key):
+        return False, None
+    return await asyncio.to_thread(tavily_flights.join, flight_key)
+
+
+async def _afetch_search(query: str, max_results: int) -> List[Dict[str, Any]]:
+    cache_key = ResponseCache.make_key(normalize_query(query), int(max_results))
+    cached = await asyncio.to_thread(cache_lookup, "tavily_search", cache_key)
+    if cached is not None:
+        return cached
+
+    flight_key = f"tavily_search:{cache_key}"
+    joined, results = await _join_blocking_flight(flight_key)
+    if joined:
+        return results
+
+    async def _request() -> List[Dict[str, Any]]:
+        client = get_async_tavily_client()
+        r = await client.search(query=query, max_results=max_results, include_answer=False)
+        results = format_search_results(r)
+        if results:
+            await asyncio.to_thread(cache_store, "tavily_search", cache_key, results)
+        return results
+
+    results, _ = await _async_tavily_flights.do(flight_key, _request)
+    return results
+
+
+async def _afetch_extract(url_list: List[str]) -> Tuple[Dict[str, Any], bool]:
+    cached_items, missing = await asyncio.to_thread(lookup_cached_extracts, url_list)
+    if not missing:
+        return merge_extract_response(url_list, cached_items, None), False
+
+    flight_key = extract_flight_key(missing)
+    joined, resp = await _join_blocking_flight(flight_key)
+    if joined:
+        return merge_extract_response(url_list, cached_items, resp), True
+
+    # Pages being prefetched land in the response cache; wait for them instead of re-extracting
+    if extract_prefetcher.pending(missing):
+        await asyncio.to_thread(extract_prefetcher.wait_for, missing, TAVILY_EXTRACT_TIMEOUT)
+        prefetched, missing = await asyncio.to_thread(lookup_cached_extracts, missing)
+        cached_items.update(prefetched)
+        if not missing:
+            return merge_extract_response(url_list, cached_items, None), True
+        flight_key = extract_flight_key(missing)
+
+    async def _request() -> Dict[str, Any]:
+        client = get_async_tavily_client()
+        resp = await client.extract(urls=missing, timeout=TAVILY_EXTRACT_TIMEOUT)
+        return await asyncio.to_thread(store_extract_response, resp)
+
+    resp, shared = await _async_tavily_flights.do(flight_key, _request)
+    return merge_extract_response(url_list, cached_items, resp), shared
+
+
+async def _afetch_site(tool_name: str, cache_key: str, request: Callable[[], Awaitable[Any]]) -> Any:
+    cached = await asyncio.to_thread(cache_lookup, tool_name, cache_key)
+    if cached is not None:
+        return cached
+
+    flight_key = f"{tool_name}:{cache_key}"
+    joined, resp = await _join_blocking_flight(flight_key)
+    if joined:
+        return resp
+
+    async def _request() -> Any:
+        resp = await request()
+        if isinstance(resp, dict) and resp.get("results"):
+            await asyncio.to_thread(cache_store, tool_name, cache_key, resp)
+        return resp
+
+    resp, _ = await _async_tavily_flights.do(flight_key, _request)
+    return resp
+
+
+# --------------------------------------------------------------------------- #
+# Public async Tavily wrappers
+# --------------------------------------------------------------------------- #
+
+async def tavily_search_async(query: str, max_results: int = 20) -> List[Dict[str, Any]]:
+    """Async :func:`tools.web_tools.tavily_search`; returns title/url/snippet records."""
+    ui_log(f"🔎 Searching the web: '{query}' (max_results={max_results})")
+    results = await _afetch_search(query, max_results)
+    last_search_query_var.set(query)
+    await asyncio.to_thread(log_search_results, query, results)
+    ui_log(f"🔎 Search complete: {len(results)} result(s)")
+    return results
+
+
+async def tavily_search_many_async(queries: List[str], max_results_per_query: int = 10) -> Dict[str, Any]:
+    """Async :func:`tools.web_tools.tavily_search_many`; searches share a bounded semaphore."""
+    query_list = prepare_search_queries(queries)
+    if not query_list:
+        return {"results": [], "errors": {}}
+
+    ui_log(f"🔎 Searching the web: {len(query_list)} queries (max_results={max_results_per_query} each)")
+    semaphore = asyncio.Semaphore(TAVILY_SEARCH_MANY_CONCURRENCY)
+
+    async def _search_one(query: str) -> List[Dict[str, Any]]:
+        async with semaphore:
+            return await _afetch_search(query, max_results_per_query)
+
+    outcomes = await asyncio.gather(*(_search_one(q) for q in query_list), return_exceptions=True)
+
+    per_query: List[Tuple[str, List[Dict[str, Any]]]] = []
+    errors: Dict[str, str] = {}
+    for query, outcome in zip(query_list, outcomes):
+        if isinstance(outcome, BaseException):
+            logger.warning("tavily_search_many query failed (%s): %s", query, outcome)
+            errors[query] = str(outcome)
+            continue
+        per_query.append((query, outcome))
+    await asyncio.to_thread(_log_search_batch, per_query)
+    last_search_query_var.set(" ".join(query_list))
+
+    merged = merge_search_results(per_query)
+    await asyncio.to_thread(maybe_prefetch_extracts, merged)
+    ui_log(f"🔎 Search complete: {len(merged)} unique result(s) from {len(per_query)} queries")
+    return {"results": merged, "errors": errors}
+
+
+def _log_search_batch(per_query: List[Tuple[str, List[Dict[str, Any]]]]) -> None:
+    for query, results in per_query:
+        log_search_results(query, results)
+
+
+def _record_extract(url_list: List[str], resp: Any) -> None:
+    log_extract_results(url_list, resp)
+    remember_session_extracts(resp)
+
+
+async def _run_tavily_extract_async(urls) -> Tuple[Any, bool]:
+    url_list = validate_extract_urls(urls)
+    if not url_list:
+        return {"results": []}, False
+    try:
+        resp, shared = await _afetch_extract(url_list)
+        await asyncio.to_thread(_record_extract, url_list, resp)
+        return resp, shared
+    except Exception as e:  # pragma: no cover
+        raise RuntimeError(f"Tavily extract failed: {e}") from e
+
+
+async def tavily_extract_async(urls) -> Any:
+    """Async :func:`tools.web_tools.tavily_extract` (no budget enforcement)."""
+    response, _ = await _run_tavily_extract_async(urls)
+    return response
+
+
+async def tavily_crawl_async(url, max_depth: int = 1, max_pages: int = 25) -> Any:
+    """Async :func:`tools.web_tools.tavily_crawl`."""
+    ui_log(f"🕷️ Crawling: {url} (depth={max_depth}, max_pages={max_pages})")
+    cache_key = ResponseCache.make_key(normalize_url(url), int(max_depth), int(max_pages))
+    try:
+        resp = await _afetch_site(
+            "tavily_crawl",
+            cache_key,
+            lambda: get_async_tavily_client().crawl(url=url, max_depth=max_depth, max_pages=max_pages),
+        )
+        await asyncio.to_thread(log_site_results, resp, url, "tavily_crawl")
+        return resp
+    except Exception as e:  # pragma: no cover
+        raise RuntimeError(f"Tavily crawl failed: {e}") from e
+
+
+async def tavily_map_async(url, max_results: int = 10) -> Any:
+    """Async :func:`tools.web_tools.tavily_map`."""
+    ui_log(f"🗺️ Mapping site: {url} (max_results={max_results})")
+    cache_key = ResponseCache.make_key(normalize_url(url), int(max_results))
+    try:
+        resp = await _afetch_site(
+            "tavily_map",
+            cache_key,
+            lambda: get_async_tavily_client().map(url=url, max_results=max_results),
+        )
+        await asyncio.to_thread(log_site_results, resp, url, "tavily_map")
+        return resp
+    except Exception as e:  # pragma: no cover
+        raise RuntimeError(f"Tavily map failed: {e}") from e
+
+
+# --------------------------------------------------------------------------- #
+# Async DSPy tool call guards
+# --------------------------------------------------------------------------- #
+
+async def _tool_tavily_search_async(query: str, max_results: int = 20, return_citations: bool = False):
+    results = await tavily_search_async(query, max_results=max_results)
+    await asyncio.to_thread(maybe_prefetch_extracts, results)
+    if return_citations:
+        citations = [create_citation_from_tavily(r, tool_call="tavily_search") for r in results]
+        return results, citations
+    return results
+
+
+async def _tool_tavily_extract_async(urls, query: str = ""):
+    url_list = ensure_url_list(urls)
+    if not url_list:
+        return {"results": []}
+
+    stored, missing = lookup_session_extracts(validate_extract_urls(url_list))
+    if not missing:
+        return await _rank_async(merge_extract_response(url_list, stored, None), query)
+
+    prefetched, missing = await asyncio.to_thread(claim_prefetched_extracts, missing)
+    stored.update(prefetched)
+    if not missing:
+        charge_prefetched_extract()
+        return await _rank_async(merge_extract_response(url_list, stored, None), query)
+
+    if PAGE_FETCH_FALLBACK_ENABLED and extract_budget_exhausted():
+        response = await asyncio.to_thread(fetch_pages_locally, missing, "extract budget exhausted")
+        return await _rank_async(merge_extract_response(url_list, stored, response), query)
+
+    limit, call_count, threshold = check_extract_budget(missing)
+    try:
+        response, shared = await _run_tavily_extract_async(missing)
+    except RuntimeError as exc:
+        if not PAGE_FETCH_FALLBACK_ENABLED:
+            raise
+        logger.warning("Falling back to local page fetch: %s", exc)
+        response = await asyncio.to_thread(fetch_pages_locally, missing, "Tavily extract failed")
+        return await _rank_async(merge_extract_response(url_list, stored, response), query)
+
+    if PAGE_FETCH_FALLBACK_ENABLED and isinstance(response, dict) and response.get("failed_results"):
+        response = await asyncio.to_thread(fill_failed_extracts, response)
+    response = merge_extract_response(url_list, stored, response)
+    response = await _rank_async(response, query)
+    # Budget ContextVars are charged on the loop: sets made in a worker thread would be lost
+    return charge_extract_budget(response, shared, limit, call_count, threshold)
+
+
+async def _rank_async(response: Any, query: str) -> Any:
+    """Rank extract passages (BM25 over whole pages) off the event loop."""
+    return await asyncio.to_thread(rank_extract_response, response, query)
+
+
+async def _tool_tavily_crawl_async(url: str, max_depth: int = 1, max_pages: int = 25):
+    return await tavily_crawl_async(url, max_depth=max_depth, max_pages=max_pages)
+
+
+async def _tool_tavily_map_async(url: str, max_results: int = 10):
+    return await tavily_map_async(url, max_results=max_results)
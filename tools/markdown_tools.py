@@ -1,14 +1,19 @@
 """DSPy tools for markdown report generation with post-hoc citation matching."""
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Any, List, Optional, Dict
 import dspy
 from config.lm import create_writing_lm
+from utils.agent_context import submit_with_context
 from utils.citation_matcher import CitationMatcher
 from utils.source_logger import get_source_logger
 
+# Maximum citations appended to each report type
+CITATION_LIMITS = {"vendor": 10, "pestle": 8, "porters": 8, "swot": 10, "rfp": 8, "combined": 15}
+
 
 # Citation formatting signature
 class FormatCitations(dspy.Signature):
@@ -80,7 +85,11 @@ class GenerateCombinedReport(dspy.Signature):
 
 
 class ReportGenerator(dspy.Module):
-    """DSPy module for generating all types of markdown reports with post-hoc citations."""
+    """DSPy module for generating all types of markdown reports with post-hoc citations.
+
+    Each report type has its own predictor, so different reports can be
+    drafted from concurrent pipeline stages with one shared generator.
+    """
 
     def __init__(self, model: Optional[dspy.LM] = None, session_id: Optional[str] = None):
         super().__init__()
@@ -100,8 +109,8 @@ class ReportGenerator(dspy.Module):
         self.rfp_gen = dspy.ChainOfThought(GenerateRFPReport)
         self.combined_gen = dspy.ChainOfThought(GenerateCombinedReport)
 
-    def _format_citations(self, citations: List[Dict]) -> str:
-        """Format citations into a References section."""
+    def _format_citations(self, citations: List[Dict], formatter: Optional[dspy.Module] = None) -> str:
+        """Format citations into a References section, with ``formatter`` if given."""
         if not citations:
             return ""
 
@@ -117,9 +126,18 @@ class ReportGenerator(dspy.Module):
             return ""
 
         with dspy.context(lm=self.model):
-            result = self.citation_formatter(citations=unique_citations)
+            result = (formatter or self.citation_formatter)(citations=unique_citations)
         return result.references_section
 
+    def _with_references(self, content: str, citations: List[Dict], formatter: Optional[dspy.Module] = None) -> str:
+        """Append a formatted References section for ``citations`` to ``content``."""
+        if citations:
+            references = self._format_citations(citations, formatter)
+            if references and "## References" not in content:
+                content = content + "\n\n" + references
+
+        return content
+
     def _append_citations(self, content: str, section_name: str, n_results: int = 5) -> str:
         """Find and append citations for a section."""
         # Find relevant citations for the content
@@ -129,57 +147,93 @@ class ReportGenerator(dspy.Module):
             n_results_per_claim=2,
             max_total_citations=n_results
         )
-
-        if citations:
-            references = self._format_citations(citations)
-            if references and "## References" not in content:
-                content = content + "\n\n" + references
-
-        return content
-
-    def generate_vendor_report(self, vendor_list: List[Any], category: str, region: str) -> str:
+        return self._with_references(content, citations)
+
+    def append_citations(self, reports: Dict[str, str]) -> Dict[str, str]:
+        """Append citations to several reports using one batched citation query.
+
+        Parameters
+        ----------
+        reports : Dict[str, str]
+            Report type (``vendor``, ``pestle``, ``porters``, ``swot``, ``rfp``,
+            ``combined``) -> markdown generated with ``cite=False``
+
+        Returns
+        -------
+        Dict[str, str]
+            The same reports with References sections appended
+        """
+        citations = self.citation_matcher.find_citations_for_sections(
+            reports,
+            n_results_per_claim=2,
+            max_total_citations={name: CITATION_LIMITS.get(name, 8) for name in reports},
+        )
+        if len(reports) <= 1:
+            return {name: self._with_references(content, citations[name]) for name, content in reports.items()}
+        # Each References section is its own LM call; format them concurrently, each
+        # with its own copy of the formatter so no predictor is shared across threads
+        with ThreadPoolExecutor(max_workers=len(reports), thread_name_prefix="references") as pool:
+            futures = {
+                name: submit_with_context(
+                    pool, self._with_references, content, citations[name], self.citation_formatter.deepcopy()
+                )
+                for name, content in reports.items()
+            }
+        return {name: future.result() for name, future in futures.items()}
+
+    def generate_vendor_report(self, vendor_list: List[Any], category: str, region: str, cite: bool = True) -> str:
         """Generate vendor discovery report with citations."""
         with dspy.context(lm=self.model):
             result = self.vendor_gen(vendor_list=vendor_list, category=category, region=region)
 
         # Append citations post-hoc
-        content_with_citations = self._append_citations(result.markdown, "vendor", n_results=10)
+        if not cite:
+            return result.markdown
+        content_with_citations = self._append_citations(result.markdown, "vendor", n_results=CITATION_LIMITS["vendor"])
         return content_with_citations
 
-    def generate_pestle_report(self, pestle_analysis: Any, category: str, region: str) -> str:
+    def generate_pestle_report(self, pestle_analysis: Any, category: str, region: str, cite: bool = True) -> str:
         """Generate PESTLE analysis report with citations."""
         with dspy.context(lm=self.model):
             result = self.pestle_gen(pestle_analysis=pestle_analysis, category=category, region=region)
 
         # Append citations post-hoc
-        content_with_citations = self._append_citations(result.markdown, "pestle", n_results=8)
+        if not cite:
+            return result.markdown
+        content_with_citations = self._append_citations(result.markdown, "pestle", n_results=CITATION_LIMITS["pestle"])
         return content_with_citations
 
-    def generate_porters_report(self, porters_analysis: Any, category: str, region: str) -> str:
+    def generate_porters_report(self, porters_analysis: Any, category: str, region: str, cite: bool = True) -> str:
         """Generate Porter's Five Forces report with citations."""
         with dspy.context(lm=self.model):
             result = self.porters_gen(porters_analysis=porters_analysis, category=category, region=region)
 
         # Append citations post-hoc
-        content_with_citations = self._append_citations(result.markdown, "porters", n_results=8)
+        if not cite:
+            return result.markdown
+        content_with_citations = self._append_citations(result.markdown, "porters", n_results=CITATION_LIMITS["porters"])
         return content_with_citations
 
-    def generate_swot_report(self, swot_analyses: List[Any], category: str, region: str) -> str:
+    def generate_swot_report(self, swot_analyses: List[Any], category: str, region: str, cite: bool = True) -> str:
         """Generate SWOT analyses report with citations."""
         with dspy.context(lm=self.model):
             result = self.swot_gen(swot_analyses=swot_analyses, category=category, region=region)
 
         # Append citations post-hoc
-        content_with_citations = self._append_citations(result.markdown, "swot", n_results=10)
+        if not cite:
+            return result.markdown
+        content_with_citations = self._append_citations(result.markdown, "swot", n_results=CITATION_LIMITS["swot"])
         return content_with_citations
 
-    def generate_rfp_report(self, rfp_question_set: Any, category: str, region: str) -> str:
+    def generate_rfp_report(self, rfp_question_set: Any, category: str, region: str, cite: bool = True) -> str:
         """Generate RFP questions report with citations."""
         with dspy.context(lm=self.model):
             result = self.rfp_gen(rfp_question_set=rfp_question_set, category=category, region=region)
 
         # Append citations post-hoc
-        content_with_citations = self._append_citations(result.markdown, "rfp", n_results=8)
+        if not cite:
+            return result.markdown
+        content_with_citations = self._append_citations(result.markdown, "rfp", n_results=CITATION_LIMITS["rfp"])
         return content_with_citations
 
     def generate_combined_report(
@@ -205,7 +259,7 @@ class ReportGenerator(dspy.Module):
             )
 
         # For combined report, gather citations from all sections
-        content_with_citations = self._append_citations(result.markdown, "combined", n_results=15)
+        content_with_citations = self._append_citations(result.markdown, "combined", n_results=CITATION_LIMITS["combined"])
         return content_with_citations
 
 
@@ -288,42 +342,36 @@ def output_report(
     generator = ReportGenerator(model=writing_model, session_id=session_id)
     generated_files = {}
 
-    # Generate individual reports
-    vendor_content = None
-    pestle_content = None
-    porters_content = None
-    swot_content = None
-    rfp_content = None
-
+    # Generate individual reports, then cite them all with one batched citation query
+    drafts: Dict[str, str] = {}
     if vendor_list:
-        vendor_content = generator.generate_vendor_report(vendor_list, category, region)
-        if save_intermediate:
-            vendor_file = os.path.join(output_dir, "01_vendor_discovery.md")
-            generated_files['vendors'] = save_report(vendor_content, vendor_file)
-
+        drafts['vendor'] = generator.generate_vendor_report(vendor_list, category, region, cite=False)
     if pestle_analysis:
-        pestle_content = generator.generate_pestle_report(pestle_analysis, category, region)
-        if save_intermediate:
-            pestle_file = os.path.join(output_dir, "02_pestle_analysis.md")
-            generated_files['pestle'] = save_report(pestle_content, pestle_file)
-
+        drafts['pestle'] = generator.generate_pestle_report(pestle_analysis, category, region, cite=False)
     if porters_analysis:
-        porters_content = generator.generate_porters_report(porters_analysis, category, region)
-        if save_intermediate:
-            porters_file = os.path.join(output_dir, "03_porters_analysis.md")
-            generated_files['porters'] = save_report(porters_content, porters_file)
-
+        drafts['porters'] = generator.generate_porters_report(porters_analysis, category, region, cite=False)
     if swot_analyses:
-        swot_content = generator.generate_swot_report(swot_analyses, category, region)
-        if save_intermediate:
-            swot_file = os.path.join(output_dir, "04_swot_analyses.md")
-            generated_files['swot'] = save_report(swot_content, swot_file)
-
+        drafts['swot'] = generator.generate_swot_report(swot_analyses, category, region, cite=False)
     if rfp_question_set:
-        rfp_content = generator.generate_rfp_report(rfp_question_set, category, region)
-        if save_intermediate:
-            rfp_file = os.path.join(output_dir, "05_rfp_questions.md")
-            generated_files['rfp'] = save_report(rfp_content, rfp_file)
+        drafts['rfp'] = generator.generate_rfp_report(rfp_question_set, category, region, cite=False)
+    reports = generator.append_citations(drafts) if drafts else {}
+
+    vendor_content = reports.get('vendor')
+    pestle_content = reports.get('pestle')
+    porters_content = reports.get('porters')
+    swot_content = reports.get('swot')
+    rfp_content = reports.get('rfp')
+
+    if save_intermediate:
+        for name, key, filename in (
+            ('vendor', 'vendors', "01_vendor_discovery.md"),
+            ('pestle', 'pestle', "02_pestle_analysis.md"),
+            ('porters', 'porters', "03_porters_analysis.md"),
+            ('swot', 'swot', "04_swot_analyses.md"),
+            ('rfp', 'rfp', "05_rfp_questions.md"),
+        ):
+            if name in reports:
+                generated_files[key] = save_report(reports[name], os.path.join(output_dir, filename))
 
     # Generate combined report
     combined_content = generator.generate_combined_report(
@@ -0,0 +1,244 @@
+"""Local fetch-and-parse page extractor used as a fallback for Tavily Extract."""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+from urllib.parse import urljoin
+
+import httpx
+from bs4 import BeautifulSoup
+
+from config.environment import get_page_fetch_settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (compatible; risenow-research/1.0)"
+
+# Maximum characters of page text kept per URL (matches Tavily extract truncation)
+MAX_PAGE_CHARS = 100000
+
+# Elements that never carry article text
+_STRIP_TAGS = ("script", "style", "noscript", "template", "svg", "iframe", "form", "nav", "footer", "header", "aside")
+
+
+class PageFetchError(RuntimeError):
+    """Raised when a page cannot be fetched or converted to text."""
+
+
+def html_to_text(html: str, base_url: Optional[str] = None) -> Dict[str, Any]:
+    """Convert an HTML document to a title, readable text and absolute links.
+
+    Parameters
+    ----------
+    html : str
+        Raw HTML markup.
+    base_url : str, optional
+        URL the document was served from, used to resolve relative links.
+
+    Returns
+    -------
+    dict
+        ``title``, ``text`` (one line per text block) and ``links``.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    title = soup.title.get_text(" ", strip=True) if soup.title else ""
+
+    for tag in soup(_STRIP_TAGS):
+        tag.decompose()
+
+    links: List[str] = []
+    if base_url:
+        for anchor in soup.find_all("a", href=True):
+            href = anchor["href"].strip()
+            if href and not href.startswith(("#", "mailto:", "javascript:", "tel:")):
+                links.append(urljoin(base_url, href))
+
+    body = soup.body or soup
+    lines = (" ".join(line.split()) for line in body.get_text("\n").splitlines())
+    text = "\n".join(line for line in lines if line).strip()
+    return {"title": title, "text": text, "links": list(dict.fromkeys(links))}
+
+
+class _DomainGate:
+    """Per-domain concurrency cap plus a minimum delay between request starts."""
+
+    def __init__(self, max_concurrent: int, min_interval: float):
+        self.semaphore = threading.BoundedSemaphore(max(1, int(max_concurrent)))
+        self.min_interval = max(0.0, float(min_interval))
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def __enter__(self):
+        self.semaphore.acquire()
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.semaphore.release()
+        return False
+
+
+class PageFetcher:
+    """Concurrent, connection-pooled page fetcher with per-domain politeness.
+
+    Returns results in the same ``{"results": [...], "failed_results": [...]}``
+    shape as Tavily Extract so callers can swap one for the other. Pass a
+    ``transport`` (e.g. ``httpx.MockTransport``) to test without a network.
+
+    Parameters
+    ----------
+    max_workers : int
+        Size of the worker pool used by :meth:`fetch_many`.
+    per_domain : int
+        Maximum concurrent requests to a single host.
+    min_interval : float
+        Minimum seconds between request starts to the same host.
+    timeout : float
+        Per-request timeout in seconds.
+    max_bytes : int
+        Response bodies are read up to this many bytes.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        per_domain: int = 2,
+        min_interval: float = 0.5,
+        timeout: float = 15.0,
+        max_bytes: int = 2 * 1024 * 1024,
+        user_agent: str = DEFAULT_USER_AGENT,
+        transport: Optional[httpx.BaseTransport] = None,
+    ):
+        self.max_workers = max(1, int(max_workers))
+        self.per_domain = max(1, int(per_domain))
+        self.min_interval = max(0.0, float(min_interval))
+        self.max_bytes = max(1, int(max_bytes))
+        self._client = httpx.Client(
+            headers={"User-Agent": user_agent, "Accept": "text/html,application/xhtml+xml,text/plain;q=0.9"},
+            limits=httpx.Limits(
+                max_connections=self.max_workers * 2,
+                max_keepalive_connections=self.max_workers,
+            ),
+            timeout=httpx.Timeout(float(timeout)),
+            follow_redirects=True,
+            transport=transport,
+        )
+        self._gates: Dict[str, _DomainGate] = {}
+        self._gates_lock = threading.Lock()
+
+    def _gate(self, host: str) -> _DomainGate:
+        with self._gates_lock:
+            gate = self._gates.get(host)
+            if gate is None:
+                gate = _DomainGate(self.per_domain, self.min_interval)
+                self._gates[host] = gate
+            return gate
+
+    def _read_body(self, response: httpx.Response) -> bytes:
+        chunks: List[bytes] = []
+        size = 0
+        for chunk in response.iter_bytes():
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= self.max_bytes:
+                break
+        return b"".join(chunks)[: self.max_bytes]
+
+    def fetch(self, url: str) -> Dict[str, Any]:
+        """Fetch one URL and return an extract-style result.
+
+        Raises
+        ------
+        PageFetchError
+            On network errors, non-2xx responses and unsupported content types.
+        """
+        target = url if "://" in url else f"https://{url}"
+        try:
+            host = httpx.URL(target).host
+        except Exception as exc:
+            raise PageFetchError(f"Invalid URL {url!r}: {exc}") from exc
+
+        with self._gate(host):
+            try:
+                with self._client.stream("GET", target) as response:
+                    if response.status_code >= 400:
+                        raise PageFetchError(f"HTTP {response.status_code} for {url}")
+                    content_type = response.headers.get("content-type", "").lower()
+                    if content_type and not any(kind in content_type for kind in ("html", "text/plain", "xml")):
+                        raise PageFetchError(f"Unsupported content type {content_type!r} for {url}")
+                    body = self._read_body(response)
+                    encoding = response.encoding or "utf-8"
+                    final_url = str(response.url)
+            except httpx.HTTPError as exc:
+                raise PageFetchError(f"Failed to fetch {url}: {exc}") from exc
+
+        markup = body.decode(encoding, errors="replace")
+        if "text/plain" in content_type:
+            parsed = {"title": "", "text": markup.strip(), "links": []}
+        else:
+            parsed = html_to_text(markup, base_url=final_url)
+        if not parsed["text"]:
+            raise PageFetchError(f"No readable text at {url}")
+
+        return {
+            "url": url,
+            "final_url": final_url,
+            "title": parsed["title"],
+            "raw_content": parsed["text"][:MAX_PAGE_CHARS],
+            "links": parsed["links"],
+            "source": "local_fetch",
+        }
+
+    def fetch_many(self, urls: List[str]) -> Dict[str, Any]:
+        """Fetch several URLs concurrently on the bounded worker pool."""
+        if not urls:
+            return {"results": [], "failed_results": []}
+
+        workers = min(self.max_workers, len(urls))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="page-fetch") as pool:
+            futures = [pool.submit(self.fetch, url) for url in urls]
+
+        results: List[Dict[str, Any]] = []
+        failed: List[Dict[str, Any]] = []
+        for url, future in zip(urls, futures):
+            try:
+                results.append(future.result())
+            except Exception as exc:
+                logger.info("Local page fetch failed for %s: %s", url, exc)
+                failed.append({"url": url, "error": str(exc)})
+        return {"results": results, "failed_results": failed}
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self._client.close()
+
+
+# Global fetcher instance (singleton pattern)
+_global_fetcher: Optional[PageFetcher] = None
+_global_fetcher_lock = threading.Lock()
+
+
+def get_page_fetcher() -> PageFetcher:
+    """Get or create the process-wide page fetcher."""
+    global _global_fetcher
+    if _global_fetcher is None:
+        with _global_fetcher_lock:
+            if _global_fetcher is None:
+                _global_fetcher = PageFetcher(**get_page_fetch_settings())
+    return _global_fetcher
+
+
+def reset_page_fetcher() -> None:
+    """Close the shared fetcher so the next call builds a fresh pool."""
+    global _global_fetcher
+    with _global_fetcher_lock:
+        if _global_fetcher is not None:
+            _global_fetcher.close()
+        _global_fetcher = None
@@ -0,0 +1,408 @@
+"""Process-wide pooled HTTP clients (sync and asyncio) for the Tavily REST API."""
+
+import asyncio
+import importlib.util
+import logging
+import threading
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from config.environment import TAVILY_API_KEY, get_tavily_http_settings, get_tavily_rate_limit_settings
+from utils.rate_limiter import RequestGovernor
+
+logger = logging.getLogger(__name__)
+
+TAVILY_API_BASE_URL = "https://api.tavily.com"
+
+# HTTP statuses that signal throttling or a transient upstream failure
+_RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+# Slow endpoints get a concurrency window of their own, so crawls cannot hold the slots searches need
+_LONG_RUNNING_ENDPOINTS = frozenset({"/extract", "/crawl"})
+
+
+class TavilyAPIError(RuntimeError):
+    """Raised when the Tavily API returns a non-success response."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def classify_tavily_error(exc: BaseException) -> Tuple[bool, bool, Optional[float]]:
+    """Classify a failed Tavily request as ``(retryable, overloaded, retry_after)``.
+
+    429 and 5xx responses are retried and shrink the concurrency window.
+    Connection-level failures are retried; read timeouts also count as
+    overload but are not retried, since they already cost a full timeout.
+    """
+    if isinstance(exc, TavilyAPIError):
+        retryable = exc.status_code in _RETRYABLE_STATUS
+        return retryable, retryable, exc.retry_after
+    if isinstance(exc, (httpx.ReadTimeout, httpx.WriteTimeout)):
+        return False, True, None
+    if isinstance(exc, httpx.TransportError):
+        return True, isinstance(exc, httpx.PoolTimeout), None
+    return False, False, None
+
+
+class _TavilyClientBase:
+    """Request payloads, error handling and connection-reuse accounting."""
+
+    def __init__(self, api_key: Optional[str], timeout: float, crawl_timeout: float, http2: bool,
+                 governor: Optional[RequestGovernor]):
+        # None routes each endpoint to its shared process-wide governor
+        self.governor = governor
+        self.timeout = float(timeout)
+        self.crawl_timeout = float(crawl_timeout)
+
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requested for Tavily but the 'h2' package is not installed; using HTTP/1.1")
+            http2 = False
+        self.http2 = http2
+
+        self.headers = {"Content-Type": "application/json"}
+        api_key = api_key if api_key is not None else TAVILY_API_KEY
+        if api_key:
+            self.headers["Authorization"] = f"Bearer {api_key}"
+
+        self._stats_lock = threading.Lock()
+        self._requests = 0
+        self._new_connections = 0
+        self._errors = 0
+
+    def _governor_for(self, endpoint: str) -> RequestGovernor:
+        return self.governor if self.governor is not None else get_tavily_governor(endpoint)
+
+    @staticmethod
+    def _limits(max_connections: int, max_keepalive_connections: int, keepalive_expiry: float) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=max(1, int(max_connections)),
+            max_keepalive_connections=max(0, int(max_keepalive_connections)),
+            keepalive_expiry=keepalive_expiry,
+        )
+
+    @staticmethod
+    def _search_payload(query: str, max_results: int, include_answer: bool) -> Dict[str, Any]:
+        return {"query": query, "max_results": max_results, "include_answer": include_answer}
+
+    @staticmethod
+    def _crawl_payload(url: str, max_depth: int, max_pages: int) -> Dict[str, Any]:
+        return {"url": url, "max_depth": max_depth, "max_pages": max_pages}
+
+    @staticmethod
+    def _map_payload(url: str, max_results: int) -> Dict[str, Any]:
+        return {"url": url, "max_results": max_results}
+
+    def _request_started(self) -> None:
+        with self._stats_lock:
+            self._requests += 1
+
+    def _request_failed(self) -> None:
+        with self._stats_lock:
+            self._errors += 1
+
+    def _decode(self, endpoint: str, response: httpx.Response) -> Dict[str, Any]:
+        if response.status_code != 200:
+            self._request_failed()
+            raise TavilyAPIError(
+                f"Tavily {endpoint} returned HTTP {response.status_code}: {_error_detail(response)}",
+                status_code=response.status_code,
+                retry_after=_retry_after(response),
+            )
+        return response.json()
+
+    def _count_connection(self, event_name: str) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            with self._stats_lock:
+                self._new_connections += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return request and connection-reuse counters."""
+        with self._stats_lock:
+            requests = self._requests
+            new_connections = self._new_connections
+            errors = self._errors
+        reused = max(requests - new_connections, 0)
+        return {
+            "requests": requests,
+            "new_connections": new_connections,
+            "reused_connections": reused,
+            "reuse_rate": (reused / requests) if requests else 0.0,
+            "errors": errors,
+            "http2": self.http2,
+        }
+
+
+class TavilyHTTPClient(_TavilyClientBase):
+    """Thread-safe Tavily client backed by a single keep-alive ``httpx`` pool.
+
+    One instance is shared by every tool call in the process so parallel agents
+    reuse warm TLS connections instead of paying a fresh handshake per request.
+    Connection reuse is measured through httpx's ``trace`` extension: a request
+    that does not emit a TCP connect event was served on a pooled connection.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: str = TAVILY_API_BASE_URL,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 60.0,
+        crawl_timeout: float = 150.0,
+        http2: bool = False,
+        transport: Optional[httpx.BaseTransport] = None,
+        governor: Optional[RequestGovernor] = None,
+    ):
+        super().__init__(api_key, timeout, crawl_timeout, http2, governor)
+        self._client = httpx.Client(
+            base_url=base_url,
+            headers=self.headers,
+            limits=self._limits(max_connections, max_keepalive_connections, keepalive_expiry),
+            timeout=httpx.Timeout(self.timeout),
+            http2=self.http2,
+            transport=transport,
+        )
+
+    def search(self, query: str, max_results: int = 20, include_answer: bool = False,
+               timeout: Optional[float] = None) -> Dict[str, Any]:
+        """POST ``/search`` and return the decoded response."""
+        return self.post("/search", self._search_payload(query, max_results, include_answer), timeout=timeout)
+
+    def extract(self, urls: List[str], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """POST ``/extract`` and return the decoded response."""
+        return self.post("/extract", {"urls": list(urls)}, timeout=timeout)
+
+    def crawl(self, url: str, max_depth: int = 1, max_pages: int = 25,
+              timeout: Optional[float] = None) -> Dict[str, Any]:
+        """POST ``/crawl`` and return the decoded response."""
+        return self.post("/crawl", self._crawl_payload(url, max_depth, max_pages),
+                         timeout=self.crawl_timeout if timeout is None else timeout)
+
+    def map(self, url: str, max_results: int = 10, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """POST ``/map`` and return the decoded response."""
+        return self.post("/map", self._map_payload(url, max_results),
+                         timeout=self.crawl_timeout if timeout is None else timeout)
+
+    def post(self, endpoint: str, payload: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Send a JSON POST to the Tavily API, rate limited and retried by the shared governor."""
+        return self._governor_for(endpoint).call(lambda: self._post_once(endpoint, payload, timeout))
+
+    def _post_once(self, endpoint: str, payload: Dict[str, Any], timeout: Optional[float]) -> Dict[str, Any]:
+        self._request_started()
+        try:
+            response = self._client.post(
+                endpoint,
+                json=payload,
+                timeout=self.timeout if timeout is None else timeout,
+                extensions={"trace": self._trace},
+            )
+        except httpx.HTTPError:
+            self._request_failed()
+            raise
+        return self._decode(endpoint, response)
+
+    def _trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        self._count_connection(event_name)
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        self._client.close()
+
+
+class AsyncTavilyHTTPClient(_TavilyClientBase):
+    """Asyncio counterpart of :class:`TavilyHTTPClient` built on ``httpx.AsyncClient``.
+
+    An ``httpx.AsyncClient`` pool is bound to the event loop it first runs on,
+    so :func:`get_async_tavily_client` keeps one instance per running loop.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: str = TAVILY_API_BASE_URL,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 60.0,
+        crawl_timeout: float = 150.0,
+        http2: bool = False,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        governor: Optional[RequestGovernor] = None,
+    ):
+        super().__init__(api_key, timeout, crawl_timeout, http2, governor)
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            headers=self.headers,
+            limits=self._limits(max_connections, max_keepalive_connections, keepalive_expiry),
+            timeout=httpx.Timeout(self.timeout),
+            http2=self.http2,
+            transport=transport,
+        )
+
+    async def search(self, query: str, max_results: int = 20, include_answer: bool = False,
+                     timeout: Optional[float] = None) -> Dict[str, Any]:
+        """POST ``/search`` and return the decoded response."""
+        return await self.post("/search", self._search_payload(query, max_results, include_answer),
+                               timeout=timeout)
+
+    async def extract(self, urls: List[str], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """POST ``/extract`` and return the decoded response."""
+        return await self.post("/extract", {"urls": list(urls)}, timeout=timeout)
+
+    async def crawl(self, url: str, max_depth: int = 1, max_pages: int = 25,
+                    timeout: Optional[float] = None) -> Dict[str, Any]:
+        """POST ``/crawl`` and return the decoded response."""
+        return await self.post("/crawl", self._crawl_payload(url, max_depth, max_pages),
+                               timeout=self.crawl_timeout if timeout is None else timeout)
+
+    async def map(self, url: str, max_results: int = 10, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """POST ``/map`` and return the decoded response."""
+        return await self.post("/map", self._map_payload(url, max_results),
+                               timeout=self.crawl_timeout if timeout is None else timeout)
+
+    async def post(self, endpoint: str, payload: Dict[str, Any],
+                   timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Send a JSON POST to the Tavily API, rate limited and retried by the shared governor."""
+        return await self._governor_for(endpoint).acall(lambda: self._post_once(endpoint, payload, timeout))
+
+    async def _post_once(self, endpoint: str, payload: Dict[str, Any],
+                         timeout: Optional[float]) -> Dict[str, Any]:
+        self._request_started()
+        try:
+            response = await self._client.post(
+                endpoint,
+                json=payload,
+                timeout=self.timeout if timeout is None else timeout,
+                extensions={"trace": self._trace},
+            )
+        except httpx.HTTPError:
+            self._request_failed()
+            raise
+        return self._decode(endpoint, response)
+
+    async def _trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        self._count_connection(event_name)
+
+    async def aclose(self) -> None:
+        """Close every pooled connection."""
+        await self._client.aclose()
+
+
+def _error_detail(response: httpx.Response) -> str:
+    """Extract Tavily's error message from a failed response."""
+    try:
+        body = response.json()
+    except ValueError:
+        return response.text[:200]
+    if isinstance(body, dict):
+        detail = body.get("detail")
+        if isinstance(detail, dict):
+            return str(detail.get("error") or detail)
+        if detail:
+            return str(detail)
+    return str(body)[:200]
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Parse a numeric ``Retry-After`` header, if present."""
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+# Global client instance (singleton pattern)
+_global_governor: Optional[RequestGovernor] = None
+_long_running_governor: Optional[RequestGovernor] = None
+_global_client: Optional[TavilyHTTPClient] = None
+_global_client_lock = threading.Lock()
+_global_governor_lock = threading.Lock()
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncTavilyHTTPClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_tavily_governor(endpoint: Optional[str] = None) -> RequestGovernor:
+    """Get or create the rate limiter shared by every Tavily client in the process.
+
+    ``/extract`` and ``/crawl`` calls are governed by a second concurrency
+    window; both windows draw from the same token bucket.
+    """
+    global _global_governor, _long_running_governor
+    if _global_governor is None:
+        with _global_governor_lock:
+            if _global_governor is None:
+                settings = get_tavily_rate_limit_settings()
+                governor = RequestGovernor(classify=classify_tavily_error, **settings)
+                _long_running_governor = RequestGovernor(
+                    classify=classify_tavily_error,
+                    bucket=governor.bucket,
+                    **settings,
+                )
+                _global_governor = governor
+    if endpoint in _LONG_RUNNING_ENDPOINTS:
+        return _long_running_governor
+    return _global_governor
+
+
+def get_tavily_client() -> TavilyHTTPClient:
+    """Get or create the process-wide Tavily HTTP client."""
+    global _global_client
+    if _global_client is None:
+        with _global_client_lock:
+            if _global_client is None:
+                _global_client = TavilyHTTPClient(**get_tavily_http_settings())
+    return _global_client
+
+
+def reset_tavily_client() -> None:
+    """Close the shared client so the next call builds a fresh pool."""
+    global _global_client
+    with _global_client_lock:
+        if _global_client is not None:
+            _global_client.close()
+        _global_client = None
+
+
+def get_async_tavily_client() -> AsyncTavilyHTTPClient:
+    """Get or create the Tavily async client bound to the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _global_client_lock:
+        client = _async_clients.get(loop)
+        if client is None:
+            client = AsyncTavilyHTTPClient(**get_tavily_http_settings())
+            _async_clients[loop] = client
+    return client
+
+
+def get_tavily_client_stats() -> Dict[str, Any]:
+    """Return connection-reuse statistics aggregated across the shared clients."""
+    with _global_client_lock:
+        clients: List[_TavilyClientBase] = list(_async_clients.values())
+        if _global_client is not None:
+            clients.append(_global_client)
+
+    totals = {"requests": 0, "new_connections": 0, "reused_connections": 0, "errors": 0}
+    http2 = False
+    for client in clients:
+        client_stats = client.stats()
+        for key in totals:
+            totals[key] += client_stats[key]
+        http2 = http2 or client_stats["http2"]
+    requests = totals["requests"]
+    return {
+        **totals,
+        "reuse_rate": (totals["reused_connections"] / requests) if requests else 0.0,
+        "http2": http2,
+        "rate_limit": get_tavily_governor().stats(),
+        "rate_limit_long_running": get_tavily_governor("/crawl").stats(),
+    }
@@ -1,134 +1,128 @@
 """Web search and page fetching tools for the vendor discovery system."""
 
 import logging
-from typing import Iterable, Tuple, List, Dict, Any, Optional, Callable
-import inspect
-from pathlib import Path
-from contextlib import contextmanager
-from contextvars import ContextVar
-
-import httpx
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
-from tavily import TavilyClient
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Tuple, List, Dict, Any, Optional
+
 import dspy
-from config.environment import TAVILY_API_KEY, TAVILY_MAX_EXTRACT_CALLS
+from config.environment import (
+    PAGE_FETCH_FALLBACK_ENABLED,
+    TAVILY_MAX_EXTRACT_CALLS,
+    TAVILY_SEARCH_MANY_CONCURRENCY,
+    TAVILY_SEARCH_MANY_MAX_QUERIES,
+)
 from models.citation import Citation
-from utils.source_logger import get_source_logger
-
-
-logger = logging.getLogger(__name__)
-
-# Optional UI log hook to surface tool activity to a CLI progress view
-TOOL_UI_LOG: Optional[Callable[[str], None]] = None
-
-_extract_call_count_var: ContextVar[int] = ContextVar(
-    "tavily_extract_call_count",
-    default=0,
+from tools._tavily_common import (
+    cache_lookup,
+    cache_store,
+    charge_extract_budget,
+    charge_prefetched_extract,
+    check_extract_budget,
+    claim_prefetched_extracts,
+    ensure_url_list,
+    extract_budget_exhausted,
+    fetch_extract,
+    fetch_pages_locally,
+    fill_failed_extracts,
+    format_search_results,
+    last_search_query_var,
+    log_extract_results,
+    log_search_results,
+    log_site_results,
+    lookup_session_extracts,
+    maybe_prefetch_extracts,
+    merge_extract_response,
+    merge_search_results,
+    normalize_query,
+    normalize_url,
+    prepare_search_queries,
+    rank_extract_response,
+    remember_session_extracts,
+    tavily_flights,
+    ui_log,
+    validate_extract_urls,
 )
-_extract_limit_var: ContextVar[int] = ContextVar(
-    "tavily_extract_limit",
-    default=TAVILY_MAX_EXTRACT_CALLS,
+# Re-exported: budget scopes, cache stats and the UI hook are part of this module's interface
+from tools._tavily_common import (
+    get_extract_prefetch_stats,
+    get_tavily_cache,
+    get_tavily_cache_stats,
+    get_tavily_extract_budget_state,
+    scoped_focus_domain,
+    scoped_tavily_extract_budget,
+    set_tool_ui_log,
 )
+from tools.tavily_client import get_tavily_client
+from utils.response_cache import ResponseCache
+from utils.agent_context import bind_agent
 
 
-@contextmanager
-def scoped_tavily_extract_budget(limit: Optional[int] = None):
-    """Reset the Tavily extract budget for a logical unit of work.
-
-    Parameters
-    ----------
-    limit : int | None
-        Optional override for the number of extract calls permitted in the scope.
-        Defaults to the global ``TAVILY_MAX_EXTRACT_CALLS`` when omitted.
-    """
-
-    normalized_limit = TAVILY_MAX_EXTRACT_CALLS if limit is None else max(0, int(limit))
-    limit_token = _extract_limit_var.set(normalized_limit)
-    count_token = _extract_call_count_var.set(0)
-    try:
-        yield
-    finally:
-        _extract_call_count_var.reset(count_token)
-        _extract_limit_var.reset(limit_token)
-
-
-def get_tavily_extract_budget_state() -> Tuple[int, int]:
-    """Return the (used_calls, remaining_calls) for the active extract budget."""
-
-    limit = max(0, int(_extract_limit_var.get()))
-    used = max(0, int(_extract_call_count_var.get()))
-    return used, max(limit - used, 0)
-
+logger = logging.getLogger(__name__)
 
-def _get_extract_warning_threshold(limit: int) -> int:
-    """Return remaining-call threshold at which we should warn the agent."""
-    if limit <= 0:
-        return 0
-    return min(3, max(1, limit // 5))
 
+def _fetch_search(query: str, max_results: int) -> List[Dict[str, Any]]:
+    """Return formatted Tavily search results, consulting the response cache first."""
+    cache_key = ResponseCache.make_key(normalize_query(query), int(max_results))
+    cached = cache_lookup("tavily_search", cache_key)
+    if cached is not None:
+        return cached
 
-def _format_extract_warning(remaining: int, limit: int) -> str:
-    """Return a human-friendly warning about remaining extract calls."""
-    if remaining <= 0:
-        return (
-            f"⚠️ tavily_extract budget exhausted: no calls remaining out of {limit}. "
-            "Further tavily_extract usage will raise an error."
-        )
+    def _request() -> List[Dict[str, Any]]:
+        r = get_tavily_client().search(query=query, max_results=max_results, include_answer=False)
+        results = format_search_results(r)
+        if results:
+            cache_store("tavily_search", cache_key, results)
+        return results
 
-    return (
-        f"⚠️ tavily_extract budget nearly exhausted: {remaining} call(s) remaining out of {limit}. "
-        "Prefer tavily_search snippets or cache results before extracting again."
-    )
+    results, _ = tavily_flights.do(f"tavily_search:{cache_key}", _request)
+    return results
 
 
-def _normalize_url(url: str) -> str:
-    """Return a normalized representation for caching purposes."""
-    text = (url or "").strip()
-    if not text:
-        return ""
-    candidate = text if "://" in text else f"https://{text}"
-    try:
-        parsed = httpx.URL(candidate)
-    except Exception:  # pragma: no cover - invalid URLs should not crash tools
-        return text.lower()
-    return str(parsed.copy_with(fragment=""))
+def _fetch_crawl(url: str, max_depth: int, max_pages: int) -> Any:
+    """Return a Tavily crawl response, consulting the response cache first."""
+    cache_key = ResponseCache.make_key(normalize_url(url), int(max_depth), int(max_pages))
+    cached = cache_lookup("tavily_crawl", cache_key)
+    if cached is not None:
+        return cached
 
+    def _request() -> Any:
+        resp = get_tavily_client().crawl(url=url, max_depth=max_depth, max_pages=max_pages)
+        if isinstance(resp, dict) and resp.get("results"):
+            cache_store("tavily_crawl", cache_key, resp)
+        return resp
 
-def _domain_from_url(url: str) -> str:
-    normalized = _normalize_url(url)
-    try:
-        return httpx.URL(normalized).host or normalized
-    except Exception:  # pragma: no cover - fall back to normalized when parsing fails
-        return normalized
+    resp, _ = tavily_flights.do(f"tavily_crawl:{cache_key}", _request)
+    return resp
 
 
-def _ensure_url_list(urls) -> list[str]:
-    """Coerce tavily_extract inputs into a list for caching and validation."""
-    if isinstance(urls, str):
-        return [urls]
-    if urls is None:
-        return []
-    if isinstance(urls, Iterable):
-        return [str(u) for u in urls if u]
-    raise TypeError("tavily_extract expects a string or iterable of strings")
+def _fetch_map(url: str, max_results: int) -> Any:
+    """Return a Tavily map response, consulting the response cache first."""
+    cache_key = ResponseCache.make_key(normalize_url(url), int(max_results))
+    cached = cache_lookup("tavily_map", cache_key)
+    if cached is not None:
+        return cached
 
+    def _request() -> Any:
+        resp = get_tavily_client().map(url=url, max_results=max_results)
+        if isinstance(resp, dict) and resp.get("results"):
+            cache_store("tavily_map", cache_key, resp)
+        return resp
 
-def _detect_calling_agent() -> str:
-    """Detect which agent is calling this function using stack inspection."""
-    for frame_info in inspect.stack():
-        filename = frame_info.filename
-        if 'agent' in filename and not filename.endswith('web_tools.py'):
-            # Extract agent name from file path
-            agent_name = Path(filename).stem
-            return agent_name
-    return "unknown"
+    resp, _ = tavily_flights.do(f"tavily_map:{cache_key}", _request)
+    return resp
 
 
-def set_tool_ui_log(callback: Optional[Callable[[str], None]]) -> None:
-    """Set or clear a UI logging callback for tool activity messages."""
-    global TOOL_UI_LOG
-    TOOL_UI_LOG = callback
+def _extract_citations(resp: Any) -> List[Citation]:
+    citations = []
+    if isinstance(resp, dict) and "results" in resp:
+        for result in resp["results"]:
+            if isinstance(result, dict):
+                citations.append(create_citation_from_tavily(
+                    result,
+                    tool_call="tavily_extract",
+                    confidence=0.9  # Extract is more reliable than search
+                ))
+    return citations
 
 
 def search_web(query: str, max_results: int = 20):
@@ -142,33 +136,15 @@ def search_web(query: str, max_results: int = 20):
     Returns:
         List of dictionaries with title, url, and snippet suitable for agent triage
     """
-    if TOOL_UI_LOG:
-        try:
-            TOOL_UI_LOG(f"🔎 Searching the web: '{query}' (max_results={max_results})")
-        except Exception:
-            pass
+    ui_log(f"🔎 Searching the web: '{query}' (max_results={max_results})")
 
-    tav = TavilyClient(api_key=TAVILY_API_KEY)
-    r = tav.search(query=query, max_results=max_results, include_answer=False)
-    results = [{"title": it.get("title",""), "url": it["url"], "snippet": it.get("content","")}
-               for it in r.get("results", [])]
+    results = _fetch_search(query, max_results)
+    last_search_query_var.set(query)
 
     # Log results to flat file
-    if results:
-        source_logger = get_source_logger()
-        agent_name = _detect_calling_agent()
-        source_logger.log_tavily_results(
-            results=results,
-            query=query,
-            tool_name="tavily_search",
-            agent_name=agent_name
-        )
-
-    if TOOL_UI_LOG:
-        try:
-            TOOL_UI_LOG(f"🔎 Search complete: {len(results)} result(s)")
-        except Exception:
-            pass
+    log_search_results(query, results)
+
+    ui_log(f"🔎 Search complete: {len(results)} result(s)")
     return results
 
 
@@ -221,6 +197,7 @@ def tavily_search(query: str, max_results: int = 20, return_citations: bool = Fa
         If return_citations is True, also returns Citation objects.
     """
     results = search_web(query=query, max_results=max_results)
+    maybe_prefetch_extracts(results)
 
     if return_citations:
         citations = [create_citation_from_tavily(r, tool_call="tavily_search") for r in results]
@@ -229,6 +206,55 @@ def tavily_search(query: str, max_results: int = 20, return_citations: bool = Fa
     return results
 
 
+def tavily_search_many(queries: List[str], max_results_per_query: int = 10):
+    """
+    Run several Tavily searches concurrently and merge them into one result list.
+
+    Parameters
+    ----------
+    queries : list[str]
+        Distinct search queries (duplicates are ignored). At most
+        ``TAVILY_SEARCH_MANY_MAX_QUERIES`` per call.
+    max_results_per_query : int, optional
+        Maximum number of results fetched per query (default 10).
+
+    Returns
+    -------
+    dict
+        ``results``: URL-deduplicated records with ``title``, ``url``, ``snippet``
+        and the ``queries`` that found them, interleaved by rank.
+        ``errors``: mapping of query -> error message for failed searches.
+    """
+    query_list = prepare_search_queries(queries)
+    if not query_list:
+        return {"results": [], "errors": {}}
+
+    ui_log(f"🔎 Searching the web: {len(query_list)} queries (max_results={max_results_per_query} each)")
+
+    workers = min(TAVILY_SEARCH_MANY_CONCURRENCY, len(query_list))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tavily-search") as pool:
+        futures = [pool.submit(_fetch_search, query, max_results_per_query) for query in query_list]
+
+    per_query: List[Tuple[str, List[Dict[str, Any]]]] = []
+    errors: Dict[str, str] = {}
+    for query, future in zip(query_list, futures):
+        try:
+            results = future.result()
+        except Exception as exc:
+            logger.warning("tavily_search_many query failed (%s): %s", query, exc)
+            errors[query] = str(exc)
+            continue
+        # Log from the calling thread so agent attribution stays intact
+        log_search_results(query, results)
+        per_query.append((query, results))
+    last_search_query_var.set(" ".join(query_list))
+
+    merged = merge_search_results(per_query)
+    maybe_prefetch_extracts(merged)
+    ui_log(f"🔎 Search complete: {len(merged)} unique result(s) from {len(per_query)} queries")
+    return {"results": merged, "errors": errors}
+
+
 def tavily_extract(urls, return_citations: bool = False):
     f"""
     Extract full text / metadata from one or more URLs via Tavily Extract API.
@@ -250,71 +276,34 @@ def tavily_extract(urls, return_citations: bool = False):
         Each result's content is truncated to 100,000 characters.
         If return_citations is True, also returns Citation objects.
     """
-    url_list = _ensure_url_list(urls)
-    if len(url_list) > 2:
-        raise ValueError(
-            f"❌ tavily_extract received {len(url_list)} URLs, but the maximum is 2 per call.\n\n"
-            f"💡 RECOMMENDATION: Are you sure you need to extract the full content of that many pages? "
-            f"Typically only a few pages are needed. The tool allows a maximum of 2 URLs per call. "
-            f"Try extracting 1-2 most relevant pages first, review the content, then decide if more are needed.\n\n"
-            f"📋 You provided: {url_list}\n"
-            f"✅ SOLUTION: Call tavily_extract with only 2 URLs. "
-            f"prioritize and select the most relevant ones."
-        )
+    response, _ = _run_tavily_extract(urls, return_citations=return_citations)
+    return response
+
+
+def _run_tavily_extract(urls, return_citations: bool = False) -> Tuple[Any, bool]:
+    """Run ``tavily_extract`` and report whether the response was shared.
+
+    The flag is True when an identical extract was already in flight and this
+    caller received a copy of its result instead of calling Tavily itself.
+    """
+    url_list = validate_extract_urls(urls)
     if not url_list:
         if return_citations:
-            return {"results": []}, []
-        return {"results": []}
+            return ({"results": []}, []), False
+        return {"results": []}, False
 
     try:
-        tav = TavilyClient(api_key=TAVILY_API_KEY)
-        resp = tav.extract(urls=url_list)
-
-        # Truncate content for each URL result to 200,000 characters
-        if isinstance(resp, dict):
-            results = resp.get("results")
-            if isinstance(results, list):
-                for item in results:
-                    if isinstance(item, dict):
-                        # Truncate raw_content if present
-                        if "raw_content" in item and item["raw_content"]:
-                            item["raw_content"] = item["raw_content"][:100000]
-                        # Truncate content if present
-                        if "content" in item and item["content"]:
-                            item["content"] = item["content"][:100000]
-
-                # Log extract results to flat file
-                if results:
-                    source_logger = get_source_logger()
-                    agent_name = _detect_calling_agent()
-                    # Convert to same format as search results for consistent logging
-                    formatted_results = []
-                    for item in results:
-                        formatted_results.append({
-                            "title": item.get("title", ""),
-                            "url": item.get("url", ""),
-                            "snippet": item.get("content", "")  # Keep snippet shorter
-                        })
-                    source_logger.log_tavily_results(
-                        results=formatted_results,
-                        query=f"extract:{url_list}",
-                        tool_name="tavily_extract",
-                        agent_name=agent_name
-                    )
+        # Content is truncated to 100,000 characters per URL before caching
+        resp, shared = fetch_extract(url_list)
+
+        # Log extract results to flat file and share them with the rest of the session
+        log_extract_results(url_list, resp)
+        remember_session_extracts(resp)
 
         if return_citations:
-            citations = []
-            if isinstance(resp, dict) and "results" in resp:
-                for result in resp["results"]:
-                    if isinstance(result, dict):
-                        citations.append(create_citation_from_tavily(
-                            result,
-                            tool_call="tavily_extract",
-                            confidence=0.9  # Extract is more reliable than search
-                        ))
-            return resp, citations
+            return (resp, _extract_citations(resp)), shared
 
-        return resp
+        return resp, shared
     except Exception as e:  # pragma: no cover
         raise RuntimeError(f"Tavily extract failed: {e}") from e
 
@@ -338,35 +327,13 @@ def tavily_crawl(url, max_depth: int = 1, max_pages: int = 25):
         Crawl job summary returned by Tavily.
     """
 
-    if TOOL_UI_LOG:
-        try:
-            TOOL_UI_LOG(f"🕷️ Crawling: {url} (depth={max_depth}, max_pages={max_pages})")
-        except Exception:
-            pass
+    ui_log(f"🕷️ Crawling: {url} (depth={max_depth}, max_pages={max_pages})")
 
     try:
-        tav = TavilyClient(api_key=TAVILY_API_KEY)
-        resp = tav.crawl(url=url, max_depth=max_depth, max_pages=max_pages)
+        resp = _fetch_crawl(url, max_depth, max_pages)
 
         # Log crawl results to flat file
-        if resp and isinstance(resp, dict):
-            source_logger = get_source_logger()
-            agent_name = _detect_calling_agent()
-            # Convert crawl results to consistent format
-            if "results" in resp and isinstance(resp["results"], list):
-                formatted_results = []
-                for item in resp["results"]:
-                    formatted_results.append({
-                        "title": item.get("title", ""),
-                        "url": item.get("url", ""),
-                        "snippet": item.get("content", "")[:500] if "content" in item else ""
-                    })
-                source_logger.log_tavily_results(
-                    results=formatted_results,
-                    query=f"crawl:{url}",
-                    tool_name="tavily_crawl",
-                    agent_name=agent_name
-                )
+        log_site_results(resp, url, "tavily_crawl")
 
         return resp
     except Exception as e:  # pragma: no cover
@@ -389,35 +356,13 @@ def tavily_map(url, max_results: int = 10):
     dict
         Map response with nodes/edges describing relationships.
     """
-    if TOOL_UI_LOG:
-        try:
-            TOOL_UI_LOG(f"🗺️ Mapping site: {url} (max_results={max_results})")
-        except Exception:
-            pass
+    ui_log(f"🗺️ Mapping site: {url} (max_results={max_results})")
 
     try:
-        tav = TavilyClient(api_key=TAVILY_API_KEY)
-        resp = tav.map(url=url, max_results=max_results)
+        resp = _fetch_map(url, max_results)
 
         # Log map results to flat file
-        if resp and isinstance(resp, dict):
-            source_logger = get_source_logger()
-            agent_name = _detect_calling_agent()
-            # Convert map results to consistent format
-            if "results" in resp and isinstance(resp["results"], list):
-                formatted_results = []
-                for item in resp["results"]:
-                    formatted_results.append({
-                        "title": item.get("title", ""),
-                        "url": item.get("url", ""),
-                        "snippet": item.get("content", "")[:500] if "content" in item else ""
-                    })
-                source_logger.log_tavily_results(
-                    results=formatted_results,
-                    query=f"map:{url}",
-                    tool_name="tavily_map",
-                    agent_name=agent_name
-                )
+        log_site_results(resp, url, "tavily_map")
 
         return resp
     except Exception as e:  # pragma: no cover
@@ -428,69 +373,42 @@ def tavily_map(url, max_results: int = 10):
 # DSPy tool call guards to limit redundant Tavily usage
 # --------------------------------------------------------------------------- #
 
-def _tool_tavily_extract(urls):
-    url_list = _ensure_url_list(urls)
+def _tool_tavily_extract(urls, query: str = ""):
+    url_list = ensure_url_list(urls)
     if not url_list:
         return {"results": []}
 
-    # Check URL count limit BEFORE checking budget
-    if len(url_list) > 3:
-        raise ValueError(
-            f"❌ tavily_extract received {len(url_list)} URLs, but the maximum is 3 per call.\n\n"
-            f"💡 RECOMMENDATION: Are you sure you need to extract the full content of that many pages? "
-            f"Typically only a few pages are needed. The tool allows a maximum of 3 URLs per call. "
-            f"Try extracting 1-3 most relevant pages first, review the content, then decide if more are needed.\n\n"
-            f"📋 You provided: {url_list}\n"
-            f"✅ SOLUTION: Call tavily_extract with only the first 3 URLs, or better yet, "
-            f"prioritize and select the most relevant ones."
-        )
-
-    limit = _extract_limit_var.get()
-    limit = max(0, int(limit))
-    if limit <= 0:
-        message = (
-            "❌ tavily_extract is disabled because the active extract budget allows 0 calls.\n\n"
-        )
-        logger.error(message)
-        raise RuntimeError(message)
-
-    call_count = _extract_call_count_var.get()
-    if call_count >= limit:
-        message = (
-            f"❌ tavily_extract budget exhausted. Limit of {limit} calls reached for this run.\n\n"
-            "💡 RECOMMENDATION: Reduce extract usage, cache prior results, or increase TAVILY_MAX_EXTRACT_CALLS."
-        )
-        logger.error(message)
-        raise RuntimeError(message)
-
-    threshold = _get_extract_warning_threshold(limit)
-    remaining_before_call = max(limit - call_count, 0)
-    if threshold and remaining_before_call <= threshold:
-        logger.warning(_format_extract_warning(remaining_before_call, limit))
-
-    arg = urls if isinstance(urls, str) else url_list
-    if TOOL_UI_LOG:
-        try:
-            preview = url_list[:3]
-            ellipsis = "" if len(url_list) <= 3 else " …"
-            TOOL_UI_LOG(f"📄 Extracting page(s): {preview}{ellipsis}")
-        except Exception:
-            pass
-
-    response = tavily_extract(arg)
-    updated_count = call_count + 1
-    _extract_call_count_var.set(updated_count)
-    remaining_after_call = max(limit - updated_count, 0)
-    if threshold and remaining_after_call <= threshold:
-        warning_message = _format_extract_warning(remaining_after_call, limit)
-        logger.warning(warning_message)
-        if isinstance(response, dict):
-            warnings = response.setdefault("warnings", [])
-            if isinstance(warnings, list):
-                warnings.append(warning_message)
-            else:
-                response["warnings"] = [warning_message]
-    return response
+    # Pages another agent already extracted this session are free
+    stored, missing = lookup_session_extracts(validate_extract_urls(url_list))
+    if not missing:
+        return rank_extract_response(merge_extract_response(url_list, stored, None), query)
+
+    # Prefetched pages are served before any budget check
+    prefetched, missing = claim_prefetched_extracts(missing)
+    stored.update(prefetched)
+    if not missing:
+        charge_prefetched_extract()
+        return rank_extract_response(merge_extract_response(url_list, stored, None), query)
+
+    # Out of budget: read the pages directly rather than failing the agent step
+    if PAGE_FETCH_FALLBACK_ENABLED and extract_budget_exhausted():
+        response = fetch_pages_locally(missing, "extract budget exhausted")
+        return rank_extract_response(merge_extract_response(url_list, stored, response), query)
+
+    limit, call_count, threshold = check_extract_budget(missing)
+    try:
+        response, shared = _run_tavily_extract(missing)
+    except RuntimeError as exc:
+        if not PAGE_FETCH_FALLBACK_ENABLED:
+            raise
+        logger.warning("Falling back to local page fetch: %s", exc)
+        response = fetch_pages_locally(missing, "Tavily extract failed")
+        return rank_extract_response(merge_extract_response(url_list, stored, response), query)
+
+    response = fill_failed_extracts(response)
+    response = merge_extract_response(url_list, stored, response)
+    response = rank_extract_response(response, query)
+    return charge_extract_budget(response, shared, limit, call_count, threshold)
 
 
 def _tool_tavily_crawl(url: str, max_depth: int = 1, max_pages: int = 25):
@@ -504,37 +422,100 @@ def _tool_tavily_map(url: str, max_results: int = 10):
 
 
 # Create DSPy tools
-def create_dspy_tools():
+def create_dspy_tools(agent_name: Optional[str] = None):
     """
     Create and return DSPy Tool instances for Tavily operations.
 
+    Each tool runs the blocking wrapper when called synchronously (``ReAct.forward``)
+    and an asyncio-native implementation when awaited via ``acall``
+    (``ReAct.aforward``), so agents can also be driven from a shared event loop.
+
+    Parameters
+    ----------
+    agent_name : str | None
+        Agent that owns the tools. When given, every call runs inside
+        :func:`utils.agent_context.agent_scope` so logged sources are
+        attributed to it; otherwise the caller's current scope is used.
+
     Returns
     -------
     tuple[dspy.Tool, ...]
-        (search, extract, crawl, map) tools.
+        (search, search_many, extract, crawl, map) tools.
     """
-    search_tool = dspy.Tool(
-        tavily_search,
+    from tools.async_web_tools import (
+        AsyncCapableTool,
+        _tool_tavily_crawl_async,
+        _tool_tavily_extract_async,
+        _tool_tavily_map_async,
+        _tool_tavily_search_async,
+        tavily_search_many_async,
+    )
+
+    search_tool = AsyncCapableTool(
+        bind_agent(tavily_search, agent_name),
+        bind_agent(_tool_tavily_search_async, agent_name),
         name="tavily_search",
         desc="Tavily web search. provides text snippets from pages. accurate queries should provide all the information you need for your retreival efforts. Args: query:str, max_results:int=20 -> list of results",
     )
-    extract_tool = dspy.Tool(
-        _tool_tavily_extract,
+    search_many_tool = AsyncCapableTool(
+        bind_agent(tavily_search_many, agent_name),
+        bind_agent(tavily_search_many_async, agent_name),
+        name="tavily_search_many",
+        desc=(
+            f"Run up to {TAVILY_SEARCH_MANY_MAX_QUERIES} Tavily searches in parallel and get one merged, URL-deduplicated result list. "
+            "Prefer this over repeated tavily_search calls when you already know several queries (e.g. '<vendor> contact email', '<vendor> revenue'). "
+            "Args: queries:list[str], max_results_per_query:int=10 -> dict(results, errors)"
+        ),
+    )
+    extract_tool = AsyncCapableTool(
+        bind_agent(_tool_tavily_extract, agent_name),
+        bind_agent(_tool_tavily_extract_async, agent_name),
         name="tavily_extract",
         desc=(
             f"Extract page content (budgeted, limit {TAVILY_MAX_EXTRACT_CALLS} calls). "
             "Use sparingly. tavily_search provides text snippets. only use this when search does not provide what you need. "
-            "Args: urls:list[str]|str -> dict"
+            "Returns the page passages most relevant to `query` (defaults to your last search query), so state what you are looking for. "
+            "Args: urls:list[str]|str, query:str='' -> dict(passages, pages)"
         ),
     )
-    crawl_tool = dspy.Tool(
-        _tool_tavily_crawl,
+    crawl_tool = AsyncCapableTool(
+        bind_agent(_tool_tavily_crawl, agent_name),
+        bind_agent(_tool_tavily_crawl_async, agent_name),
         name="tavily_crawl",
         desc="Crawl site. DO NOT USE unless necessary. Args: url:str, max_depth:int=1, max_pages:int=25 -> dict",
     )
-    map_tool = dspy.Tool(
-        _tool_tavily_map,
+    map_tool = AsyncCapableTool(
+        bind_agent(_tool_tavily_map, agent_name),
+        bind_agent(_tool_tavily_map_async, agent_name),
         name="tavily_map",
         desc="Generate site map. DO NOT USE unless necessary. Args: url:str, max_results:int=10 -> dict",
     )
-    return search_tool, extract_tool, crawl_tool, map_tool
+    return search_tool, search_many_tool, extract_tool, crawl_tool, map_tool
+
+
+def describe_missing_tools(agent: dspy.Module, tool_names: Iterable[str]) -> None:
+    """List tools in a loaded ReAct program's instructions when its saved instructions omit them.
+
+    An optimized program restores the instructions it was compiled with, which
+    enumerate only the tools that existed at the time; tools added since
+    (``tavily_search_many``, ``finalize_vendor``) would otherwise be callable
+    but never described to the model.
+
+    Parameters
+    ----------
+    agent : dspy.Module
+        ``dspy.ReAct`` program after ``load``; other modules are left untouched.
+    tool_names : Iterable[str]
+        Tools to describe if the instructions do not already mention them.
+    """
+    react = getattr(agent, "react", None)
+    tools = getattr(agent, "tools", None)
+    if react is None or not tools:
+        return
+    instructions = react.signature.instructions
+    missing = [tools[name] for name in tool_names if name in tools and name not in instructions]
+    if not missing:
+        return
+    react.signature = react.signature.with_instructions(
+        instructions + "".join(f"\nAlso available: {tool}" for tool in missing)
+    )
@@ -0,0 +1,67 @@
+"""Context-propagated identity of the agent currently driving tool calls."""
+
+import contextvars
+import functools
+import inspect
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, Optional
+
+UNKNOWN_AGENT = "unknown"
+
+_current_agent_var: ContextVar[str] = ContextVar("current_agent", default=UNKNOWN_AGENT)
+
+
+def get_current_agent() -> str:
+    """Return the name of the agent running in this context (``"unknown"`` if unset)."""
+    return _current_agent_var.get()
+
+
+@contextmanager
+def agent_scope(agent_name: Optional[str]) -> Iterator[None]:
+    """Attribute tool calls made inside the block to ``agent_name``.
+
+    The identity is a ``ContextVar``, so it follows ``asyncio`` tasks and
+    ``asyncio.to_thread`` automatically; use :func:`submit_with_context` for
+    ``concurrent.futures`` pools. A falsy name leaves the current identity as is.
+    """
+    if not agent_name:
+        yield
+        return
+    token = _current_agent_var.set(agent_name)
+    try:
+        yield
+    finally:
+        _current_agent_var.reset(token)
+
+
+def submit_with_context(executor: Executor, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+    """``executor.submit`` that runs ``fn`` in a copy of the caller's context."""
+    ctx = contextvars.copy_context()
+    return executor.submit(ctx.run, fn, *args, **kwargs)
+
+
+def bind_agent(fn: Callable[..., Any], agent_name: Optional[str]) -> Callable[..., Any]:
+    """Wrap a tool function (sync or async) so each call runs inside :func:`agent_scope`.
+
+    The wrapper keeps ``fn``'s signature and annotations, so ``dspy.Tool``
+    still infers the same argument schema.
+    """
+    if not agent_name:
+        return fn
+
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def _async_bound(*args: Any, **kwargs: Any) -> Any:
+            with agent_scope(agent_name):
+                return await fn(*args, **kwargs)
+
+        return _async_bound
+
+    @functools.wraps(fn)
+    def _bound(*args: Any, **kwargs: Any) -> Any:
+        with agent_scope(agent_name):
+            return fn(*args, **kwargs)
+
+    return _bound
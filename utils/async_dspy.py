@@ -30,6 +30,28 @@ async def run_agent_async(
         raise
 
 
+async def run_agent_native_async(
+    agent: dspy.Module,
+    *args,
+    **kwargs
+) -> Any:
+    """
+    Run a DSPy module directly on the current event loop.
+
+    Uses ``Module.acall`` so ReAct agents await their async-capable Tavily
+    tools instead of occupying a worker thread. Falls back to
+    ``run_agent_async`` for callables without an ``acall`` method.
+    """
+    acall = getattr(agent, "acall", None)
+    if acall is None:
+        return await run_agent_async(agent, *args, **kwargs)
+    try:
+        return await acall(*args, **kwargs)
+    except Exception as e:
+        logger.error(f"Error running agent natively async: {e}")
+        raise
+
+
 async def run_agents_parallel(
     tasks: List[Tuple[Callable, tuple, dict]],
     max_concurrent: int = 3,
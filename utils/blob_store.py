@@ -0,0 +1,93 @@
+"""Content-addressed text blob store used to deduplicate logged page bodies."""
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from utils.source_codec import Codec, get_codec, read_text
+
+# Suffixes probed when reading, so blobs stay readable if the codec setting changes
+_BLOB_SUFFIXES = ("", ".gz", ".zst")
+
+logger = logging.getLogger(__name__)
+
+
+class BlobStore:
+    """Store each distinct text once under its SHA-256 digest.
+
+    Blobs live at ``<root>/<digest[:2]>/<digest>.txt``. Writes go through a
+    temporary file and an atomic rename, so a reader never sees a partial blob
+    and concurrent writers of the same content are harmless. With a compressing
+    ``codec`` blobs are stored as ``<digest>.txt.gz`` / ``<digest>.txt.zst``.
+    """
+
+    def __init__(self, root: Path, codec: Optional[Codec] = None):
+        self.root = Path(root)
+        self.codec = codec or get_codec("none")
+        self._lock = threading.Lock()
+        self._written = 0
+        self._bytes_written = 0
+
+    @staticmethod
+    def key_for(text: str) -> str:
+        """Return the content hash used as the blob key."""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def path_for(self, key: str, suffix: Optional[str] = None) -> Path:
+        suffix = self.codec.suffix if suffix is None else suffix
+        return self.root / key[:2] / f"{key}.txt{suffix}"
+
+    def _existing_path(self, key: str) -> Optional[Path]:
+        for suffix in dict.fromkeys((self.codec.suffix,) + _BLOB_SUFFIXES):
+            path = self.path_for(key, suffix)
+            if path.exists():
+                return path
+        return None
+
+    def contains(self, key: str) -> bool:
+        return self._existing_path(key) is not None
+
+    def put(self, text: str, key: Optional[str] = None) -> str:
+        """Write ``text`` unless a blob with the same content already exists."""
+        key = key or self.key_for(text)
+        if self.contains(key):
+            return key
+
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = self.codec.compress(text.encode("utf-8"))
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        with self._lock:
+            self._written += 1
+            self._bytes_written += len(data)
+        return key
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the blob text, or ``None`` if it is missing."""
+        path = self._existing_path(key)
+        if path is None:
+            return None
+        try:
+            return read_text(path)
+        except (OSError, EOFError, UnicodeDecodeError) as exc:
+            logger.warning("Unreadable source blob %s: %s", path, exc)
+            return None
+
+    def stats(self) -> Dict[str, int]:
+        """Return how many blobs and (on-disk) bytes this instance has written."""
+        with self._lock:
+            return {"blobs_written": self._written, "bytes_written": self._bytes_written}
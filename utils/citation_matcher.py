@@ -1,8 +1,34 @@
-"""Load flat file sources into ChromaDB for vector similarity matching."""
+"""Load flat file sources into a vector index (ChromaDB or local) for citation matching."""
 
-from typing import List, Dict, Optional
+from typing import Any, Callable, List, Dict, Mapping, Optional, Tuple, Union
+import bisect
 import logging
+import math
 import os
+import queue
+import re
+import threading
+from pathlib import Path
+
+from config.environment import (
+    CITATION_CHUNK_OVERLAP_TOKENS,
+    CITATION_CHUNK_TOKENS,
+    CITATION_DEDUP_ENABLED,
+    CITATION_DEDUP_THRESHOLD,
+    CITATION_EMBED_BATCH_CHARS,
+    CITATION_EMBED_BATCH_SIZE,
+    CITATION_EMBEDDING_MODEL,
+    CITATION_HYBRID_WEIGHT,
+    CITATION_INDEX_DIR,
+    CITATION_MAX_CHUNKS_PER_SOURCE,
+    CITATION_VECTOR_BACKEND,
+    get_embedding_cache_settings,
+)
+from utils.embedding_cache import CachedEmbeddingFunction
+from utils.response_cache import ResponseCache
+from utils.near_duplicates import NearDuplicateIndex
+from utils.passage_ranker import chunk_passages
+from utils.vector_index import DSPyEmbeddingFunction, LocalVectorClient
 
 try:
     import chromadb
@@ -16,32 +42,86 @@ else:
 
 logger = logging.getLogger(__name__)
 
+# Process-wide embedding cache (singleton pattern)
+_embedding_cache: Optional[ResponseCache] = None
+_embedding_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> Optional[ResponseCache]:
+    """Return the shared embedding cache, or None when caching is disabled."""
+    global _embedding_cache
+    settings = get_embedding_cache_settings()
+    if not settings["enabled"]:
+        return None
+    if _embedding_cache is None:
+        with _embedding_cache_lock:
+            if _embedding_cache is None:
+                try:
+                    _embedding_cache = ResponseCache(
+                        settings["path"],
+                        max_bytes=settings["max_bytes"],
+                        default_ttl=math.inf,
+                    )
+                except Exception as exc:  # pragma: no cover - cache must never break citations
+                    logger.warning("Embedding cache unavailable: %s", exc)
+                    return None
+    return _embedding_cache
+
+
+def get_embedding_cache_stats() -> Dict[str, Any]:
+    """Return hit/miss counters for the embedding cache."""
+    cache = get_embedding_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
 
 class CitationMatcher:
-    """Load flat files into ChromaDB for vector similarity matching."""
+    """Load flat files into a vector index for similarity matching.
+
+    Uses ChromaDB Cloud when credentials are configured, otherwise a persistent
+    local :class:`~utils.vector_index.LocalVectorIndex` under
+    ``CITATION_INDEX_DIR`` (set ``CITATION_VECTOR_BACKEND=chroma`` for the old
+    ephemeral Chroma client).
+
+    One matcher is shared by every report of a run: loading and vector
+    queries are serialized, so concurrent report stages may call it.
+    """
 
     def __init__(self, session_id: str):
         self.session_id = session_id
 
         self.collection = None
         self._loaded = False
+        self._load_lock = threading.Lock()
+        self._query_lock = threading.Lock()
         self.client = None
         self.embedding_fn = None
-        self._chromadb_available = chromadb is not None
+        self._indexer: Optional["BackgroundSourceIndexer"] = None
+        self._available = True
+        self._persistent_index = False
 
-        if not self._chromadb_available:
-            logger.warning(
-                "ChromaDB not installed; citation matching disabled. Install chromadb to enable."
-                + (f" ({_CHROMADB_IMPORT_ERROR})" if _CHROMADB_IMPORT_ERROR else "")
-            )
-            return
+        # Near-duplicate sources are embedded once; provenance of every copy is kept per parent ID
+        self._near_duplicates = NearDuplicateIndex(CITATION_DEDUP_THRESHOLD) if CITATION_DEDUP_ENABLED else None
+        self._provenance: Dict[str, List[Dict[str, str]]] = {}
+        self._url_parents: Dict[str, Tuple[str, int]] = {}
+        self._provenance_lock = threading.Lock()
+        self.duplicates_collapsed = 0
 
         # Get ChromaDB Cloud credentials from environment
         api_key = os.getenv('CHROMADB_API_KEY')
         tenant = os.getenv('CHROMADB_TENANT')
         database = os.getenv('CHROMADB_DATABASE', 'sourcing-agent')
+        backend = CITATION_VECTOR_BACKEND
+
+        if backend == "chroma" and chromadb is None:
+            logger.warning(
+                "ChromaDB not installed; using the local vector index for citation matching."
+                + (f" ({_CHROMADB_IMPORT_ERROR})" if _CHROMADB_IMPORT_ERROR else "")
+            )
+            backend = "local"
 
-        if api_key and tenant:
+        if chromadb is not None and backend != "local" and api_key and tenant:
             # Use ChromaDB Cloud client if credentials are provided
             self.client = chromadb.CloudClient(
                 api_key=api_key,
@@ -50,32 +130,54 @@ class CitationMatcher:
             )
             # Use default embedding function (ChromaDB Cloud handles embeddings)
             self.embedding_fn = embedding_functions.DefaultEmbeddingFunction()
-        else:
-            # Fall back to ephemeral local client
+        elif chromadb is not None and backend == "chroma":
+            # Explicitly requested: ephemeral local Chroma client
             logger.warning("ChromaDB Cloud credentials not found, using local ephemeral client")
             self.client = chromadb.Client()
             # Use default embedding function
             self.embedding_fn = embedding_functions.DefaultEmbeddingFunction()
-
-    def load_from_flat_files(self):
-        """Load sources from flat files into ChromaDB."""
-        if not self._chromadb_available:
-            return
-
-        if self._loaded:
-            return  # Already loaded
-
-        # Read all sources from flat files
-        from utils.source_logger import SourceLogger
-        source_logger = SourceLogger(self.session_id)
-        sources = source_logger.read_all_sources()
-
-        if not sources:
-            logger.warning(f"No sources found for session {self.session_id}")
+        else:
+            # Persistent on-disk NumPy index; reopening a session reuses its vectors
+            try:
+                self.embedding_fn = self._local_embedding_function()
+            except Exception as exc:
+                logger.warning(f"No embedding model available; citation matching disabled ({exc})")
+                self._available = False
+                return
+            self.client = LocalVectorClient(Path(CITATION_INDEX_DIR), hybrid_weight=CITATION_HYBRID_WEIGHT)
+            self._persistent_index = True
+
+        # Passages embedded by any earlier session are served from disk instead of the model
+        cache = get_embedding_cache()
+        if cache is not None:
+            self.embedding_fn = CachedEmbeddingFunction(self.embedding_fn, cache)
+
+    @staticmethod
+    def _local_embedding_function():
+        """Chroma's bundled local embedder when installed, else a hosted model through ``dspy.Embedder``."""
+        if embedding_functions is not None:
+            return embedding_functions.DefaultEmbeddingFunction()
+        return DSPyEmbeddingFunction(CITATION_EMBEDDING_MODEL)
+
+    def _source_logger(self):
+        """Return the live logger for this session (so queued writes are flushed), or a reader for it."""
+        from utils.source_logger import SourceLogger, get_source_logger
+        source_logger = get_source_logger()
+        if source_logger.session_id != self.session_id:
+            source_logger = SourceLogger(self.session_id)
+        return source_logger
+
+    def _create_collection(self) -> None:
+        """(Re)create this session's ChromaDB collection."""
+        collection_name = f"session_{self.session_id}"
+        if self._persistent_index:
+            # Upserts skip unchanged documents, so keep what earlier runs already embedded
+            self.collection = self.client.get_or_create_collection(
+                name=collection_name,
+                embedding_function=self.embedding_fn
+            )
             return
 
-        # Create ChromaDB collection
-        collection_name = f"session_{self.session_id}"
         # Delete if exists (for fresh reload)
         try:
             self.client.delete_collection(collection_name)
@@ -87,49 +189,175 @@ class CitationMatcher:
             embedding_function=self.embedding_fn
         )
 
-        # Prepare data for ChromaDB
-        documents = []
-        metadatas = []
-        ids = []
-
-        for i, source in enumerate(sources):
-            # Skip sources without content
-            content = source.get('content', '').strip()
-            if not content:
-                continue
+    @staticmethod
+    def _source_documents(source: Dict) -> List[Tuple[str, Dict, str]]:
+        """Return ``(document, metadata, id)`` for each passage of a logged source.
 
-            # Combine title + content for embedding
-            title = source.get('title', '')
-            doc_text = f"{title}\n{content}"
-            documents.append(doc_text)
+        Long content is split into overlapping passages so each embedding
+        covers text the model actually reads; every passage carries its
+        parent source's URL and ID. Sources without content yield nothing.
+        """
+        # Skip sources without content
+        content = (source.get('content') or '').strip()
+        if not content:
+            return []
 
-            metadatas.append({
+        title = source.get('title', '')
+        parent_id = f"source_{source['source_id']:05d}"
+        passages = chunk_passages(content, CITATION_CHUNK_TOKENS, CITATION_CHUNK_OVERLAP_TOKENS)
+        passages = passages[:CITATION_MAX_CHUNKS_PER_SOURCE]
+        entries = []
+        for index, passage in enumerate(passages):
+            metadata = {
                 'url': source.get('url', ''),
                 'title': title,
                 'agent': source.get('agent', 'unknown'),
                 'tool': source.get('tool', 'unknown'),
                 'query': source.get('query', ''),
-                'timestamp': source.get('timestamp', '')
-            })
+                'timestamp': source.get('timestamp', ''),
+                'parent_id': parent_id,
+                'chunk': index,
+                'chunks': len(passages),
+            }
+            # Combine title + passage for embedding
+            entries.append((f"{title}\n{passage}", metadata, f"{parent_id}_{index:03d}"))
+        return entries
+
+    def _admit_source(self, source: Dict) -> bool:
+        """Return True if ``source`` should be embedded, False if it repeats an indexed source.
+
+        A source is a repeat when the same URL was already indexed with at
+        least as much content (a snippet after the extract), or when its
+        content near-duplicates another source (syndicated copies, the same
+        page fetched by several agents). Either way its agent, tool, query
+        and URL are recorded against the indexed source, so citations can
+        report everyone who found it.
+        """
+        content = (source.get('content') or '').strip()
+        if not content:
+            return False
+
+        parent_id = f"source_{source['source_id']:05d}"
+        url = source.get('url', '')
+        found = {
+            'agent': source.get('agent', 'unknown'),
+            'tool': source.get('tool', 'unknown'),
+            'query': source.get('query', ''),
+            'url': url,
+        }
+
+        canonical = None
+        if self._near_duplicates is not None:
+            with self._provenance_lock:
+                indexed = self._url_parents.get(url) if url else None
+            if indexed is not None and indexed[1] >= len(content):
+                canonical = indexed[0]
+            else:
+                canonical = self._near_duplicates.add(parent_id, content)
+
+        with self._provenance_lock:
+            if canonical is not None:
+                self._provenance.setdefault(canonical, []).append(found)
+                self.duplicates_collapsed += 1
+                return False
+            self._provenance[parent_id] = [found]
+            if url and len(content) > self._url_parents.get(url, ('', -1))[1]:
+                self._url_parents[url] = (parent_id, len(content))
+        return True
+
+    def _provenance_fields(self, parent_id: str) -> Dict[str, List[str]]:
+        """Agents, queries and URLs of every logged copy of an indexed source."""
+        with self._provenance_lock:
+            found = list(self._provenance.get(parent_id, ()))
+        return {
+            'found_by': list(dict.fromkeys(entry['agent'] for entry in found)),
+            'queries': list(dict.fromkeys(entry['query'] for entry in found if entry['query'])),
+            'urls': list(dict.fromkeys(entry['url'] for entry in found if entry['url'])),
+        }
+
+    def start_background_indexing(self, source_logger=None) -> bool:
+        """Embed sources into the collection as they are logged, instead of all at once later.
 
-            ids.append(f"source_{i:05d}")
+        Parameters
+        ----------
+        source_logger : SourceLogger, optional
+            Logger to subscribe to; defaults to the logger for this session.
 
-        if not documents:
-            logger.warning(f"No valid documents to index for session {self.session_id}")
+        Returns
+        -------
+        bool
+            False if ChromaDB is unavailable and nothing was started.
+        """
+        if not self._available:
+            return False
+        if self._indexer is not None:
+            return True
+
+        self._create_collection()
+        self._indexer = BackgroundSourceIndexer(self, source_logger or self._source_logger())
+        self._indexer.start()
+        return True
+
+    def stop_background_indexing(self, timeout: Optional[float] = 30.0) -> None:
+        """Index what is already queued, then unsubscribe and stop the indexer thread."""
+        if self._indexer is not None:
+            self._indexer.stop(timeout)
+
+    def load_from_flat_files(self):
+        """Load sources from flat files into ChromaDB."""
+        if not self._available:
             return
 
-        # Batch insert into ChromaDB
-        batch_size = 100
-        for i in range(0, len(documents), batch_size):
-            end_idx = min(i + batch_size, len(documents))
-            self.collection.add(
-                documents=documents[i:end_idx],
-                metadatas=metadatas[i:end_idx],
-                ids=ids[i:end_idx]
+        if self._loaded:
+            return  # Already loaded
+
+        # Reports are rendered concurrently; the first caller loads, the rest wait for it
+        with self._load_lock:
+            if not self._loaded:
+                self._load_sources()
+
+    def _load_sources(self) -> None:
+        """Build the collection from the session's logged sources (or wait for the indexer)."""
+        if self._indexer is not None:
+            # Sources are embedded as they are logged; just wait for the backlog to drain
+            self._indexer.wait_until_idle()
+            self._loaded = True
+            logger.info(
+                f"Citation index ready with {self._indexer.indexed} passages (background indexing, "
+                f"{self.duplicates_collapsed} near-duplicate sources collapsed)"
             )
+            return
+
+        source_logger = self._source_logger()
+        self._create_collection()
+
+        # Embed in size-bucketed batches so only a few batches are held in memory
+        total_sources = 0
+        batcher = EmbeddingBatcher(
+            lambda documents, metadatas, ids: self.collection.add(documents=documents, metadatas=metadatas, ids=ids)
+        )
+        for source in source_logger.iter_sources():
+            total_sources += 1
+            if not self._admit_source(source):
+                continue
+            for entry in self._source_documents(source):
+                batcher.add(*entry)
+        batcher.flush()
+        total_documents = batcher.written
+
+        if not total_documents:
+            if total_sources:
+                logger.warning(f"No valid documents to index for session {self.session_id}")
+            else:
+                logger.warning(f"No sources found for session {self.session_id}")
+            self.collection = None
+            return
 
         self._loaded = True
-        logger.info(f"Loaded {len(documents)} sources into ChromaDB for citation matching")
+        logger.info(
+            f"Loaded {total_documents} passages from {total_sources} sources for citation matching "
+            f"({self.duplicates_collapsed} near-duplicate sources collapsed)"
+        )
 
     def find_citations(self, text: str, n_results: int = 5) -> List[Dict]:
         """Find most relevant citations for given text.
@@ -146,43 +374,80 @@ class CitationMatcher:
         List[Dict]
             List of citations with url, title, agent, and similarity score
         """
+        return self.find_citations_batch([text], n_results)[0]
+
+    def find_citations_batch(self, texts: List[str], n_results: int = 5) -> List[List[Dict]]:
+        """Find citations for several texts with a single embedding and search round-trip.
+
+        While background indexing is running, every call first waits for the
+        sources logged so far to be embedded, so lookups never miss them.
+
+        Parameters
+        ----------
+        texts : List[str]
+            Texts to find citations for; blank entries get no citations
+        n_results : int
+            Number of citations to return per text
+
+        Returns
+        -------
+        List[List[Dict]]
+            One citation list per input text, in input order
+        """
+        batches: List[List[Dict]] = [[] for _ in texts]
+        if self._indexer is not None:
+            # Sources logged since the index first loaded may still be queued for embedding
+            self._indexer.wait_until_idle()
         if not self._loaded:
             self.load_from_flat_files()
 
-        if not self._chromadb_available or not self.collection:
-            return []
+        if not self._available or not self.collection:
+            return batches
 
         # Handle empty text
-        if not text or not text.strip():
-            return []
+        positions = [i for i, text in enumerate(texts) if text and text.strip()]
+        if not positions:
+            return batches
 
         try:
-            # Search for similar content
-            results = self.collection.query(
-                query_texts=[text],
-                n_results=n_results
-            )
-
-            # Format as citation list
-            citations = []
-            if results['ids'] and results['ids'][0]:
-                for i in range(len(results['ids'][0])):
-                    # Get metadata for this result
-                    metadata = results['metadatas'][0][i] if results['metadatas'][0] else {}
-
-                    citations.append({
-                        'url': metadata.get('url', ''),
-                        'title': metadata.get('title', ''),
-                        'agent': metadata.get('agent', 'unknown'),
-                        'tool': metadata.get('tool', 'unknown'),
-                        'similarity': 1.0 - results['distances'][0][i]  # Convert distance to similarity
-                    })
-
-            return citations
-
+            # Search for similar content for every text at once; sources are chunked,
+            # so over-fetch and keep the best passage per URL
+            with self._query_lock:
+                results = self.collection.query(
+                    query_texts=[texts[i] for i in positions],
+                    n_results=n_results * 3
+                )
         except Exception as e:
             logger.error(f"Error finding citations: {e}")
-            return []
+            return batches
+
+        # Format as citation lists
+        ids = results.get('ids') or []
+        metadatas = results.get('metadatas') or []
+        distances = results.get('distances') or []
+        for row, position in enumerate(positions):
+            row_ids = ids[row] if row < len(ids) else []
+            row_meta = metadatas[row] if row < len(metadatas) and metadatas[row] else [{}] * len(row_ids)
+            row_dist = distances[row] if row < len(distances) else [1.0] * len(row_ids)
+            citations = []
+            seen_urls = set()
+            for metadata, distance in zip(row_meta, row_dist):
+                url = metadata.get('url', '')
+                if url and url in seen_urls:
+                    continue
+                seen_urls.add(url)
+                citations.append({
+                    'url': url,
+                    'title': metadata.get('title', ''),
+                    'agent': metadata.get('agent', 'unknown'),
+                    'tool': metadata.get('tool', 'unknown'),
+                    'similarity': 1.0 - distance,  # Convert distance to similarity
+                    **self._provenance_fields(metadata.get('parent_id', '')),
+                })
+                if len(citations) >= n_results:
+                    break
+            batches[position] = citations
+        return batches
 
     def find_citations_for_vendor(self, vendor_name: str, vendor_description: str = "",
                                  n_results: int = 3) -> List[Dict]:
@@ -202,7 +467,7 @@ class CitationMatcher:
         List[Dict]
             List of citations relevant to the vendor
         """
-        if not self._chromadb_available:
+        if not self._available:
             return []
 
         # Combine vendor name and description for better search
@@ -230,13 +495,17 @@ class CitationMatcher:
         List[Dict]
             Deduplicated list of citations for the section
         """
-        if not self._chromadb_available:
-            return []
-
-        import re
-
+        return self.find_citations_for_sections(
+            {section_name: section_text},
+            n_results_per_claim=n_results_per_claim,
+            max_total_citations=max_total_citations,
+        )[section_name]
+
+    @staticmethod
+    def _extract_claims(text: str, max_claims: int = 5) -> List[str]:
+        """Return the first sentences of ``text`` that look like factual claims."""
         # Split into sentences for more focused citation matching
-        sentences = re.split(r'(?<=[.!?])\s+', section_text)
+        sentences = re.split(r'(?<=[.!?])\s+', text or '')
 
         # Filter for sentences that likely need citations
         claims = []
@@ -247,21 +516,201 @@ class CitationMatcher:
                 any(term in sent.lower() for term in
                     ['increase', 'decrease', 'growth', 'report', 'analysis', 'leading', 'major'])):
                 claims.append(sent)
+                if len(claims) >= max_claims:  # Limit claims to avoid too many searches
+                    break
+        return claims
+
+    def find_citations_for_sections(self, sections: Mapping[str, str],
+                                    n_results_per_claim: int = 2,
+                                    max_total_citations: Union[int, Mapping[str, int]] = 10) -> Dict[str, List[Dict]]:
+        """Find citations for many sections (or whole reports) with one batched query.
+
+        Claims from every section are embedded and searched together, then the
+        results are split back per section and URL-deduplicated in claim order.
+
+        Parameters
+        ----------
+        sections : Mapping[str, str]
+            Section name -> section text
+        n_results_per_claim : int
+            Citations per individual claim
+        max_total_citations : int or Mapping[str, int]
+            Maximum citations per section, either one limit for all or per name
 
-        # Find citations for each claim
-        all_citations = []
-        seen_urls = set()
+        Returns
+        -------
+        Dict[str, List[Dict]]
+            Deduplicated citations for each section name
+        """
+        citations: Dict[str, List[Dict]] = {name: [] for name in sections}
+        if not self._available:
+            return citations
 
-        for claim in claims[:5]:  # Limit to first 5 claims to avoid too many searches
-            citations = self.find_citations(claim, n_results_per_claim)
-            for cite in citations:
-                if cite['url'] and cite['url'] not in seen_urls:
-                    all_citations.append(cite)
-                    seen_urls.add(cite['url'])
-                    if len(all_citations) >= max_total_citations:
-                        break
+        claims: List[str] = []
+        owners: List[str] = []
+        for name, text in sections.items():
+            for claim in self._extract_claims(text):
+                claims.append(claim)
+                owners.append(name)
+        if not claims:
+            return citations
 
-            if len(all_citations) >= max_total_citations:
-                break
+        # One embedding + search round-trip for every claim in every section
+        results = self.find_citations_batch(claims, n_results_per_claim)
+
+        seen_urls: Dict[str, set] = {name: set() for name in sections}
+        for name, claim_citations in zip(owners, results):
+            limit = (max_total_citations.get(name, 10)
+                     if isinstance(max_total_citations, Mapping) else max_total_citations)
+            section_citations = citations[name]
+            for cite in claim_citations:
+                if len(section_citations) >= limit:
+                    break
+                if cite['url'] and cite['url'] not in seen_urls[name]:
+                    section_citations.append(cite)
+                    seen_urls[name].add(cite['url'])
+        return citations
+
+
+class EmbeddingBatcher:
+    """Group passages of similar length into embedding calls of predictable size.
+
+    Passages go into length buckets; a bucket is written once it holds
+    ``batch_size`` passages or about ``char_budget`` characters, whichever
+    comes first. Short passages therefore travel in large batches and long
+    ones in small batches, and no call pads short texts to a long one.
+    """
+
+    # Upper bounds (characters) of the length buckets; the last bucket is open-ended
+    _BUCKET_LIMITS = (256, 512, 1024, 2048)
+
+    def __init__(self, write: Callable[[List[str], List[Dict], List[str]], None],
+                 batch_size: int = CITATION_EMBED_BATCH_SIZE,
+                 char_budget: int = CITATION_EMBED_BATCH_CHARS):
+        self._write = write
+        self.batch_size = max(1, int(batch_size))
+        self.char_budget = max(1, int(char_budget))
+        self._buckets: List[List[Tuple[str, Dict, str]]] = [[] for _ in range(len(self._BUCKET_LIMITS) + 1)]
+        self._chars = [0] * len(self._buckets)
+        self.written = 0
+        self.batches = 0
+
+    def add(self, document: str, metadata: Dict, item_id: str) -> None:
+        index = bisect.bisect_left(self._BUCKET_LIMITS, len(document))
+        self._buckets[index].append((document, metadata, item_id))
+        self._chars[index] += len(document)
+        if len(self._buckets[index]) >= self.batch_size or self._chars[index] >= self.char_budget:
+            self._flush_bucket(index)
+
+    def _flush_bucket(self, index: int) -> None:
+        bucket = self._buckets[index]
+        if not bucket:
+            return
+        self._buckets[index] = []
+        self._chars[index] = 0
+        documents, metadatas, ids = (list(column) for column in zip(*bucket))
+        self._write(documents, metadatas, ids)
+        self.written += len(ids)
+        self.batches += 1
+
+    def flush(self) -> None:
+        """Write every partially filled bucket."""
+        for index in range(len(self._buckets)):
+            self._flush_bucket(index)
+
+
+# Queue markers for BackgroundSourceIndexer
+_CATCH_UP = object()
+_STOP = object()
+
+
+class BackgroundSourceIndexer:
+    """Embed and upsert sources into a matcher's collection as the logger writes them.
+
+    Subscribes to :meth:`SourceLogger.add_listener`, so embedding runs on its
+    own thread while the research agents are still working. On start it also
+    catches up on records logged before the subscription; source IDs already
+    indexed are skipped, so overlap between the two paths is free.
+    """
+
+    def __init__(self, matcher: CitationMatcher, source_logger: Any, batch_size: int = CITATION_EMBED_BATCH_SIZE):
+        self.matcher = matcher
+        self.source_logger = source_logger
+        self.batch_size = max(1, int(batch_size))
+        self.indexed = 0
+        self.failed = 0
+        self._seen: set = set()
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        # Subscribe before catching up so no record falls between the two
+        self.source_logger.add_listener(self._on_records)
+        self._queue.put(_CATCH_UP)
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"citation-indexer-{self.matcher.session_id}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _on_records(self, records: List[Dict]) -> None:
+        # Called on the source logger's writer thread: only enqueue
+        self._queue.put(records)
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is _CATCH_UP:
+                batch: List[Dict] = []
+                for source in self.source_logger.iter_sources():
+                    batch.append(source)
+                    if len(batch) >= self.batch_size:
+                        self._upsert(batch)
+                        batch = []
+                self._upsert(batch)
+            else:
+                self._upsert(item)
+
+    def _upsert(self, sources: List[Dict]) -> None:
+        batcher = EmbeddingBatcher(self._write, batch_size=self.batch_size)
+        for source in sources:
+            if source.get('source_id') in self._seen:
+                continue
+            self._seen.add(source.get('source_id'))
+            if not self.matcher._admit_source(source):
+                continue
+            for entry in CitationMatcher._source_documents(source):
+                batcher.add(*entry)
+        batcher.flush()
 
-        return all_citations
+    def _write(self, documents: List[str], metadatas: List[Dict], ids: List[str]) -> None:
+        try:
+            self.matcher.collection.upsert(documents=documents, metadatas=metadatas, ids=ids)
+            self.indexed += len(ids)
+        except Exception as exc:
+            self.failed += len(ids)
+            logger.error(f"Background citation indexing failed for {len(ids)} passages: {exc}")
+
+    def wait_until_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until every record logged so far has been embedded."""
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        # Push queued log records through the writer first, so their listener batches are enqueued
+        self.source_logger.flush(timeout)
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def stop(self, timeout: Optional[float] = 30.0) -> None:
+        """Finish the queued work, then unsubscribe and stop the thread."""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        self.wait_until_idle(timeout)
+        self.source_logger.remove_listener(self._on_records)
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
@@ -0,0 +1,81 @@
+"""Embedding function wrapper that keeps vectors in a persistent :class:`ResponseCache`."""
+
+import logging
+import math
+import sqlite3
+from typing import Any, Callable, List, Optional
+
+import numpy as np
+
+from utils.response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+
+class CachedEmbeddingFunction:
+    """Embedding function that serves repeated texts from a :class:`ResponseCache`.
+
+    Vectors are stored as raw float32 bytes under the ``embeddings:<model>``
+    namespace, keyed by a hash of the exact text, and never expire (they are
+    only dropped by the cache's LRU size bound). Only texts missing from the
+    cache reach the wrapped function, in a single
+    call with duplicates removed. Vectors are returned as a list of float32
+    arrays, which both Chroma collections and
+    :class:`~utils.vector_index.LocalVectorIndex` accept. Other attributes
+    (such as Chroma's ``name()``) are forwarded to the wrapped function.
+
+    Parameters
+    ----------
+    embedding_function : callable
+        Maps a list of texts to a list (or array) of vectors.
+    cache : ResponseCache
+        Where vectors are looked up and stored.
+    model : str, optional
+        Name that scopes cache keys; defaults to the wrapped function's
+        ``model`` attribute or class name, so switching models never serves
+        stale vectors.
+    """
+
+    def __init__(
+        self,
+        embedding_function: Callable[[List[str]], Any],
+        cache: ResponseCache,
+        model: Optional[str] = None,
+    ):
+        self.embedding_function = embedding_function
+        self.cache = cache
+        self.model = model or getattr(embedding_function, "model", None) or type(embedding_function).__name__
+        self.namespace = f"embeddings:{self.model}"
+
+    def __call__(self, input: List[str]) -> List[np.ndarray]:
+        texts = list(input)
+        keys = [self.cache.make_key(text) for text in texts]
+        try:
+            blobs = self.cache.get_many(self.namespace, keys, raw=True)
+        except sqlite3.Error as exc:  # pragma: no cover - the cache must never break embedding
+            logger.warning("Embedding cache lookup failed: %s", exc)
+            blobs = [None] * len(texts)
+        vectors = [None if blob is None else np.frombuffer(blob, dtype=np.float32) for blob in blobs]
+
+        missing = list(dict.fromkeys(text for text, vector in zip(texts, vectors) if vector is None))
+        if missing:
+            embedded = [np.asarray(vector, dtype=np.float32) for vector in self.embedding_function(missing)]
+            if len(embedded) != len(missing):
+                raise ValueError(f"Embedding function returned {len(embedded)} vectors for {len(missing)} texts")
+            try:
+                self.cache.set_many(
+                    self.namespace,
+                    {self.cache.make_key(text): vector.ravel().tobytes() for text, vector in zip(missing, embedded)},
+                    ttl=math.inf,
+                    raw=True,
+                )
+            except sqlite3.Error as exc:  # pragma: no cover
+                logger.warning("Embedding cache store failed: %s", exc)
+            fresh = dict(zip(missing, embedded))
+            vectors = [fresh[text] if vector is None else vector for text, vector in zip(texts, vectors)]
+        return vectors
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "embedding_function":
+            raise AttributeError(name)
+        return getattr(self.embedding_function, name)
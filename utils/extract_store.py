@@ -0,0 +1,66 @@
+"""In-memory store of pages extracted during one pipeline session."""
+
+import copy
+import threading
+from typing import Any, Dict, Iterable, List, Tuple
+
+
+class SessionExtractStore:
+    """Thread-safe map of normalized URL -> extracted page shared by every agent in a session.
+
+    Extract budgets are scoped per agent run, but the pages they pay for are
+    not: once any agent has extracted a URL, later requests for it in the same
+    session are served from here free of charge. Keys are normalized by the
+    caller so the store stays independent of the tool layer.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._items: Dict[str, Dict[str, Any]] = {}
+        self._hits = 0
+        self._misses = 0
+        self._saved_calls = 0
+
+    def lookup(self, keys: Iterable[str]) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+        """Split ``keys`` into stored pages (deep copies) and keys still to fetch."""
+        found: Dict[str, Dict[str, Any]] = {}
+        missing: List[str] = []
+        with self._lock:
+            for key in keys:
+                item = self._items.get(key)
+                if item is None:
+                    missing.append(key)
+                else:
+                    found[key] = item
+            self._hits += len(found)
+            self._misses += len(missing)
+            if found and not missing:
+                self._saved_calls += 1
+        return {key: copy.deepcopy(item) for key, item in found.items()}, missing
+
+    def put(self, key: str, item: Dict[str, Any]) -> None:
+        """Remember an extracted page under its normalized URL."""
+        if not key or not isinstance(item, dict):
+            return
+        with self._lock:
+            self._items[key] = copy.deepcopy(item)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._items
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._items)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return stored page count, per-URL hit/miss counters and extract calls saved."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "pages": len(self._items),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": (self._hits / lookups) if lookups else 0.0,
+                "calls_saved": self._saved_calls,
+            }
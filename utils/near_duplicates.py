@@ -0,0 +1,140 @@
+"""MinHash signatures and an LSH index for spotting near-identical source texts."""
+
+import re
+import threading
+import zlib
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+import numpy as np
+
+_WORD_RE = re.compile(r"\w+")
+
+# Prime just above 2**32; with a < 2**31 and 32-bit x, a * x + b never overflows uint64
+_PRIME = np.uint64((1 << 32) + 15)
+
+# Shingles hashed per pass, to bound the (num_perm, n) working matrix on long pages
+_HASH_CHUNK = 4096
+
+
+def shingle_hashes(text: str, size: int = 5) -> np.ndarray:
+    """Return the distinct 32-bit hashes of the ``size``-word shingles of ``text``.
+
+    Texts shorter than ``size`` words hash as a single shingle; empty text
+    yields an empty array.
+    """
+    words = _WORD_RE.findall(text.lower())
+    if not words:
+        return np.empty(0, dtype=np.uint64)
+    span = min(size, len(words))
+    shingles = {" ".join(words[i:i + span]) for i in range(len(words) - span + 1)}
+    return np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+
+
+class MinHasher:
+    """Fixed family of ``num_perm`` universal hash functions ``(a * x + b) mod p``.
+
+    Two texts' signatures agree in a fraction of positions that estimates the
+    Jaccard similarity of their shingle sets. The family is derived from
+    ``seed``, so signatures are comparable across processes.
+    """
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 5, seed: int = 1):
+        self.num_perm = max(1, int(num_perm))
+        self.shingle_size = max(1, int(shingle_size))
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 1 << 31, size=self.num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 32, size=self.num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """Return the MinHash signature of ``text``, or ``None`` if it has no words."""
+        hashes = shingle_hashes(text, self.shingle_size)
+        if not hashes.size:
+            return None
+        signature = np.full(self.num_perm, np.iinfo(np.uint64).max, dtype=np.uint64)
+        for start in range(0, hashes.size, _HASH_CHUNK):
+            chunk = hashes[start:start + _HASH_CHUNK]
+            permuted = (np.outer(self._a, chunk) + self._b[:, None]) % _PRIME
+            np.minimum(signature, permuted.min(axis=1), out=signature)
+        return signature
+
+
+def _band_layout(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """Pick ``(bands, rows)`` with the highest LSH S-curve midpoint not above ``threshold``.
+
+    Candidates are verified against the full signature, so erring towards
+    extra candidates costs a comparison while erring the other way misses
+    duplicates.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if (1.0 / bands) ** (1.0 / rows) <= threshold:
+            best = (bands, rows)
+    return best
+
+
+class NearDuplicateIndex:
+    """Locality-sensitive hash index that maps each new text to an earlier near-copy.
+
+    Signatures are split into bands; texts sharing any band bucket become
+    candidates, and a candidate counts as a duplicate when the estimated
+    Jaccard similarity reaches ``threshold``. Only texts that are not
+    duplicates are stored, so every key added resolves to a first-seen
+    canonical key.
+
+    Parameters
+    ----------
+    threshold : float
+        Minimum estimated Jaccard similarity of word shingles.
+    num_perm : int
+        Signature length; more permutations give tighter estimates.
+    shingle_size : int
+        Words per shingle.
+    """
+
+    def __init__(self, threshold: float = 0.85, num_perm: int = 128, shingle_size: int = 5):
+        self.threshold = min(1.0, max(0.0, float(threshold)))
+        self.hasher = MinHasher(num_perm, shingle_size)
+        self.bands, self.rows = _band_layout(self.hasher.num_perm, self.threshold)
+        self._buckets: List[Dict[bytes, List[Hashable]]] = [{} for _ in range(self.bands)]
+        self._signatures: Dict[Hashable, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def add(self, key: Hashable, text: str) -> Optional[Hashable]:
+        """Index ``text`` under ``key`` unless it near-duplicates an indexed text.
+
+        Returns
+        -------
+        Hashable or None
+            The canonical key of the most similar indexed text when ``text`` is
+            a near-duplicate (and was not added), else ``None``.
+        """
+        signature = self.hasher.signature(text)
+        if signature is None:
+            return None
+        band_keys = self._band_keys(signature)
+        with self._lock:
+            candidates: Set[Hashable] = set()
+            for bucket, band_key in zip(self._buckets, band_keys):
+                candidates.update(bucket.get(band_key, ()))
+
+            best_key, best_score = None, self.threshold
+            for candidate in candidates:
+                score = float(np.mean(self._signatures[candidate] == signature))
+                if score >= best_score:
+                    best_key, best_score = candidate, score
+            if best_key is not None:
+                return best_key
+
+            self._signatures[key] = signature
+            for bucket, band_key in zip(self._buckets, band_keys):
+                bucket.setdefault(band_key, []).append(key)
+        return None
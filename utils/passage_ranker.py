@@ -0,0 +1,197 @@
+"""Split page text into passages and keep the ones most relevant to a query (BM25)."""
+
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence
+
+# Rough chars-per-token ratio for English prose; good enough for budgeting
+_CHARS_PER_TOKEN = 4
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_LINE_RE = re.compile(r"[\r\n]+")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were "
+    "what when where which who will with".split()
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate the LLM token count of ``text``."""
+    return math.ceil(len(text) / _CHARS_PER_TOKEN) if text else 0
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with common stopwords removed."""
+    return [tok for tok in _TOKEN_RE.findall(text.lower()) if tok not in _STOPWORDS]
+
+
+def _split_long(text: str, max_chars: int) -> List[str]:
+    """Split an over-long paragraph on sentence boundaries, then hard-wrap."""
+    pieces: List[str] = []
+    current = ""
+    for sentence in _SENTENCE_RE.split(text):
+        while len(sentence) > max_chars:
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(sentence[:max_chars])
+            sentence = sentence[max_chars:]
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            pieces.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def chunk_passages(text: str, max_tokens: int = 160, overlap_tokens: int = 0) -> List[str]:
+    """Pack the lines of ``text`` into passages of at most ``max_tokens``.
+
+    Line (paragraph) boundaries are kept where possible so passages stay
+    readable; lines longer than the limit are split on sentences. With
+    ``overlap_tokens`` each passage starts with the tail of the previous one
+    (cut at a word boundary, at most half the passage), so a fact spanning a
+    boundary is still matchable in one piece.
+    """
+    if not text:
+        return []
+    max_chars = max(1, int(max_tokens)) * _CHARS_PER_TOKEN
+    overlap_chars = min(max(0, int(overlap_tokens)) * _CHARS_PER_TOKEN, max_chars // 2)
+    body_chars = max_chars - overlap_chars
+
+    passages: List[str] = []
+    current = ""
+    for paragraph in _LINE_RE.split(text):
+        paragraph = " ".join(paragraph.split())
+        if not paragraph:
+            continue
+        parts = _split_long(paragraph, body_chars) if len(paragraph) > body_chars else [paragraph]
+        for part in parts:
+            if current and len(current) + 1 + len(part) > body_chars:
+                passages.append(current)
+                current = part
+            else:
+                current = f"{current}\n{part}" if current else part
+    if current:
+        passages.append(current)
+
+    if not overlap_chars or len(passages) < 2:
+        return passages
+    overlapped = [passages[0]]
+    for previous, passage in zip(passages, passages[1:]):
+        tail = previous[-overlap_chars:]
+        if len(previous) > overlap_chars:
+            # Drop the partial first word of the tail
+            cut = min((i for i in (tail.find(" "), tail.find("\n")) if i >= 0), default=-1)
+            tail = tail[cut + 1:] if cut >= 0 else tail
+        tail = tail.strip()
+        overlapped.append(f"{tail}\n{passage}" if tail else passage)
+    return overlapped
+
+
+class BM25:
+    """Okapi BM25 over a small, in-memory corpus of passages."""
+
+    def __init__(self, documents: Sequence[str], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._docs = [Counter(tokenize(doc)) for doc in documents]
+        self._lengths = [sum(doc.values()) for doc in self._docs]
+        self._avg_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 0.0
+
+        doc_freq: Counter = Counter()
+        for doc in self._docs:
+            doc_freq.update(doc.keys())
+        n_docs = len(self._docs)
+        self._idf = {
+            term: math.log(1 + (n_docs - freq + 0.5) / (freq + 0.5))
+            for term, freq in doc_freq.items()
+        }
+
+    def scores(self, query: str) -> List[float]:
+        """Return a BM25 score per document for ``query``."""
+        terms = set(tokenize(query))
+        if not terms or not self._docs:
+            return [0.0] * len(self._docs)
+
+        results = []
+        for doc, length in zip(self._docs, self._lengths):
+            norm = self.k1 * (1 - self.b + self.b * (length / self._avg_length if self._avg_length else 0.0))
+            score = 0.0
+            for term in terms:
+                freq = doc.get(term)
+                if freq:
+                    score += self._idf[term] * freq * (self.k1 + 1) / (freq + norm)
+            results.append(score)
+        return results
+
+
+def rank_passages(
+    documents: Sequence[Dict[str, Any]],
+    query: Optional[str],
+    top_k: int = 8,
+    token_budget: int = 2000,
+    passage_tokens: int = 160,
+) -> List[Dict[str, Any]]:
+    """Select the passages across ``documents`` that best answer ``query``.
+
+    Parameters
+    ----------
+    documents : sequence of dict
+        Items with ``url`` and ``text`` (plus an optional ``title``).
+    query : str | None
+        Query or task to rank against. Without one, passages are taken in
+        document order, so the caller still gets each page's opening text.
+    top_k : int
+        Maximum number of passages to return.
+    token_budget : int
+        Approximate token cap for the combined passage text.
+    passage_tokens : int
+        Target passage size used when chunking.
+
+    Returns
+    -------
+    list[dict]
+        ``url``, ``title``, ``passage`` (index within its page), ``score`` and
+        ``text`` for each selected passage, best first.
+    """
+    candidates: List[Dict[str, Any]] = []
+    for doc in documents:
+        for index, text in enumerate(chunk_passages(doc.get("text") or "", passage_tokens)):
+            candidates.append({
+                "url": doc.get("url", ""),
+                "title": doc.get("title", ""),
+                "passage": index,
+                "text": text,
+            })
+    if not candidates:
+        return []
+
+    if query and query.strip():
+        scores = BM25([c["text"] for c in candidates]).scores(query)
+        for candidate, score in zip(candidates, scores):
+            candidate["score"] = round(score, 4)
+        # Stable sort keeps document order among equally scored passages
+        ordered = sorted(candidates, key=lambda c: -c["score"])
+    else:
+        for candidate in candidates:
+            candidate["score"] = 0.0
+        # Round-robin across pages so every page contributes its opening passages
+        ordered = sorted(candidates, key=lambda c: c["passage"])
+
+    selected: List[Dict[str, Any]] = []
+    used_tokens = 0
+    for candidate in ordered:
+        if len(selected) >= top_k:
+            break
+        cost = estimate_tokens(candidate["text"])
+        if selected and used_tokens + cost > token_budget:
+            continue
+        selected.append(candidate)
+        used_tokens += cost
+    return selected
@@ -0,0 +1,229 @@
+"""Declarative stage graph that runs each stage as soon as its dependencies resolve."""
+
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from utils.agent_context import submit_with_context
+
+logger = logging.getLogger(__name__)
+
+# Set by StageGraph.run for the duration of a run; stages and the tasks they
+# submit with submit_with_context inherit it through the copied context.
+_cancel_event_var: ContextVar[Optional[threading.Event]] = ContextVar("pipeline_cancel_event", default=None)
+
+
+class StageError(RuntimeError):
+    """A stage raised; ``stage`` names it and ``__cause__`` holds the original error."""
+
+    def __init__(self, stage: str, error: BaseException):
+        super().__init__(f"Pipeline stage {stage!r} failed: {error}")
+        self.stage = stage
+        self.error = error
+
+
+class StageCancelled(BaseException):
+    """Raised inside a stage once the run it belongs to has been cancelled.
+
+    Derives from :class:`BaseException` so agent loops that report tool
+    exceptions back to the model do not swallow it.
+    """
+
+
+def cancellation_requested() -> bool:
+    """Return True when the pipeline run this code executes in has been cancelled."""
+    event = _cancel_event_var.get()
+    return event is not None and event.is_set()
+
+
+def raise_if_cancelled() -> None:
+    """Raise :class:`StageCancelled` if the enclosing pipeline run has been cancelled.
+
+    Long-running stages and the tools they call use this as a checkpoint;
+    outside a :meth:`StageGraph.run` it never raises.
+    """
+    if cancellation_requested():
+        raise StageCancelled("pipeline run cancelled")
+
+
+class _Stage:
+    """A node of the graph: ``func`` receives each dependency's result as a keyword argument."""
+
+    __slots__ = ("name", "func", "deps", "after")
+
+    def __init__(self, name: str, func: Callable[..., Any], deps: Tuple[str, ...], after: Tuple[str, ...]):
+        self.name = name
+        self.func = func
+        self.deps = deps
+        self.after = after
+
+    @property
+    def prerequisites(self) -> Tuple[str, ...]:
+        return tuple(dict.fromkeys(self.deps + self.after))
+
+
+class StageGraph:
+    """Run named stages concurrently, each one starting the moment its inputs exist.
+
+    Stages are declared with :meth:`add` and run on a thread pool by
+    :meth:`run`. A stage is called with its dependencies' results as keyword
+    arguments named after them, so ``add("swot", run_swot, deps=["vendors"])``
+    calls ``run_swot(vendors=<result of "vendors">)``. There are no phase
+    barriers: wall time is the critical path of the graph. Stages run in a
+    copy of the caller's context, so session and agent scopes carry over.
+
+    The first failing stage stops the run: nothing new is scheduled, queued
+    stages are cancelled and the run's cancellation flag is set, so stages
+    still running stop at their next :func:`raise_if_cancelled` checkpoint.
+    Those stages are joined for up to ``cancel_timeout`` seconds before
+    :class:`StageError` is raised, so no stage outlives the scope (such as a
+    source session) that called :meth:`run`.
+    """
+
+    def __init__(self, max_workers: int = 4, cancel_timeout: float = 60.0):
+        self.max_workers = max(1, int(max_workers))
+        self.cancel_timeout = max(0.0, float(cancel_timeout))
+        self._stages: Dict[str, _Stage] = {}
+        self.timings: Dict[str, Tuple[float, float]] = {}
+
+    def add(self, name: str, func: Callable[..., Any], deps: Iterable[str] = (), after: Iterable[str] = ()) -> None:
+        """Declare stage ``name``; dependencies may be declared before or after it.
+
+        ``after`` lists stages that must finish first without their results
+        being passed in (ordering-only constraints).
+        """
+        if name in self._stages:
+            raise ValueError(f"Stage {name!r} is already defined")
+        self._stages[name] = _Stage(name, func, tuple(dict.fromkeys(deps)), tuple(dict.fromkeys(after)))
+
+    def order(self) -> List[str]:
+        """Return a topological order of the stages, validating the graph."""
+        for stage in self._stages.values():
+            missing = [dep for dep in stage.prerequisites if dep not in self._stages]
+            if missing:
+                raise ValueError(f"Stage {stage.name!r} depends on undefined stages {missing}")
+
+        remaining = {name: set(stage.prerequisites) for name, stage in self._stages.items()}
+        ordered: List[str] = []
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Stage dependencies form a cycle among {sorted(remaining)}")
+            for name in ready:
+                ordered.append(name)
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return ordered
+
+    def run(
+        self,
+        on_complete: Optional[Callable[[str, Any], None]] = None,
+        on_failure: Optional[Callable[[str, BaseException], None]] = None,
+    ) -> Dict[str, Any]:
+        """Execute every stage and return their results by name.
+
+        Parameters
+        ----------
+        on_complete : callable, optional
+            Called as ``on_complete(name, result)`` on the scheduling thread
+            after each stage succeeds.
+        on_failure : callable, optional
+            Called as ``on_failure(name, error)`` on the scheduling thread as
+            soon as the first stage fails, after the cancellation flag is set
+            and before running stages are joined.
+
+        Raises
+        ------
+        StageError
+            If a stage raises.
+        """
+        self.order()
+        results: Dict[str, Any] = {}
+        waiting = {name: set(stage.prerequisites) for name, stage in self._stages.items()}
+        running: Dict[Future, str] = {}
+        started: Dict[str, float] = {}
+        failure: Optional[StageError] = None
+        cancel_event = threading.Event()
+        cancel_token = _cancel_event_var.set(cancel_event)
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pipeline-stage")
+
+        def _schedule() -> None:
+            ready = [name for name, deps in waiting.items() if not deps]
+            for name in ready:
+                del waiting[name]
+                stage = self._stages[name]
+                kwargs = {dep: results[dep] for dep in stage.deps}
+                started[name] = time.monotonic()
+                running[submit_with_context(executor, stage.func, **kwargs)] = name
+
+        clean_exit = False
+        try:
+            _schedule()
+            while running and failure is None:
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    self.timings[name] = (started[name], time.monotonic())
+                    try:
+                        results[name] = future.result()
+                    except Exception as exc:
+                        logger.error("Pipeline stage %s failed: %s", name, exc)
+                        if failure is None:
+                            failure = StageError(name, exc)
+                            failure.__cause__ = exc
+                        continue
+                    if failure is not None:
+                        continue
+                    if on_complete is not None:
+                        on_complete(name, results[name])
+                    for deps in waiting.values():
+                        deps.discard(name)
+                if failure is None:
+                    _schedule()
+            clean_exit = failure is None
+        finally:
+            if not clean_exit:
+                cancel_event.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+            if failure is not None and on_failure is not None:
+                try:
+                    on_failure(failure.stage, failure.error)
+                except Exception as exc:
+                    logger.warning("Pipeline on_failure hook raised: %s", exc)
+            if running:
+                _, still_running = wait(list(running), timeout=self.cancel_timeout)
+                if still_running:
+                    logger.warning(
+                        "Pipeline stages still running %gs after cancellation: %s",
+                        self.cancel_timeout,
+                        sorted(running[future] for future in still_running),
+                    )
+            _cancel_event_var.reset(cancel_token)
+
+        if failure is not None:
+            raise failure
+        return results
+
+    def critical_path(self) -> Tuple[List[str], float]:
+        """Return the chain of stages that bounded the last run's wall time, and its duration.
+
+        Walks back from the stage that finished last, following at each step
+        the dependency that finished last.
+        """
+        if not self.timings:
+            return [], 0.0
+        current = max(self.timings, key=lambda name: self.timings[name][1])
+        path = [current]
+        while True:
+            deps = [dep for dep in self._stages[current].prerequisites if dep in self.timings]
+            if not deps:
+                break
+            current = max(deps, key=lambda name: self.timings[name][1])
+            path.append(current)
+        path.reverse()
+        start = min(begin for begin, _ in self.timings.values())
+        return path, self.timings[path[-1]][1] - start
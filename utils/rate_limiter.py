@@ -0,0 +1,294 @@
+"""Process-wide request governor: token bucket, AIMD concurrency and jittered retries."""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at ``rate`` tokens per second.
+
+    A ``rate`` of ``0`` disables limiting. Callers reserve a token up front and
+    then sleep for the returned delay, so waiting never holds the lock and the
+    same bucket can be shared by threads and event loops alike.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = max(0.0, float(rate))
+        self.capacity = max(1.0, float(burst))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return how long the caller must wait before using it."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1.0
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self) -> None:
+        """Block until a token is available."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        """Await until a token is available."""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class AdaptiveConcurrencyLimiter:
+    """Additive-increase / multiplicative-decrease cap on in-flight requests.
+
+    Every success grows the window by ``1 / limit`` (about one slot per full
+    window of successes); an overload signal halves it, at most once per
+    ``cooldown`` seconds so a burst of failures from one window only counts once.
+
+    The window is shared by threads and event loops: async waiters park on a
+    future of their own loop, which :meth:`release` resolves thread-safely.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 16,
+        decrease_factor: float = 0.5,
+        cooldown: float = 1.0,
+    ):
+        self.min_limit = max(1, int(min_limit))
+        self.max_limit = max(self.min_limit, int(max_limit))
+        self.decrease_factor = float(decrease_factor)
+        self.cooldown = float(cooldown)
+        self._limit = float(min(max(int(initial), self.min_limit), self.max_limit))
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+        self._async_waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    @property
+    def limit(self) -> int:
+        """Current number of requests allowed in flight."""
+        with self._cond:
+            return int(self._limit)
+
+    def try_acquire(self) -> bool:
+        """Take a slot without waiting; return whether one was free."""
+        with self._cond:
+            if self._in_flight < int(self._limit):
+                self._in_flight += 1
+                return True
+            return False
+
+    def acquire(self) -> None:
+        """Block until a slot is free."""
+        with self._cond:
+            while self._in_flight >= int(self._limit):
+                self._cond.wait()
+            self._in_flight += 1
+
+    async def acquire_async(self) -> None:
+        """Await until a slot is free."""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                if self._in_flight < int(self._limit):
+                    self._in_flight += 1
+                    return
+                waiter = loop.create_future()
+                entry = (loop, waiter)
+                self._async_waiters.append(entry)
+            try:
+                await waiter
+            finally:
+                with self._cond:
+                    if entry in self._async_waiters:
+                        self._async_waiters.remove(entry)
+
+    def release(self, outcome: Optional[bool]) -> None:
+        """Free a slot and adapt the window.
+
+        Parameters
+        ----------
+        outcome : bool or None
+            ``True`` for success (additive increase), ``False`` for an overload
+            signal (multiplicative decrease), ``None`` to leave the window as is.
+        """
+        with self._cond:
+            self._in_flight = max(0, self._in_flight - 1)
+            if outcome is True:
+                self._limit = min(float(self.max_limit), self._limit + 1.0 / self._limit)
+            elif outcome is False:
+                now = time.monotonic()
+                if now - self._last_decrease >= self.cooldown:
+                    self._last_decrease = now
+                    self._limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+            self._cond.notify_all()
+            waiters, self._async_waiters = self._async_waiters, []
+        for loop, waiter in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, waiter)
+            except RuntimeError:  # the waiter's loop has closed
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the current window and in-flight count."""
+        with self._cond:
+            return {"limit": int(self._limit), "in_flight": self._in_flight}
+
+
+def _wake(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class RequestGovernor:
+    """Shared rate limit, adaptive concurrency and retry policy for one upstream API.
+
+    Parameters
+    ----------
+    rate, burst : float, int
+        Token-bucket refill rate (requests/second, ``0`` disables) and capacity.
+    min_concurrency, max_concurrency, initial_concurrency : int
+        Bounds and starting point of the AIMD concurrency window.
+    max_retries : int
+        Retries after the first attempt for errors classified as retryable.
+    base_delay, max_delay : float
+        Exponential backoff base and cap (seconds); delays use full jitter.
+    classify : callable, optional
+        Maps an exception to ``(retryable, overloaded, retry_after)``. The
+        default treats every exception as a final, non-overload failure.
+    bucket : TokenBucket, optional
+        Token bucket to share with another governor; ``rate`` and ``burst``
+        are ignored when given.
+    """
+
+    def __init__(
+        self,
+        rate: float = 0.0,
+        burst: int = 1,
+        min_concurrency: int = 1,
+        max_concurrency: int = 16,
+        initial_concurrency: int = 4,
+        max_retries: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 20.0,
+        classify: Optional[Callable[[BaseException], "tuple[bool, bool, Optional[float]]"]] = None,
+        bucket: Optional[TokenBucket] = None,
+    ):
+        self.bucket = bucket if bucket is not None else TokenBucket(rate, burst)
+        self.concurrency = AdaptiveConcurrencyLimiter(
+            initial=initial_concurrency,
+            min_limit=min_concurrency,
+            max_limit=max_concurrency,
+        )
+        self.max_retries = max(0, int(max_retries))
+        self.base_delay = max(0.0, float(base_delay))
+        self.max_delay = max(0.0, float(max_delay))
+        self.classify = classify or (lambda exc: (False, False, None))
+
+        self._stats_lock = threading.Lock()
+        self._attempts = 0
+        self._retries = 0
+        self._throttled = 0
+        self._failures = 0
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Return the full-jitter delay before retry number ``attempt`` (0-based)."""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+        delay = random.uniform(0, ceiling)
+        if retry_after is not None:
+            delay = max(delay, min(float(retry_after), self.max_delay))
+        return delay
+
+    def call(self, fn: Callable[[], Any]) -> Any:
+        """Run ``fn`` under the rate limit and concurrency window, retrying transient errors."""
+        attempt = 0
+        while True:
+            self.bucket.acquire()
+            self.concurrency.acquire()
+            try:
+                result = fn()
+            except Exception as exc:
+                delay = self._on_error(exc, attempt)
+                if delay is None:
+                    raise
+            except BaseException:
+                self.concurrency.release(None)
+                raise
+            else:
+                self.concurrency.release(True)
+                self._count("_attempts")
+                return result
+            time.sleep(delay)
+            attempt += 1
+
+    async def acall(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Async :meth:`call` for a coroutine function."""
+        attempt = 0
+        while True:
+            await self.bucket.acquire_async()
+            await self.concurrency.acquire_async()
+            try:
+                result = await fn()
+            except Exception as exc:
+                delay = self._on_error(exc, attempt)
+                if delay is None:
+                    raise
+            except BaseException:
+                # Cancellation: free the slot without treating it as a signal
+                self.concurrency.release(None)
+                raise
+            else:
+                self.concurrency.release(True)
+                self._count("_attempts")
+                return result
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def _on_error(self, exc: BaseException, attempt: int) -> Optional[float]:
+        """Release the slot for a failed attempt; return the retry delay or ``None`` to give up."""
+        retryable, overloaded, retry_after = self.classify(exc)
+        self.concurrency.release(False if overloaded else None)
+        self._count("_attempts")
+        if overloaded:
+            self._count("_throttled")
+        if not retryable or attempt >= self.max_retries:
+            self._count("_failures")
+            return None
+        delay = self.backoff(attempt, retry_after)
+        self._count("_retries")
+        logger.info(
+            "Retrying after %s (attempt %s/%s, waiting %.2fs)",
+            exc, attempt + 1, self.max_retries, delay,
+        )
+        return delay
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return attempt/retry counters plus the current concurrency window."""
+        with self._stats_lock:
+            counters = {
+                "attempts": self._attempts,
+                "retries": self._retries,
+                "throttled": self._throttled,
+                "failures": self._failures,
+            }
+        return {**counters, "concurrency": self.concurrency.stats(), "rate": self.bucket.rate}
@@ -0,0 +1,286 @@
+"""Persistent, TTL-bounded SQLite cache for web tool responses."""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Keys per ``IN (...)`` lookup, well under SQLite's bound-parameter limit
+_SQL_BATCH = 500
+
+
+class ResponseCache:
+    """On-disk key/value cache with per-namespace TTLs and LRU size eviction.
+
+    Entries are grouped by ``namespace`` (for example the Tavily tool name) so
+    each tool can carry its own time-to-live. Values are stored as JSON blobs.
+    When the total payload exceeds ``max_bytes`` the least recently used
+    entries are evicted until the cache is back under its low-water mark.
+    A TTL of ``math.inf`` keeps entries until they are evicted.
+    """
+
+    _LOW_WATER_RATIO = 0.9
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 512 * 1024 * 1024,
+        default_ttl: float = 24 * 3600,
+        ttls: Optional[Mapping[str, float]] = None,
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max(0, int(max_bytes))
+        self.default_ttl = float(default_ttl)
+        self.ttls: Dict[str, float] = dict(ttls or {})
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_lru ON entries(last_access)")
+        row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        self._total_bytes = int(row[0] or 0)
+
+        self._hits: Dict[str, int] = {}
+        self._misses: Dict[str, int] = {}
+        self._evictions = 0
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Return a stable hash for the given key components."""
+        payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def ttl_for(self, namespace: str) -> float:
+        """Return the configured time-to-live (seconds) for a namespace."""
+        return float(self.ttls.get(namespace, self.default_ttl))
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        """Return the cached value or ``None`` when missing or expired."""
+        return self.get_many(namespace, [key])[0]
+
+    def get_many(self, namespace: str, keys: Sequence[str], raw: bool = False) -> List[Optional[Any]]:
+        """Return the cached value for each key, or ``None`` where missing or expired.
+
+        With ``raw`` the stored bytes are returned as-is instead of being
+        decoded as JSON (for values written with ``set_many(..., raw=True)``).
+        """
+        if not keys:
+            return []
+        now = time.time()
+        found: Dict[str, bytes] = {}
+        with self._lock:
+            unique = list(dict.fromkeys(keys))
+            for start in range(0, len(unique), _SQL_BATCH):
+                chunk = unique[start:start + _SQL_BATCH]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, value, size, expires_at FROM entries WHERE namespace = ? AND key IN ({placeholders})",
+                    (namespace, *chunk),
+                ).fetchall()
+                expired = [(key, int(size)) for key, _, size, expires_at in rows if expires_at <= now]
+                if expired:
+                    self._conn.executemany(
+                        "DELETE FROM entries WHERE namespace = ? AND key = ?",
+                        [(namespace, key) for key, _ in expired],
+                    )
+                    self._total_bytes -= sum(size for _, size in expired)
+                live = {key: value for key, value, _, expires_at in rows if expires_at > now}
+                if live:
+                    self._conn.executemany(
+                        "UPDATE entries SET last_access = ? WHERE namespace = ? AND key = ?",
+                        [(now, namespace, key) for key in live],
+                    )
+                found.update(live)
+            hits = sum(key in found for key in keys)
+            self._hits[namespace] = self._hits.get(namespace, 0) + hits
+            self._misses[namespace] = self._misses.get(namespace, 0) + len(keys) - hits
+
+        if raw:
+            return [found.get(key) for key in keys]
+        decoded: Dict[str, Any] = {}
+        for key, value in found.items():
+            try:
+                decoded[key] = json.loads(value)
+            except (TypeError, ValueError) as exc:
+                logger.warning("Discarding corrupt cache entry %s/%s: %s", namespace, key, exc)
+                self.delete(namespace, key)
+        return [decoded.get(key) for key in keys]
+
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a JSON-serializable value under ``namespace``/``key``."""
+        self.set_many(namespace, {key: value}, ttl)
+
+    def set_many(
+        self,
+        namespace: str,
+        items: Mapping[str, Any],
+        ttl: Optional[float] = None,
+        raw: bool = False,
+    ) -> None:
+        """Store several values under ``namespace`` in one transaction.
+
+        Values are JSON-serialized unless ``raw`` is set, in which case they
+        must be bytes-like and are stored unchanged.
+        """
+        ttl = self.ttl_for(namespace) if ttl is None else float(ttl)
+        if ttl <= 0:
+            return
+
+        rows = []
+        for key, value in items.items():
+            if raw:
+                blob = bytes(value)
+            else:
+                try:
+                    blob = json.dumps(value, ensure_ascii=False).encode("utf-8")
+                except (TypeError, ValueError) as exc:
+                    logger.debug("Skipping non-serializable cache value for %s: %s", namespace, exc)
+                    continue
+            if self.max_bytes and len(blob) > self.max_bytes:
+                continue
+            rows.append((key, blob))
+        if not rows:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for key, blob in rows:
+                    previous = self._conn.execute(
+                        "SELECT size FROM entries WHERE namespace = ? AND key = ?",
+                        (namespace, key),
+                    ).fetchone()
+                    self._conn.execute(
+                        """
+                        INSERT OR REPLACE INTO entries
+                            (namespace, key, value, size, created_at, expires_at, last_access)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                        """,
+                        (namespace, key, blob, len(blob), now, now + ttl, now),
+                    )
+                    self._total_bytes += len(blob) - (int(previous[0]) if previous else 0)
+                if self.max_bytes and self._total_bytes > self.max_bytes:
+                    self._evict_locked(int(self.max_bytes * self._LOW_WATER_RATIO))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+                self._total_bytes = int(row[0] or 0)
+                raise
+
+    def delete(self, namespace: str, key: str) -> None:
+        """Remove a single entry if present."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size FROM entries WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+            if row is None:
+                return
+            self._conn.execute(
+                "DELETE FROM entries WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            )
+            self._total_bytes -= int(row[0])
+
+    def purge_expired(self) -> int:
+        """Delete all expired entries and return how many were removed."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries WHERE expires_at <= ?",
+                (now,),
+            ).fetchone()
+            self._conn.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+            self._total_bytes -= int(row[1] or 0)
+            return int(row[0] or 0)
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and storage usage."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            hits = dict(self._hits)
+            misses = dict(self._misses)
+            total_bytes = self._total_bytes
+            evictions = self._evictions
+
+        total_hits = sum(hits.values())
+        total_lookups = total_hits + sum(misses.values())
+        return {
+            "path": str(self.path),
+            "entries": int(entries),
+            "bytes": int(total_bytes),
+            "max_bytes": self.max_bytes,
+            "hits": hits,
+            "misses": misses,
+            "evictions": evictions,
+            "hit_rate": (total_hits / total_lookups) if total_lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _evict_locked(self, target_bytes: int) -> None:
+        """Evict least recently used entries until usage drops to ``target_bytes``."""
+        now = time.time()
+        expired = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries WHERE expires_at <= ?",
+            (now,),
+        ).fetchone()
+        if expired[0]:
+            self._conn.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+            self._total_bytes -= int(expired[1] or 0)
+            self._evictions += int(expired[0])
+
+        if self._total_bytes <= target_bytes:
+            return
+
+        cursor = self._conn.execute(
+            "SELECT namespace, key, size FROM entries ORDER BY last_access ASC"
+        )
+        victims = []
+        freed = 0
+        for namespace, key, size in cursor:
+            victims.append((namespace, key))
+            freed += int(size)
+            if self._total_bytes - freed <= target_bytes:
+                break
+
+        self._conn.executemany(
+            "DELETE FROM entries WHERE namespace = ? AND key = ?",
+            victims,
+        )
+        self._total_bytes -= freed
+        self._evictions += len(victims)
+        logger.debug("Evicted %s cache entries (%s bytes)", len(victims), freed)
@@ -0,0 +1,157 @@
+"""Coalesce concurrent identical calls so only one of them does the work."""
+
+import asyncio
+import copy
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+
+class _Call:
+    """An in-flight call that followers wait on."""
+
+    __slots__ = ("event", "result", "error", "waiters")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Thread-safe single-flight group keyed by an arbitrary string.
+
+    The first caller for a key (the leader) executes the function; callers that
+    arrive with the same key while it is running block until it finishes and
+    receive a deep copy of its result, or re-raise its exception.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._leaders = 0
+        self._coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Run ``fn`` once per concurrent ``key``.
+
+        Returns
+        -------
+        tuple[Any, bool]
+            The result and ``True`` when it was shared from another caller's
+            in-flight execution rather than produced by this caller.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+                self._leaders += 1
+                leader = True
+            else:
+                call.waiters += 1
+                self._coalesced += 1
+                leader = False
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result), True
+
+        result = None
+        try:
+            result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+                waiters = call.waiters
+            # Followers copy from a private snapshot so the leader may mutate its result
+            if waiters and call.error is None:
+                call.result = copy.deepcopy(result)
+            call.event.set()
+        return result, False
+
+    def in_flight(self, key: str) -> bool:
+        """Return whether a call for ``key`` is currently running."""
+        with self._lock:
+            return key in self._calls
+
+    def join(self, key: str) -> Tuple[bool, Any]:
+        """Wait for an in-flight call for ``key`` without starting one.
+
+        Lets callers that cannot run the leader's function themselves (e.g. a
+        coroutine issuing the same request through another client) share its
+        result instead of repeating the request.
+
+        Returns
+        -------
+        tuple[bool, Any]
+            ``(True, copy of the result)`` when a call was in flight, else
+            ``(False, None)``. Re-raises the leader's exception.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                return False, None
+            call.waiters += 1
+            self._coalesced += 1
+        call.event.wait()
+        if call.error is not None:
+            raise call.error
+        return True, copy.deepcopy(call.result)
+
+    def stats(self) -> Dict[str, int]:
+        """Return how many calls executed versus joined an in-flight call."""
+        with self._lock:
+            return {"executed": self._leaders, "coalesced": self._coalesced}
+
+
+class AsyncSingleFlight:
+    """Asyncio counterpart of :class:`SingleFlight` for coroutines on one event loop.
+
+    In-flight calls are tracked per running loop, so the same instance can be
+    used from several loops without awaiting a future owned by another loop.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Tuple[int, str], "asyncio.Future[Any]"] = {}
+        self._leaders = 0
+        self._coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Await ``fn()`` once per concurrent ``key``; see :meth:`SingleFlight.do`."""
+        loop = asyncio.get_running_loop()
+        call_key = (id(loop), key)
+        future = self._calls.get(call_key)
+        if future is not None:
+            self._coalesced += 1
+            # shield() keeps one follower's cancellation from cancelling the leader
+            result = await asyncio.shield(future)
+            return copy.deepcopy(result), True
+
+        future = loop.create_future()
+        self._calls[call_key] = future
+        self._leaders += 1
+        try:
+            result = await fn()
+        except BaseException as exc:
+            if isinstance(exc, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(exc)
+                # Mark retrieved so an unawaited failure does not log a warning
+                future.exception()
+            raise
+        else:
+            future.set_result(copy.deepcopy(result))
+        finally:
+            self._calls.pop(call_key, None)
+        return result, False
+
+    def stats(self) -> Dict[str, int]:
+        """Return how many calls executed versus joined an in-flight call."""
+        return {"executed": self._leaders, "coalesced": self._coalesced}
@@ -0,0 +1,167 @@
+"""Optional compression for source logs and a streaming reader for them."""
+
+import gzip
+import io
+import json
+import logging
+import mmap
+import os
+import zlib
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterator, Optional
+
+try:  # Python 3.14+
+    from compression import zstd as _stdlib_zstd
+except ImportError:
+    _stdlib_zstd = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_CODECS = ("none", "gzip", "zstd")
+
+
+class Codec:
+    """How source logs and blobs are framed on disk.
+
+    Every :meth:`compress` call yields a self-contained gzip member or zstd
+    frame, so appending one frame per write batch produces a file that
+    streams back as a single document.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        suffix: str,
+        compress: Callable[[bytes], bytes],
+        open_reader: Callable[[IO[bytes]], IO[bytes]],
+    ):
+        self.name = name
+        self.suffix = suffix
+        self._compress = compress
+        self._open_reader = open_reader
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compress(data)
+
+    def open_reader(self, raw: IO[bytes]) -> IO[bytes]:
+        """Wrap a binary file in a streaming decompressor."""
+        return self._open_reader(raw)
+
+    def __repr__(self) -> str:
+        return f"Codec({self.name!r})"
+
+
+def _zstd_codec(level: int) -> Optional[Codec]:
+    if _stdlib_zstd is not None:
+        return Codec(
+            "zstd",
+            ".zst",
+            lambda data: _stdlib_zstd.compress(data, level=level),
+            lambda raw: _stdlib_zstd.ZstdFile(raw, "rb"),
+        )
+    if zstandard is not None:
+        compressor = zstandard.ZstdCompressor(level=level)
+        return Codec(
+            "zstd",
+            ".zst",
+            compressor.compress,
+            lambda raw: io.BufferedReader(
+                zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+            ),
+        )
+    return None
+
+
+def _gzip_codec(level: int) -> Codec:
+    return Codec(
+        "gzip",
+        ".gz",
+        lambda data: gzip.compress(data, compresslevel=level, mtime=0),
+        lambda raw: gzip.GzipFile(fileobj=raw, mode="rb"),
+    )
+
+
+_PLAIN = Codec("none", "", lambda data: data, lambda raw: raw)
+
+
+def get_codec(name: Optional[str], level: Optional[int] = None) -> Codec:
+    """Return the codec called ``name`` (``none``, ``gzip`` or ``zstd``).
+
+    ``zstd`` uses ``compression.zstd`` (Python 3.14+) or the ``zstandard``
+    package, and falls back to gzip with a warning when neither is available.
+    """
+    name = (name or "none").strip().lower()
+    if name in ("", "none", "off", "false"):
+        return _PLAIN
+    if name in ("zstd", "zst"):
+        codec = _zstd_codec(3 if level is None else level)
+        if codec is not None:
+            return codec
+        logger.warning("zstd compression requested but not available; using gzip for source logs")
+        return _gzip_codec(6)
+    if name in ("gzip", "gz"):
+        return _gzip_codec(6 if level is None else level)
+    raise ValueError(f"Unknown source log compression {name!r}; expected one of {SUPPORTED_CODECS}")
+
+
+def codec_for_path(path: Path) -> Optional[Codec]:
+    """Return the codec a file was written with, judged by its suffix."""
+    suffix = Path(path).suffix
+    if suffix == ".gz":
+        return get_codec("gzip")
+    if suffix == ".zst":
+        codec = _zstd_codec(3)
+        if codec is None:
+            logger.warning("Cannot read %s: no zstd decompressor installed", path)
+        return codec
+    return _PLAIN
+
+
+def read_text(path: Path) -> str:
+    """Read a whole (possibly compressed) text file."""
+    codec = codec_for_path(path)
+    if codec is None:
+        raise OSError(f"No decompressor available for {path}")
+    with open(path, "rb") as raw, codec.open_reader(raw) as reader:
+        return reader.read().decode("utf-8")
+
+
+def iter_jsonl(path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield the records of a (possibly compressed) JSONL file one at a time.
+
+    Plain files are memory-mapped and compressed files are decompressed as a
+    stream, so memory use stays flat regardless of file size. Unparseable or
+    truncated trailing lines are skipped with a warning.
+    """
+    path = Path(path)
+    codec = codec_for_path(path)
+    if codec is None:
+        return
+
+    with open(path, "rb") as raw:
+        if codec is _PLAIN:
+            if os.fstat(raw.fileno()).st_size == 0:
+                return
+            with mmap.mmap(raw.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield from _parse_lines(iter(mapped.readline, b""), path)
+            return
+        with codec.open_reader(raw) as reader:
+            try:
+                yield from _parse_lines(reader, path)
+            except (EOFError, OSError, zlib.error) as exc:
+                logger.warning("Truncated compressed source log %s: %s", path, exc)
+
+
+def _parse_lines(lines, path: Path) -> Iterator[Dict[str, Any]]:
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+            logger.warning("Failed to parse line in %s: %s", path, exc)
@@ -0,0 +1,205 @@
+"""SQLite index over logged source records, with FTS5 full-text search on content."""
+
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from utils.passage_ranker import tokenize
+
+logger = logging.getLogger(__name__)
+
+# (file_key, record_json, agent, tool, url, query, title, timestamp, content_hash, body)
+IndexRow = Tuple[str, str, str, str, str, str, str, str, str, str]
+
+# Columns that :meth:`SourceIndex.counts_by` may aggregate on
+_GROUP_COLUMNS = ("file_key", "agent", "tool", "url", "query")
+
+
+class SourceIndex:
+    """Indexed copy of one session's source records.
+
+    Every record is stored as its original JSON line plus the columns callers
+    filter on (agent, tool, URL, query), so per-agent reads and manifests are
+    index lookups instead of directory scans. Page bodies are indexed once per
+    ``content_hash`` in an FTS5 table for :meth:`search`; when the SQLite build
+    lacks FTS5, :attr:`fts_enabled` is False and search is left to the caller.
+    """
+
+    def __init__(self, path: Path, session_id: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.session_id = session_id
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS sources (
+                id INTEGER PRIMARY KEY,
+                session_id TEXT NOT NULL,
+                file_key TEXT NOT NULL,
+                agent TEXT NOT NULL,
+                tool TEXT NOT NULL,
+                url TEXT NOT NULL,
+                query TEXT NOT NULL,
+                title TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                record TEXT NOT NULL
+            )
+            """
+        )
+        for column in ("file_key", "agent", "tool", "url", "query", "content_hash"):
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_sources_{column} ON sources(session_id, {column})"
+            )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS contents (
+                id INTEGER PRIMARY KEY,
+                content_hash TEXT NOT NULL UNIQUE
+            )
+            """
+        )
+        try:
+            # Contentless: only the term index is stored, bodies already live in logs and blobs
+            self._conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS contents_fts USING fts5(body, content='')")
+            self.fts_enabled = True
+        except sqlite3.OperationalError as exc:
+            logger.info("SQLite FTS5 unavailable; source full-text search disabled (%s)", exc)
+            self.fts_enabled = False
+
+    def add(self, rows: Sequence[IndexRow]) -> List[int]:
+        """Insert a batch of records in one transaction and return their row IDs."""
+        if not rows:
+            return []
+        ids: List[int] = []
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for file_key, record, agent, tool, url, query, title, timestamp, content_hash, body in rows:
+                    inserted = self._conn.execute(
+                        """
+                        INSERT INTO sources
+                            (session_id, file_key, agent, tool, url, query, title, timestamp, content_hash, record)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        """,
+                        (self.session_id, file_key, agent, tool, url, query, title, timestamp, content_hash, record),
+                    )
+                    ids.append(inserted.lastrowid)
+                    cursor = self._conn.execute(
+                        "INSERT OR IGNORE INTO contents (content_hash) VALUES (?)",
+                        (content_hash,),
+                    )
+                    if cursor.rowcount and self.fts_enabled:
+                        self._conn.execute(
+                            "INSERT INTO contents_fts (rowid, body) VALUES (?, ?)",
+                            (cursor.lastrowid, body),
+                        )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return ids
+
+    def records(
+        self,
+        agent: Optional[str] = None,
+        tool: Optional[str] = None,
+        url: Optional[str] = None,
+        query: Optional[str] = None,
+    ) -> List[str]:
+        """Return record JSON lines matching every given filter, in logging order."""
+        clauses = ["session_id = ?"]
+        params: List[str] = [self.session_id]
+        for column, value in (("agent", agent), ("tool", tool), ("url", url), ("query", query)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        sql = f"SELECT record FROM sources WHERE {' AND '.join(clauses)} ORDER BY id"
+        with self._lock:
+            return [row[0] for row in self._conn.execute(sql, params)]
+
+    def iter_records(
+        self,
+        agent: Optional[str] = None,
+        tool: Optional[str] = None,
+        page_size: int = 200,
+    ) -> Iterator[Tuple[int, str]]:
+        """Yield ``(row_id, record_json)`` pages at a time, without holding the lock between pages."""
+        clauses = ["session_id = ?", "id > ?"]
+        filters: List[str] = []
+        for column, value in (("agent", agent), ("tool", tool)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                filters.append(value)
+        sql = f"SELECT id, record FROM sources WHERE {' AND '.join(clauses)} ORDER BY id LIMIT ?"
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    sql, [self.session_id, last_id, *filters, max(1, int(page_size))]
+                ).fetchall()
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            yield from rows
+
+    def search(self, text: str, limit: int = 20, agent: Optional[str] = None) -> List[str]:
+        """Return record JSON lines whose content best matches ``text`` (BM25 order)."""
+        if not self.fts_enabled:
+            return []
+        terms = list(dict.fromkeys(tokenize(text)))
+        if not terms:
+            return []
+        match = " OR ".join(f'"{term}"' for term in terms)
+        sql = """
+            SELECT s.record
+            FROM contents_fts
+            JOIN contents c ON c.id = contents_fts.rowid
+            JOIN sources s ON s.session_id = ? AND s.content_hash = c.content_hash
+            WHERE contents_fts MATCH ?
+        """
+        params: List = [self.session_id, match]
+        if agent is not None:
+            sql += " AND s.agent = ?"
+            params.append(agent)
+        sql += " ORDER BY bm25(contents_fts), s.id LIMIT ?"
+        params.append(max(1, int(limit)))
+        with self._lock:
+            return [row[0] for row in self._conn.execute(sql, params)]
+
+    def counts_by(self, column: str) -> Dict[str, int]:
+        """Return the number of records per distinct value of ``column``."""
+        if column not in _GROUP_COLUMNS:
+            raise ValueError(f"Cannot group sources by {column!r}")
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {column}, COUNT(*) FROM sources WHERE session_id = ? GROUP BY {column}",
+                (self.session_id,),
+            ).fetchall()
+        return {value: int(count) for value, count in rows}
+
+    def distinct_urls(self) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT url FROM sources WHERE session_id = ? AND url != ''",
+                (self.session_id,),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def count(self) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM sources WHERE session_id = ?", (self.session_id,)
+            ).fetchone()
+        return int(row[0])
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
@@ -1,22 +1,131 @@
 """Log all Tavily search results to flat files for persistence and debugging."""
 
+import atexit
 import json
+import logging
+import os
+import queue
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any, Optional
-import hashlib
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from config.environment import (
+    CITATION_INDEX_DIR,
+    SOURCE_BLOB_MIN_CHARS,
+    SOURCE_LOG_BATCH_SIZE,
+    SOURCE_LOG_COMPRESSION,
+    SOURCE_LOG_FLUSH_INTERVAL,
+    SOURCE_SESSION_KEEP_LAST,
+    SOURCE_SESSION_RETENTION_DAYS,
+)
+from utils.blob_store import BlobStore
+from utils.extract_store import SessionExtractStore
+from utils.passage_ranker import tokenize
+from utils.source_codec import get_codec, iter_jsonl
+from utils.source_index import IndexRow, SourceIndex
+
+logger = logging.getLogger(__name__)
+
+# Directory holding one subdirectory per session
+SOURCES_ROOT = Path("data/sources")
+
+# Queue item that stops the writer thread after draining everything before it
+_STOP = object()
+
+# Result fields that duplicate the record's content and are not kept in raw_result
+_CONTENT_FIELDS = ("content", "raw_content", "snippet")
 
 
 class SourceLogger:
-    """Log all Tavily results to flat files for persistence and debugging."""
+    """Log all Tavily results to flat files for persistence and debugging.
+
+    Agents log from many threads at once, so records are serialized in the
+    caller and handed to a single background writer thread through a queue.
+    The writer keeps one append handle per file open and writes in batches,
+    flushing when ``batch_size`` lines are pending or ``flush_interval``
+    seconds have passed. :meth:`flush` blocks until everything queued so far
+    is on disk; readers call it first, and :meth:`close` runs at interpreter exit.
+
+    Page bodies longer than ``blob_min_chars`` are stored once in a
+    content-addressed :class:`~utils.blob_store.BlobStore` under ``blobs/``
+    and referenced from records by ``content_hash``; readers resolve them
+    back into ``content`` transparently.
+
+    The writer also inserts every record into a per-session
+    :class:`~utils.source_index.SourceIndex` (``sources.sqlite3``), which
+    serves reads, per-agent filters, manifests and full-text search. The JSONL
+    files remain the durable, human-readable log; sessions logged before the
+    index existed are indexed from them on first open.
+
+    Per-file, per-agent, per-tool and unique-URL counters are updated as
+    batches land and persisted to ``manifest.json``, so
+    :meth:`get_session_manifest` never rescans the session and a dashboard can
+    poll the file mid-run.
+
+    With ``compression`` set to ``gzip`` or ``zstd`` each write batch is
+    appended to ``<agent>_<tool>.jsonl.gz`` / ``.jsonl.zst`` as its own
+    compressed frame, and blobs are compressed too. :meth:`iter_sources`
+    streams records without building a list.
+
+    Listeners registered with :meth:`add_listener` are called from the writer
+    thread with each batch of newly indexed records, so consumers such as the
+    citation indexer can process sources while agents are still running.
+    """
 
-    def __init__(self, session_id: Optional[str] = None):
+    def __init__(
+        self,
+        session_id: Optional[str] = None,
+        batch_size: int = SOURCE_LOG_BATCH_SIZE,
+        flush_interval: float = SOURCE_LOG_FLUSH_INTERVAL,
+        blob_min_chars: int = SOURCE_BLOB_MIN_CHARS,
+        compression: str = SOURCE_LOG_COMPRESSION,
+    ):
         self.session_id = session_id or self._generate_session_id()
-        self.base_dir = Path(f"data/sources/{self.session_id}")
+        self.base_dir = SOURCES_ROOT / self.session_id
         self.base_dir.mkdir(parents=True, exist_ok=True)
 
-        # Track file handles for efficiency (optional, currently using append mode)
-        self.file_handles = {}
+        # Open binary append handles, owned by the writer thread
+        self.codec = get_codec(compression)
+        self.file_handles: Dict[str, IO[bytes]] = {}
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = max(0.01, float(flush_interval))
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+
+        # Content-addressed page bodies shared by every record in the session
+        self.blobs = BlobStore(self.base_dir / "blobs", codec=self.codec)
+        self.blob_min_chars = max(0, int(blob_min_chars))
+        self._blob_keys: set = set()
+        self._blob_lock = threading.Lock()
+        self._blob_refs = 0
+        self._blob_dedup_hits = 0
+
+        # Indexed copy of every record for filtered reads, manifests and search
+        self.index = SourceIndex(self.base_dir / "sources.sqlite3", self.session_id)
+        if self.index.count() == 0:
+            self._backfill_index()
+
+        # Callbacks notified with each batch of newly indexed records
+        self._listeners: List[Callable[[List[Dict]], None]] = []
+        self._listeners_lock = threading.Lock()
+
+        # Running totals behind the manifest, maintained by the writer thread
+        self.manifest_path = self.base_dir / "manifest.json"
+        self._counts_lock = threading.Lock()
+        self._file_counts: Dict[str, int] = self.index.counts_by("file_key")
+        self._agent_counts: Dict[str, int] = self.index.counts_by("agent")
+        self._tool_counts: Dict[str, int] = self.index.counts_by("tool")
+        self._urls: set = set(self.index.distinct_urls())
+        self._updated_at: Optional[str] = None
+
+        # Pages extracted by any agent this session, reused without spending extract budget
+        self.extract_store = SessionExtractStore()
 
     def _generate_session_id(self) -> str:
         """Generate unique session ID based on timestamp."""
@@ -43,22 +152,269 @@ class SourceLogger:
 
         # Create file for this agent/tool combination
         file_key = f"{agent_name}_{tool_name}"
-        file_path = self.base_dir / f"{file_key}.jsonl"
-
-        # Write each result as a JSONL line
-        with open(file_path, 'a', encoding='utf-8') as f:
-            for result in results:
-                record = {
-                    'timestamp': datetime.utcnow().isoformat(),
-                    'query': query,
-                    'tool': tool_name,
-                    'agent': agent_name,
-                    'url': result.get('url', ''),
-                    'title': result.get('title', ''),
-                    'content': result.get('content', result.get('snippet', '')),
-                    'raw_result': result  # Keep full original for debugging
-                }
-                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+        # Serialize now so later mutation of ``results`` cannot race the writer
+        lines = []
+        rows: List[IndexRow] = []
+        new_blobs: Dict[str, str] = {}
+        for result in results:
+            content = result.get('content', result.get('snippet', '')) or ''
+            record = {
+                'timestamp': datetime.utcnow().isoformat(),
+                'query': query,
+                'tool': tool_name,
+                'agent': agent_name,
+                'url': result.get('url', ''),
+                'title': result.get('title', ''),
+            }
+            key = self.blobs.key_for(content)
+            if len(content) > self.blob_min_chars:
+                if self._claim_blob(key):
+                    new_blobs[key] = content
+                record['content_hash'] = key
+                record['content_length'] = len(content)
+            else:
+                record['content'] = content
+            # Keep the original metadata for debugging, minus the page body stored above
+            record['raw_result'] = {k: v for k, v in result.items() if k not in _CONTENT_FIELDS}
+            line = json.dumps(record, ensure_ascii=False)
+            lines.append(line + '\n')
+            rows.append(self._index_row(file_key, line, record, key, content))
+
+        if lines:
+            self._ensure_writer()
+            self._queue.put((file_key, lines, new_blobs, rows))
+
+    @staticmethod
+    def _index_row(file_key: str, line: str, record: Dict, content_hash: str, content: str) -> IndexRow:
+        return (
+            file_key,
+            line,
+            record.get('agent') or '',
+            record.get('tool') or '',
+            record.get('url') or '',
+            record.get('query') or '',
+            record.get('title') or '',
+            record.get('timestamp') or '',
+            content_hash,
+            content,
+        )
+
+    def _backfill_index(self) -> None:
+        """Index records from JSONL files written before this session had an index."""
+        for log_file in sorted(self.base_dir.glob("*.jsonl*")):
+            file_key = log_file.name.split(".jsonl", 1)[0]
+            rows: List[IndexRow] = []
+            for record in iter_jsonl(log_file):
+                content = self._resolve_content(record)
+                key = record.get('content_hash') or self.blobs.key_for(content)
+                line = json.dumps(record, ensure_ascii=False)
+                rows.append(self._index_row(file_key, line, record, key, content))
+                if len(rows) >= self.batch_size:
+                    self.index.add(rows)
+                    rows = []
+            self.index.add(rows)
+
+    def _claim_blob(self, key: str) -> bool:
+        """Record a reference to ``key``; return True if this logger has not queued it yet."""
+        with self._blob_lock:
+            self._blob_refs += 1
+            if key in self._blob_keys:
+                self._blob_dedup_hits += 1
+                return False
+            self._blob_keys.add(key)
+            return True
+
+    def _ensure_writer(self) -> None:
+        """Start the background writer thread if it is not running."""
+        if self._writer is not None and self._writer.is_alive():
+            return
+        with self._writer_lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(
+                    target=self._writer_loop,
+                    name=f"source-logger-{self.session_id}",
+                    daemon=True,
+                )
+                self._writer.start()
+                atexit.register(self.close)
+
+    def _writer_loop(self) -> None:
+        """Drain the queue, writing batches through persistent file handles."""
+        pending: Dict[str, List[str]] = {}
+        pending_blobs: Dict[str, str] = {}
+        pending_rows: List[IndexRow] = []
+        pending_lines = 0
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            timeout = max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if isinstance(item, tuple):
+                file_key, lines, blobs, rows = item
+                pending.setdefault(file_key, []).extend(lines)
+                pending_blobs.update(blobs)
+                pending_rows.extend(rows)
+                pending_lines += len(lines)
+                if pending_lines < self.batch_size and time.monotonic() < deadline:
+                    continue
+
+            # Size or time threshold reached, or a flush/stop request arrived
+            self._write_blobs(pending_blobs)
+            self._write_batch(pending)
+            row_ids = self._index_batch(pending_rows)
+            self._update_counters(pending_rows)
+            self._notify_listeners(pending_rows, row_ids)
+            pending = {}
+            pending_blobs = {}
+            pending_rows = []
+            pending_lines = 0
+            deadline = time.monotonic() + self.flush_interval
+
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is _STOP:
+                self._close_handles()
+                return
+
+    def _write_blobs(self, pending_blobs: Dict[str, str]) -> None:
+        # Blobs land before the records that reference them
+        for key, text in pending_blobs.items():
+            try:
+                self.blobs.put(text, key=key)
+            except OSError as exc:
+                logger.error("Failed to write source blob %s: %s", key, exc)
+
+    def _write_batch(self, pending: Dict[str, List[str]]) -> None:
+        for file_key, lines in pending.items():
+            try:
+                handle = self.file_handles.get(file_key)
+                if handle is None or handle.closed:
+                    handle = open(self.base_dir / f"{file_key}{self.log_suffix}", 'ab')
+                    self.file_handles[file_key] = handle
+                # One self-contained frame per batch keeps compressed files appendable
+                handle.write(self.codec.compress(''.join(lines).encode('utf-8')))
+                handle.flush()
+            except OSError as exc:
+                logger.error("Failed to write %s source records to %s: %s", len(lines), file_key, exc)
+
+    def _index_batch(self, rows: List[IndexRow]) -> List[int]:
+        try:
+            return self.index.add(rows)
+        except Exception as exc:
+            logger.error("Failed to index %s source records: %s", len(rows), exc)
+            return []
+
+    def add_listener(self, callback: Callable[[List[Dict]], None]) -> None:
+        """Call ``callback`` with every batch of records written from now on.
+
+        Each record carries ``source_id`` (its index row ID) and resolved
+        ``content``. Callbacks run on the writer thread and must return
+        quickly; hand heavy work to another thread.
+        """
+        with self._listeners_lock:
+            if callback not in self._listeners:
+                self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[List[Dict]], None]) -> None:
+        with self._listeners_lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def _notify_listeners(self, rows: List[IndexRow], row_ids: List[int]) -> None:
+        with self._listeners_lock:
+            listeners = list(self._listeners)
+        if not listeners or not row_ids:
+            return
+        records = []
+        for row_id, row in zip(row_ids, rows):
+            record = json.loads(row[1])
+            record['source_id'] = row_id
+            record['content'] = row[9]
+            records.append(record)
+        for callback in listeners:
+            try:
+                callback(records)
+            except Exception as exc:
+                logger.error("Source listener %r failed: %s", callback, exc)
+
+    @property
+    def log_suffix(self) -> str:
+        """File suffix of this session's source logs (``.jsonl`` plus any codec suffix)."""
+        return f".jsonl{self.codec.suffix}"
+
+    def _update_counters(self, rows: List[IndexRow]) -> None:
+        """Fold a written batch into the running counters and persist them."""
+        if not rows:
+            return
+        with self._counts_lock:
+            for file_key, _, agent, tool, url, *_ in rows:
+                self._file_counts[file_key] = self._file_counts.get(file_key, 0) + 1
+                self._agent_counts[agent] = self._agent_counts.get(agent, 0) + 1
+                self._tool_counts[tool] = self._tool_counts.get(tool, 0) + 1
+                if url:
+                    self._urls.add(url)
+            self._updated_at = datetime.utcnow().isoformat()
+        self._persist_manifest()
+
+    def _counters_snapshot(self) -> Dict[str, Any]:
+        with self._counts_lock:
+            return {
+                'files': {f"{key}{self.log_suffix}": count for key, count in sorted(self._file_counts.items())},
+                'agents': dict(sorted(self._agent_counts.items())),
+                'tools': dict(sorted(self._tool_counts.items())),
+                'total_sources': sum(self._file_counts.values()),
+                'unique_urls': len(self._urls),
+                'updated_at': self._updated_at,
+            }
+
+    def _persist_manifest(self) -> None:
+        snapshot = {'session_id': self.session_id, **self._counters_snapshot()}
+        tmp_path = self.manifest_path.with_suffix(".json.tmp")
+        try:
+            tmp_path.write_text(json.dumps(snapshot, indent=2), encoding='utf-8')
+            os.replace(tmp_path, self.manifest_path)
+        except OSError as exc:
+            logger.error("Failed to write source manifest %s: %s", self.manifest_path, exc)
+
+    def _close_handles(self) -> None:
+        for handle in self.file_handles.values():
+            try:
+                handle.close()
+            except OSError:
+                pass
+        self.file_handles.clear()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every record logged so far has been written to disk.
+
+        Returns
+        -------
+        bool
+            False if the writer did not finish within ``timeout`` seconds.
+        """
+        if self._queue.empty() and (self._writer is None or not self._writer.is_alive()):
+            return True
+        self._ensure_writer()
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """Flush pending records, stop the writer thread and close file handles.
+
+        Logging again after ``close`` transparently starts a new writer.
+        """
+        with self._writer_lock:
+            writer = self._writer
+            if writer is None or not writer.is_alive():
+                return
+            self._queue.put(_STOP)
+            atexit.unregister(self.close)
+        writer.join(timeout)
 
     def read_all_sources(self) -> List[Dict]:
         """Read all sources from flat files for this session.
@@ -68,42 +424,148 @@ class SourceLogger:
         List[Dict]
             All logged sources from all agents/tools
         """
-        all_sources = []
+        return self.find_sources()
+
+    def find_sources(self,
+                     agent_name: Optional[str] = None,
+                     tool_name: Optional[str] = None,
+                     url: Optional[str] = None,
+                     query: Optional[str] = None) -> List[Dict]:
+        """Return logged sources matching every given filter, in logging order.
+
+        Parameters
+        ----------
+        agent_name, tool_name, url, query : str, optional
+            Exact-match filters; omitted filters match everything.
+
+        Returns
+        -------
+        List[Dict]
+            Matching source records with ``content`` resolved
+        """
+        self.flush()
+        return self._load_records(self.index.records(agent=agent_name, tool=tool_name, url=url, query=query))
 
-        # Read all JSONL files in session directory
-        for jsonl_file in self.base_dir.glob("*.jsonl"):
-            with open(jsonl_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    if line.strip():
-                        try:
-                            all_sources.append(json.loads(line))
-                        except json.JSONDecodeError as e:
-                            print(f"Warning: Failed to parse line in {jsonl_file}: {e}")
-                            continue
+    def iter_sources(self,
+                     agent_name: Optional[str] = None,
+                     tool_name: Optional[str] = None) -> Iterator[Dict]:
+        """Yield logged sources one at a time, in logging order.
 
-        return all_sources
+        Records are paged out of the index and blob content is read per
+        record, so memory use does not grow with the session size.
 
-    def get_session_manifest(self) -> Dict:
-        """Get summary of logged sources.
+        Parameters
+        ----------
+        agent_name, tool_name : str, optional
+            Exact-match filters; omitted filters match everything.
+
+        Yields
+        ------
+        Dict
+            Source record with ``source_id`` (index row ID) and ``content`` resolved
+        """
+        self.flush()
+        for row_id, line in self.index.iter_records(agent=agent_name, tool=tool_name, page_size=self.batch_size):
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                logger.warning("Failed to parse indexed source record: %s", e)
+                continue
+            record['source_id'] = row_id
+            record['content'] = self._resolve_content(record)
+            yield record
+
+    def search_sources(self, text: str, limit: int = 20, agent_name: Optional[str] = None) -> List[Dict]:
+        """Full-text search over logged content, best matches first.
+
+        Parameters
+        ----------
+        text : str
+            Free-text query; any of its terms may match.
+        limit : int
+            Maximum number of records to return.
+        agent_name : str, optional
+            Restrict results to one agent.
+
+        Returns
+        -------
+        List[Dict]
+            Matching source records with ``content`` resolved
+        """
+        self.flush()
+        if self.index.fts_enabled:
+            return self._load_records(self.index.search(text, limit=limit, agent=agent_name))
+
+        # No FTS5 in this SQLite build: fall back to a term scan over the records
+        terms = set(tokenize(text))
+        if not terms:
+            return []
+        scored = []
+        for record in self.find_sources(agent_name=agent_name):
+            hits = len(terms & set(tokenize(f"{record.get('title', '')} {record.get('content', '')}")))
+            if hits:
+                scored.append((-hits, len(scored), record))
+        return [record for _, _, record in sorted(scored)[:max(1, int(limit))]]
+
+    def _resolve_content(self, record: Dict, blob_cache: Optional[Dict[str, str]] = None) -> str:
+        key = record.get('content_hash')
+        if key and 'content' not in record:
+            if blob_cache is None:
+                return self.blobs.get(key) or ''
+            if key not in blob_cache:
+                blob_cache[key] = self.blobs.get(key) or ''
+            return blob_cache[key]
+        return record.get('content') or ''
+
+    def _load_records(self, lines: Iterable[str]) -> List[Dict]:
+        """Parse indexed record lines and resolve blob-backed content, reading each blob once."""
+        records = []
+        blob_cache: Dict[str, str] = {}
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                logger.warning("Failed to parse indexed source record: %s", e)
+                continue
+            record['content'] = self._resolve_content(record, blob_cache)
+            records.append(record)
+        return records
+
+    def get_session_manifest(self, flush: bool = True) -> Dict:
+        """Get summary of logged sources from the running counters.
+
+        Parameters
+        ----------
+        flush : bool
+            Wait for queued records to be written first. Pass False to poll
+            mid-run without blocking on the writer.
 
         Returns
         -------
         Dict
-            Summary with session_id, file counts, and total sources
+            Summary with session_id, per-file/agent/tool counts, total and
+            unique-URL counts, and extract-store and blob statistics
         """
-        manifest = {
+        if flush:
+            self.flush()
+        return {
             'session_id': self.session_id,
             'directory': str(self.base_dir),
-            'files': {},
-            'total_sources': 0
+            **self._counters_snapshot(),
+            'extract_store': self.extract_store.stats(),
+            'blobs': self.blob_stats(),
         }
 
-        for jsonl_file in self.base_dir.glob("*.jsonl"):
-            line_count = sum(1 for _ in open(jsonl_file))
-            manifest['files'][jsonl_file.name] = line_count
-            manifest['total_sources'] += line_count
-
-        return manifest
+    def blob_stats(self) -> Dict[str, int]:
+        """Return content-blob reference and deduplication counters."""
+        with self._blob_lock:
+            stats = {
+                'unique_blobs': len(self._blob_keys),
+                'references': self._blob_refs,
+                'deduplicated': self._blob_dedup_hits,
+            }
+        stats.update(self.blobs.stats())
+        return stats
 
     def read_sources_by_agent(self, agent_name: str) -> List[Dict]:
         """Read sources for a specific agent.
@@ -118,46 +580,95 @@ class SourceLogger:
         List[Dict]
             Sources logged by the specified agent
         """
-        agent_sources = []
+        return self.find_sources(agent_name=agent_name)
+
 
-        # Read files matching this agent
-        for jsonl_file in self.base_dir.glob(f"{agent_name}_*.jsonl"):
-            with open(jsonl_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    if line.strip():
-                        try:
-                            agent_sources.append(json.loads(line))
-                        except json.JSONDecodeError:
-                            continue
+# Process-wide default logger, used when no session is active in the current context
+_global_logger: Optional[SourceLogger] = None
 
-        return agent_sources
+# Logger of the session active in the current context (set by ``source_session``)
+_current_logger_var: ContextVar[Optional[SourceLogger]] = ContextVar("current_source_logger", default=None)
 
+# Open loggers by session ID, so concurrent pipelines never share or prune each other's session
+_session_loggers: Dict[str, SourceLogger] = {}
+_registry_lock = threading.Lock()
 
-# Global logger instance (singleton pattern)
-_global_logger: Optional[SourceLogger] = None
+
+def _register_logger(session_id: Optional[str]) -> SourceLogger:
+    with _registry_lock:
+        source_logger = _session_loggers.get(session_id) if session_id else None
+        if source_logger is None:
+            source_logger = SourceLogger(session_id)
+            _session_loggers[source_logger.session_id] = source_logger
+        return source_logger
 
 
 def get_source_logger(session_id: Optional[str] = None) -> SourceLogger:
-    """Get or create the global source logger.
+    """Get the source logger for a session.
+
+    Resolution order: the logger for ``session_id`` if given (created on first
+    use), then the session active in the current context (see
+    :func:`source_session`), then the process-wide default logger.
 
     Parameters
     ----------
     session_id : str, optional
-        Session ID for the logger. Only used when creating new logger.
+        Session whose logger to return.
 
     Returns
     -------
     SourceLogger
-        The global source logger instance
+        The resolved source logger instance
     """
     global _global_logger
+    if session_id:
+        current = _current_logger_var.get() or _global_logger
+        if current is not None and current.session_id == session_id:
+            return current
+        return _register_logger(session_id)
+
+    current = _current_logger_var.get()
+    if current is not None:
+        return current
     if _global_logger is None:
-        _global_logger = SourceLogger(session_id)
+        with _registry_lock:
+            if _global_logger is None:
+                _global_logger = SourceLogger()
+                _session_loggers[_global_logger.session_id] = _global_logger
     return _global_logger
 
 
+@contextmanager
+def source_session(session_id: Optional[str] = None) -> Iterator[SourceLogger]:
+    """Route source logging in this context to the logger for ``session_id``.
+
+    The logger is bound through a ``ContextVar``, so it follows ``asyncio``
+    tasks and :func:`utils.agent_context.submit_with_context` workers, and
+    concurrent sessions in one process stay isolated. The logger is flushed,
+    closed and unregistered on exit.
+
+    Yields
+    ------
+    SourceLogger
+        The session's source logger
+    """
+    source_logger = _register_logger(session_id)
+    token = _current_logger_var.set(source_logger)
+    try:
+        yield source_logger
+    finally:
+        _current_logger_var.reset(token)
+        source_logger.close()
+        with _registry_lock:
+            if _session_loggers.get(source_logger.session_id) is source_logger:
+                del _session_loggers[source_logger.session_id]
+
+
 def reset_source_logger(session_id: Optional[str] = None) -> SourceLogger:
-    """Reset logger for new session.
+    """Reset the process-wide default logger for a new session.
+
+    Prefer :func:`source_session` when more than one session may run in the
+    same process.
 
     Parameters
     ----------
@@ -170,5 +681,95 @@ def reset_source_logger(session_id: Optional[str] = None) -> SourceLogger:
         The newly created source logger instance
     """
     global _global_logger
-    _global_logger = SourceLogger(session_id)
-    return _global_logger
\ No newline at end of file
+    with _registry_lock:
+        previous = _global_logger
+        if previous is not None and _session_loggers.get(previous.session_id) is previous:
+            del _session_loggers[previous.session_id]
+    if previous is not None:
+        previous.close()
+    _global_logger = _register_logger(session_id)
+    return _global_logger
+
+
+def _session_last_modified(session_dir: Path) -> float:
+    manifest = session_dir / "manifest.json"
+    latest = session_dir.stat().st_mtime
+    if manifest.exists():
+        latest = max(latest, manifest.stat().st_mtime)
+    return latest
+
+
+def prune_source_sessions(
+    max_age_days: float = SOURCE_SESSION_RETENTION_DAYS,
+    keep_last: int = SOURCE_SESSION_KEEP_LAST,
+    root: Path = SOURCES_ROOT,
+    index_root: Path = Path(CITATION_INDEX_DIR),
+) -> List[str]:
+    """Delete old session directories under ``data/sources``.
+
+    A session is removed when it is older than ``max_age_days`` or falls
+    outside the ``keep_last`` most recent sessions; a value of 0 disables that
+    rule. Sessions with an open logger in this process are never removed.
+    The session's citation index (``session_<id>`` under ``index_root``) is
+    removed with it, as is any index left behind by a session whose sources
+    no longer exist.
+
+    Returns
+    -------
+    List[str]
+        Session IDs that were deleted
+    """
+    root = Path(root)
+    with _registry_lock:
+        active = set(_session_loggers)
+    if (max_age_days <= 0 and keep_last <= 0) or not root.is_dir():
+        _prune_session_indexes(Path(index_root), root, active)
+        return []
+
+    sessions = []
+    for session_dir in root.iterdir():
+        if session_dir.is_dir() and session_dir.name not in active:
+            try:
+                sessions.append((_session_last_modified(session_dir), session_dir))
+            except OSError:
+                continue
+    sessions.sort(reverse=True)
+
+    cutoff = time.time() - max_age_days * 86400 if max_age_days > 0 else None
+    # Active sessions under this root count towards keep_last, so they are always among the kept ones
+    active_here = sum(1 for session_id in active if (root / session_id).is_dir())
+    keep_budget = max(0, keep_last - active_here) if keep_last > 0 else None
+
+    removed = []
+    for index, (modified, session_dir) in enumerate(sessions):
+        too_old = cutoff is not None and modified < cutoff
+        over_limit = keep_budget is not None and index >= keep_budget
+        if too_old or over_limit:
+            try:
+                shutil.rmtree(session_dir)
+                removed.append(session_dir.name)
+            except OSError as exc:
+                logger.warning("Failed to remove source session %s: %s", session_dir, exc)
+    if removed:
+        logger.info("Pruned %s old source session(s) from %s", len(removed), root)
+    _prune_session_indexes(Path(index_root), root, active)
+    return removed
+
+
+def _prune_session_indexes(index_root: Path, sources_root: Path, active: Iterable[str]) -> None:
+    """Delete per-session citation indexes whose source session is gone."""
+    if not index_root.is_dir():
+        return
+    active = set(active)
+    removed = 0
+    for index_dir in index_root.glob("session_*"):
+        session_id = index_dir.name[len("session_"):]
+        if not index_dir.is_dir() or session_id in active or (sources_root / session_id).is_dir():
+            continue
+        try:
+            shutil.rmtree(index_dir)
+            removed += 1
+        except OSError as exc:
+            logger.warning("Failed to remove citation index %s: %s", index_dir, exc)
+    if removed:
+        logger.info("Pruned %s orphaned citation index(es) from %s", removed, index_root)
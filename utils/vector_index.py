@@ -0,0 +1,297 @@
+"""Dependency-light, on-disk vector index used for citation matching without Chroma."""
+
+import hashlib
+import json
+import logging
+import shutil
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.passage_ranker import BM25
+
+logger = logging.getLogger(__name__)
+
+EmbeddingFunction = Callable[[List[str]], Any]
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _doc_hash(document: str) -> str:
+    return hashlib.sha256(document.encode("utf-8")).hexdigest()
+
+
+class LocalVectorIndex:
+    """Float32 embedding matrix on disk with cosine top-k search by matrix multiply.
+
+    Vectors are L2-normalized and appended to ``vectors.f32``, which is
+    memory-mapped for queries, so cosine similarity is a single ``Q @ M.T``.
+    IDs, documents and metadata live in a small SQLite table next to it.
+    ``upsert`` only embeds documents that are new or changed, so reopening a
+    persisted index costs no embedding calls. The query API mirrors the subset
+    of a Chroma collection that :class:`~utils.citation_matcher.CitationMatcher`
+    uses, so the two are interchangeable.
+
+    Parameters
+    ----------
+    path : Path
+        Directory holding the index files.
+    embedding_function : callable
+        Maps a list of texts to a list (or array) of vectors.
+    hybrid_weight : float
+        Weight of the normalized BM25 score blended into the cosine score
+        (0 disables lexical scoring).
+    """
+
+    def __init__(self, path: Path, embedding_function: EmbeddingFunction, hybrid_weight: float = 0.0):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.embedding_function = embedding_function
+        self.hybrid_weight = min(1.0, max(0.0, float(hybrid_weight)))
+        self._vectors_path = self.path / "vectors.f32"
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.path / "index.sqlite3"), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS items (
+                id TEXT PRIMARY KEY,
+                row INTEGER NOT NULL UNIQUE,
+                doc_hash TEXT NOT NULL,
+                document TEXT NOT NULL,
+                metadata TEXT NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'dim'").fetchone()
+        self._dim: Optional[int] = int(row[0]) if row else None
+
+        self._matrix: Optional[np.ndarray] = None
+        self._rows = self._count_rows()
+        self._live_rows: Optional[np.ndarray] = None
+        self._bm25: Optional[BM25] = None
+
+    def _count_rows(self) -> int:
+        if self._dim is None or not self._vectors_path.exists():
+            return 0
+        return self._vectors_path.stat().st_size // (4 * self._dim)
+
+    def count(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM items").fetchone()[0])
+
+    def _embed(self, documents: List[str]) -> np.ndarray:
+        vectors = np.asarray(self.embedding_function(documents), dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape[0] != len(documents):
+            raise ValueError(f"Embedding function returned shape {vectors.shape} for {len(documents)} texts")
+        return _normalize(vectors)
+
+    def _matrix_view(self) -> Optional[np.ndarray]:
+        """Memory-mapped (rows, dim) view of the vectors, reopened when the file grows."""
+        if self._rows == 0 or self._dim is None:
+            return None
+        if self._matrix is None or self._matrix.shape[0] != self._rows:
+            self._matrix = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(self._rows, self._dim))
+        return self._matrix
+
+    def _existing(self, ids: Sequence[str]) -> Dict[str, Tuple[int, str]]:
+        """Map each stored ID among ``ids`` to its ``(row, doc_hash)``."""
+        existing = {}
+        for start in range(0, len(ids), 500):
+            chunk = list(ids[start:start + 500])
+            placeholders = ",".join("?" * len(chunk))
+            for item_id, row, doc_hash in self._conn.execute(
+                f"SELECT id, row, doc_hash FROM items WHERE id IN ({placeholders})", chunk
+            ):
+                existing[item_id] = (row, doc_hash)
+        return existing
+
+    def upsert(self, documents: Sequence[str], metadatas: Sequence[Dict[str, Any]], ids: Sequence[str]) -> int:
+        """Insert or update documents; return how many had to be embedded."""
+        with self._lock:
+            existing = self._existing(ids)
+        pending = []
+        for item_id, document, metadata in zip(ids, documents, metadatas):
+            doc_hash = _doc_hash(document)
+            current = existing.get(item_id)
+            if current is not None and current[1] == doc_hash:
+                continue
+            pending.append((item_id, document, metadata or {}, doc_hash))
+        if not pending:
+            return 0
+
+        # Embedding is the slow part, so queries keep running while it happens
+        vectors = self._embed([document for _, document, _, _ in pending])
+
+        with self._lock:
+            if self._dim is None:
+                self._dim = int(vectors.shape[1])
+                self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('dim', ?)", (str(self._dim),))
+            elif vectors.shape[1] != self._dim:
+                raise ValueError(f"Embedding dimension {vectors.shape[1]} does not match index dimension {self._dim}")
+
+            # Re-read rows: a concurrent upsert may have stored some of these IDs meanwhile
+            rows = {item_id: row for item_id, (row, _) in self._existing([entry[0] for entry in pending]).items()}
+            self._conn.execute("BEGIN")
+            try:
+                with open(self._vectors_path, "r+b" if self._vectors_path.exists() else "w+b") as handle:
+                    for (item_id, document, metadata, doc_hash), vector in zip(pending, vectors):
+                        row = rows.get(item_id)
+                        if row is None:
+                            row = self._rows
+                            self._rows += 1
+                            rows[item_id] = row
+                        handle.seek(row * 4 * self._dim)
+                        handle.write(vector.tobytes())
+                        self._conn.execute(
+                            "INSERT OR REPLACE INTO items (id, row, doc_hash, document, metadata) VALUES (?, ?, ?, ?, ?)",
+                            (item_id, row, doc_hash, document, json.dumps(metadata, ensure_ascii=False)),
+                        )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                self._rows = self._count_rows()
+                raise
+            finally:
+                self._matrix = None
+                self._live_rows = None
+                self._bm25 = None
+            return len(pending)
+
+    # Chroma collections expose both; upsert already skips unchanged documents
+    add = upsert
+
+    def _lexical_scores(self, query_texts: List[str]) -> np.ndarray:
+        """BM25 scores per query, normalized to [0, 1] and laid out by vector row."""
+        if self._bm25 is None:
+            documents = [""] * self._rows
+            for row, document in self._conn.execute("SELECT row, document FROM items"):
+                documents[row] = document
+            self._bm25 = BM25(documents)
+        scores = np.zeros((len(query_texts), self._rows), dtype=np.float32)
+        for i, text in enumerate(query_texts):
+            scores[i] = self._bm25.scores(text)
+        peaks = scores.max(axis=1, keepdims=True)
+        peaks[peaks == 0] = 1.0
+        return scores / peaks
+
+    def _live_row_array(self) -> np.ndarray:
+        """Sorted vector rows that belong to a stored item, cached until the next upsert."""
+        if self._live_rows is None:
+            self._live_rows = np.fromiter(
+                (row for (row,) in self._conn.execute("SELECT row FROM items ORDER BY row")), dtype=np.int64
+            )
+        return self._live_rows
+
+    def query(self, query_texts: List[str], n_results: int = 5) -> Dict[str, List[List[Any]]]:
+        """Return the ``n_results`` nearest documents per query in Chroma's result shape.
+
+        ``distances`` are ``1 - score``, where score is cosine similarity
+        (blended with normalized BM25 when ``hybrid_weight`` is set). Only
+        the winning rows are read back from SQLite.
+        """
+        result: Dict[str, List[List[Any]]] = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        for _ in query_texts:
+            for key in result:
+                result[key].append([])
+        with self._lock:
+            if self._rows == 0 or not query_texts:
+                return result
+
+        queries = self._embed(list(query_texts))
+        with self._lock:
+            matrix = self._matrix_view()
+            if matrix is None:
+                return result
+            live_rows = self._live_row_array()
+            lexical = self._lexical_scores(list(query_texts)) if self.hybrid_weight > 0 else None
+
+        scores = queries @ matrix.T
+        if lexical is not None:
+            scores = (1 - self.hybrid_weight) * scores + self.hybrid_weight * lexical[:, :scores.shape[1]]
+        if len(live_rows) < scores.shape[1]:
+            # Rows without a live item (e.g. left by an interrupted upsert) never rank
+            mask = np.full(scores.shape[1], -np.inf, dtype=np.float32)
+            mask[live_rows[live_rows < scores.shape[1]]] = 0.0
+            scores = scores + mask
+
+        k = max(1, min(int(n_results), len(live_rows)))
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        ordered = [top[i][np.argsort(-scores[i, top[i]])] for i in range(len(query_texts))]
+
+        wanted = sorted({int(row) for rows in ordered for row in rows})
+        placeholders = ",".join("?" * len(wanted))
+        with self._lock:
+            items = {
+                row: (item_id, document, metadata)
+                for row, item_id, document, metadata in self._conn.execute(
+                    f"SELECT row, id, document, metadata FROM items WHERE row IN ({placeholders})", wanted
+                )
+            }
+
+        for i, rows in enumerate(ordered):
+            hits = [int(row) for row in rows if int(row) in items]
+            result["ids"][i] = [items[row][0] for row in hits]
+            result["documents"][i] = [items[row][1] for row in hits]
+            result["metadatas"][i] = [json.loads(items[row][2]) for row in hits]
+            result["distances"][i] = [float(1.0 - scores[i, row]) for row in hits]
+        return result
+
+    def close(self) -> None:
+        with self._lock:
+            self._matrix = None
+            self._conn.close()
+
+
+class LocalVectorClient:
+    """Chroma-client-shaped factory for :class:`LocalVectorIndex` collections under ``root``.
+
+    Collections persist across runs; :meth:`get_or_create_collection` reopens
+    an existing one without re-embedding its documents.
+    """
+
+    def __init__(self, root: Path, hybrid_weight: float = 0.0):
+        self.root = Path(root)
+        self.hybrid_weight = hybrid_weight
+        self._collections: Dict[str, LocalVectorIndex] = {}
+        self._lock = threading.Lock()
+
+    def get_or_create_collection(self, name: str, embedding_function: EmbeddingFunction) -> LocalVectorIndex:
+        with self._lock:
+            collection = self._collections.get(name)
+            if collection is None:
+                collection = LocalVectorIndex(self.root / name, embedding_function, self.hybrid_weight)
+                self._collections[name] = collection
+            return collection
+
+    def create_collection(self, name: str, embedding_function: EmbeddingFunction) -> LocalVectorIndex:
+        return self.get_or_create_collection(name, embedding_function)
+
+    def delete_collection(self, name: str) -> None:
+        with self._lock:
+            collection = self._collections.pop(name, None)
+            if collection is not None:
+                collection.close()
+            shutil.rmtree(self.root / name, ignore_errors=True)
+
+
+class DSPyEmbeddingFunction:
+    """Embedding function backed by ``dspy.Embedder`` (hosted models via LiteLLM)."""
+
+    def __init__(self, model: str, batch_size: int = 64):
+        import dspy
+
+        self.model = model
+        self._embedder = dspy.Embedder(model, batch_size=batch_size)
+
+    def __call__(self, input: List[str]) -> np.ndarray:
+        return np.asarray(self._embedder(list(input)), dtype=np.float32)